@@ -0,0 +1,51 @@
+"""authentik group hierarchy benchmark command"""
+
+from time import perf_counter
+
+from django.db import transaction
+
+from authentik.core.models import Group, GroupAncestryNode, GroupParentageNode
+from authentik.lib.generators import generate_id
+from authentik.tenants.management import TenantCommand
+
+
+class Command(TenantCommand):
+    """Benchmark importing a nested group hierarchy. All changes are rolled back."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-c",
+            "--count",
+            type=int,
+            default=10_000,
+            help="How many groups should be created.",
+        )
+        parser.add_argument(
+            "-f",
+            "--fanout",
+            type=int,
+            default=4,
+            help="How many children each group should have.",
+        )
+
+    def handle_per_tenant(self, *args, **options):
+        count = options["count"]
+        fanout = options["fanout"]
+        prefix = generate_id(8)
+        with transaction.atomic():
+            groups = Group.objects.bulk_create(
+                Group(name=f"benchmark-{prefix}-{idx}") for idx in range(count)
+            )
+            start = perf_counter()
+            # Add edges one by one like an import from LDAP, SCIM or blueprints would
+            for idx, group in enumerate(groups[1:], start=1):
+                GroupParentageNode.objects.create(child=group, parent=groups[(idx - 1) // fanout])
+            duration = perf_counter() - start
+            pairs = GroupAncestryNode.objects.filter(
+                descendant__name__startswith=f"benchmark-{prefix}-"
+            ).count()
+            transaction.set_rollback(True)
+        self.stdout.write(f"Groups: {count} (fanout {fanout})")
+        self.stdout.write(f"Ancestry pairs: {pairs}")
+        self.stdout.write(f"Total: {duration * 1000:.2f}ms")
+        self.stdout.write(f"Per edge: {duration * 1000 / max(count - 1, 1):.4f}ms")
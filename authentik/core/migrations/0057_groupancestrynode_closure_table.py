@@ -0,0 +1,99 @@
+# Generated by Django 5.2.9 on 2026-10-17 10:12
+
+import django.db.models.deletion
+import pgtrigger.compiler
+import pgtrigger.migrations
+from django.db import migrations, models
+
+POPULATE_GROUP_ANCESTRY = """
+    INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)
+    WITH RECURSIVE accumulator AS (
+        SELECT child_id AS descendant_id, parent_id AS ancestor_id
+        FROM authentik_core_groupparentage
+
+        UNION
+
+        SELECT accumulator.descendant_id, current.parent_id AS ancestor_id
+        FROM accumulator
+        JOIN authentik_core_groupparentage current
+        ON accumulator.ancestor_id = current.child_id
+    )
+    SELECT descendant_id, ancestor_id FROM accumulator
+    ON CONFLICT DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_core", "0056_user_roles"),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="groupparentagenode",
+            name="refresh_groupancestry",
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    "DROP MATERIALIZED VIEW IF EXISTS authentik_core_groupancestry;",
+                    migrations.RunSQL.noop,
+                ),
+            ],
+            state_operations=[
+                migrations.DeleteModel(
+                    name="GroupAncestryNode",
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="GroupAncestryNode",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_nodes",
+                        to="authentik_core.group",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_nodes",
+                        to="authentik_core.group",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "authentik_core_groupancestry",
+                "indexes": [
+                    models.Index(fields=["ancestor"], name="authentik_c_ancesto_974845_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("descendant", "ancestor"), name="unique_group_ancestry_node"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(POPULATE_GROUP_ANCESTRY, migrations.RunSQL.noop),
+        pgtrigger.migrations.AddTrigger(
+            model_name="groupparentagenode",
+            trigger=pgtrigger.compiler.Trigger(
+                name="maintain_groupancestry",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE descendants uuid[]; ancestors uuid[];",
+                    func="\n    PERFORM pg_advisory_xact_lock(hashtext(TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME));\n    IF TG_OP = 'DELETE' OR TG_OP = 'UPDATE' THEN\n        descendants := ARRAY(\n            SELECT OLD.child_id\n            UNION\n            SELECT descendant_id FROM authentik_core_groupancestry\n            WHERE ancestor_id = OLD.child_id\n        );\n        ancestors := ARRAY(\n            SELECT OLD.parent_id\n            UNION\n            SELECT ancestor_id FROM authentik_core_groupancestry\n            WHERE descendant_id = OLD.parent_id\n        );\n        DELETE FROM authentik_core_groupancestry\n        WHERE descendant_id = ANY(descendants) AND ancestor_id = ANY(ancestors);\n        INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)\n        WITH RECURSIVE reachable AS (\n            SELECT child_id AS descendant_id, parent_id AS ancestor_id\n            FROM authentik_core_groupparentage\n            WHERE child_id = ANY(descendants)\n\n            UNION\n\n            SELECT reachable.descendant_id, edge.parent_id AS ancestor_id\n            FROM reachable\n            JOIN authentik_core_groupparentage edge\n            ON reachable.ancestor_id = edge.child_id\n        )\n        SELECT descendant_id, ancestor_id FROM reachable\n        WHERE ancestor_id = ANY(ancestors)\n        ON CONFLICT DO NOTHING;\n    END IF;\n    IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN\n        INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)\n        SELECT descendant.id, ancestor.id\n        FROM (\n            SELECT NEW.child_id AS id\n            UNION\n            SELECT descendant_id FROM authentik_core_groupancestry\n            WHERE ancestor_id = NEW.child_id\n        ) descendant\n        CROSS JOIN (\n            SELECT NEW.parent_id AS id\n            UNION\n            SELECT ancestor_id FROM authentik_core_groupancestry\n            WHERE descendant_id = NEW.parent_id\n        ) ancestor\n        ON CONFLICT DO NOTHING;\n    END IF;\n    RETURN NULL;\n",
+                    hash="acf5f569d06f69c08038550afe9578e856f2d5ef",
+                    operation="INSERT OR UPDATE OR DELETE",
+                    pgid="pgtrigger_maintain_groupancestry_da0c6",
+                    table="authentik_core_groupparentage",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
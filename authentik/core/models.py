@@ -23,8 +23,6 @@ from django.utils.translation import gettext_lazy as _
 from guardian.conf import settings
 from guardian.models import RoleModelPermission, RoleObjectPermission
 from model_utils.managers import InheritanceManager
-from psqlextra.indexes import UniqueIndex
-from psqlextra.models import PostgresMaterializedViewModel
 from rest_framework.serializers import Serializer
 from structlog.stdlib import get_logger
 
@@ -133,6 +131,11 @@ class AttributesMixin(models.Model):
 
     def update_attributes(self, properties: dict[str, Any]):
         """Update fields and attributes, but correctly by merging dicts"""
+        if self.merge_attributes(properties):
+            self.save()
+
+    def merge_attributes(self, properties: dict[str, Any]) -> bool:
+        """Apply fields and attributes without saving, returns True if anything changed"""
         needs_update = False
         for key, value in properties.items():
             if key == "attributes":
@@ -146,8 +149,7 @@ class AttributesMixin(models.Model):
         if self.attributes != final_attributes:
             self.attributes = final_attributes
             needs_update = True
-        if needs_update:
-            self.save()
+        return needs_update
 
     @classmethod
     def update_or_create_attributes(
@@ -256,6 +258,66 @@ class Group(SerializerModel, AttributesMixin):
         role.assign_perms(perms, obj)
 
 
+# Only the pairs that can be affected by a single edge are touched: for an added edge
+# every descendant of the child gains every ancestor of the parent, for a removed edge
+# those pairs are dropped and re-derived from the remaining edges of the descendants.
+# Edge changes are serialized per schema: each one reads the closure as committed by the
+# others, so two concurrent changes (A->B and B->C) could otherwise both miss A->C.
+GROUP_ANCESTRY_MAINTAIN_FUNC = """
+    PERFORM pg_advisory_xact_lock(hashtext(TG_TABLE_SCHEMA || '.' || TG_TABLE_NAME));
+    IF TG_OP = 'DELETE' OR TG_OP = 'UPDATE' THEN
+        descendants := ARRAY(
+            SELECT OLD.child_id
+            UNION
+            SELECT descendant_id FROM authentik_core_groupancestry
+            WHERE ancestor_id = OLD.child_id
+        );
+        ancestors := ARRAY(
+            SELECT OLD.parent_id
+            UNION
+            SELECT ancestor_id FROM authentik_core_groupancestry
+            WHERE descendant_id = OLD.parent_id
+        );
+        DELETE FROM authentik_core_groupancestry
+        WHERE descendant_id = ANY(descendants) AND ancestor_id = ANY(ancestors);
+        INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)
+        WITH RECURSIVE reachable AS (
+            SELECT child_id AS descendant_id, parent_id AS ancestor_id
+            FROM authentik_core_groupparentage
+            WHERE child_id = ANY(descendants)
+
+            UNION
+
+            SELECT reachable.descendant_id, edge.parent_id AS ancestor_id
+            FROM reachable
+            JOIN authentik_core_groupparentage edge
+            ON reachable.ancestor_id = edge.child_id
+        )
+        SELECT descendant_id, ancestor_id FROM reachable
+        WHERE ancestor_id = ANY(ancestors)
+        ON CONFLICT DO NOTHING;
+    END IF;
+    IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+        INSERT INTO authentik_core_groupancestry (descendant_id, ancestor_id)
+        SELECT descendant.id, ancestor.id
+        FROM (
+            SELECT NEW.child_id AS id
+            UNION
+            SELECT descendant_id FROM authentik_core_groupancestry
+            WHERE ancestor_id = NEW.child_id
+        ) descendant
+        CROSS JOIN (
+            SELECT NEW.parent_id AS id
+            UNION
+            SELECT ancestor_id FROM authentik_core_groupancestry
+            WHERE descendant_id = NEW.parent_id
+        ) ancestor
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+"""
+
+
 class GroupParentageNode(models.Model):
     uuid = models.UUIDField(primary_key=True, editable=False, default=uuid4)
 
@@ -270,13 +332,11 @@ class GroupParentageNode(models.Model):
 
         triggers = [
             pgtrigger.Trigger(
-                name="refresh_groupancestry",
+                name="maintain_groupancestry",
                 operation=pgtrigger.Insert | pgtrigger.Update | pgtrigger.Delete,
                 when=pgtrigger.After,
-                func="""
-                    REFRESH MATERIALIZED VIEW CONCURRENTLY authentik_core_groupancestry;
-                    RETURN NULL;
-                """,
+                declare=[("descendants", "uuid[]"), ("ancestors", "uuid[]")],
+                func=GROUP_ANCESTRY_MAINTAIN_FUNC,
             ),
         ]
 
@@ -284,45 +344,25 @@ class GroupParentageNode(models.Model):
         return f"Group Parentage Node from #{self.child_id} to {self.parent_id}"
 
 
-class GroupAncestryNode(PostgresMaterializedViewModel):
-    descendant = models.ForeignKey(
-        Group, related_name="ancestor_nodes", on_delete=models.DO_NOTHING
-    )
-    ancestor = models.ForeignKey(
-        Group, related_name="descendant_nodes", on_delete=models.DO_NOTHING
-    )
+class GroupAncestryNode(models.Model):
+    """Transitive closure of authentik_core_groupparentage, maintained incrementally
+    by a trigger on GroupParentageNode.
+    See https://en.wikipedia.org/wiki/Transitive_closure#In_graph_theory"""
+
+    id = models.BigAutoField(primary_key=True)
+    descendant = models.ForeignKey(Group, related_name="ancestor_nodes", on_delete=models.CASCADE)
+    ancestor = models.ForeignKey(Group, related_name="descendant_nodes", on_delete=models.CASCADE)
 
     class Meta:
-        # This is a transitive closure of authentik_core_groupparentage
-        # See https://en.wikipedia.org/wiki/Transitive_closure#In_graph_theory
         db_table = "authentik_core_groupancestry"
         indexes = [
-            models.Index(fields=["descendant"]),
             models.Index(fields=["ancestor"]),
-            UniqueIndex(fields=["id"]),
         ]
-
-    class ViewMeta:
-        query = """
-            WITH RECURSIVE accumulator AS (
-                SELECT
-                child_id::text || '-' || parent_id::text as id,
-                child_id AS descendant_id,
-                parent_id AS ancestor_id
-                FROM authentik_core_groupparentage
-
-                UNION
-
-                SELECT
-                accumulator.descendant_id::text || '-' || current.parent_id::text as id,
-                accumulator.descendant_id,
-                current.parent_id AS ancestor_id
-                FROM accumulator
-                JOIN authentik_core_groupparentage current
-                ON accumulator.ancestor_id = current.child_id
-            )
-            SELECT * FROM accumulator
-        """
+        constraints = [
+            models.UniqueConstraint(
+                fields=["descendant", "ancestor"], name="unique_group_ancestry_node"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Group Ancestry Node from {self.descendant_id} to {self.ancestor_id}"
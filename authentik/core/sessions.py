@@ -1,17 +1,113 @@
 """authentik sessions engine"""
 
 import pickle  # nosec
+from atexit import register
+from datetime import datetime, timedelta
+from os import register_at_fork
+from threading import Lock, Thread
+from time import sleep
+from typing import TYPE_CHECKING, Any
 
 from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
 from django.contrib.sessions.backends.db import SessionStore as SessionBase
+from django.core.cache import cache
 from django.core.exceptions import SuspiciousOperation
+from django.db import close_old_connections, connection, transaction
 from django.utils import timezone
 from django.utils.functional import cached_property
 from structlog.stdlib import get_logger
 
+from authentik.lib.config import CONFIG
 from authentik.root.middleware import ClientIPMiddleware
 
+if TYPE_CHECKING:
+    from authentik.tenants.models import Tenant
+
 LOGGER = get_logger()
+CACHE_PREFIX = "goauthentik.io/core/sessions/"
+
+# Bookkeeping field changes which haven't been written to the database yet,
+# by schema and session key, together with the tenant of the schema
+_pending: dict[str, tuple["Tenant | None", dict[str, dict[str, Any]]]] = {}
+_pending_lock = Lock()
+_flusher: "BookkeepingFlusher | None" = None
+
+
+def cache_key(session_key: str) -> str:
+    """Get the cache key for a session"""
+    return f"{CACHE_PREFIX}{session_key}"
+
+
+def session_cache_enabled() -> bool:
+    """Check if sessions are cached"""
+    return CONFIG.get_bool("sessions.cache.enabled", False)
+
+
+def invalidate_cached_sessions(*session_keys: str):
+    """Remove sessions from the cache, so they're loaded from the database on next access"""
+    if not session_cache_enabled() or not session_keys:
+        return
+    cache.delete_many([cache_key(session_key) for session_key in session_keys])
+
+
+def flush_session_bookkeeping():
+    """Write pending bookkeeping changes of sessions of all schemas to the database"""
+    with _pending_lock:
+        pending = list(_pending.values())
+        _pending.clear()
+    if not pending:
+        return
+    model = SessionStore.get_model_class()
+    for tenant, sessions in pending:
+        try:
+            if tenant:
+                connection.set_tenant(tenant)
+            model.objects.bulk_update(
+                [model(session_key=key, **fields) for key, fields in sessions.items()],
+                fields=[*(k.value for k in model.Keys), "expires"],
+            )
+        except Exception as exc:  # noqa
+            LOGGER.warning("Failed to write session bookkeeping", exc=exc, count=len(sessions))
+
+
+class BookkeepingFlusher(Thread):
+    """Write pending bookkeeping changes of sessions of this process
+    every `sessions.cache.flush_interval` seconds"""
+
+    def __init__(self):
+        super().__init__(name="authentik-session-bookkeeping", daemon=True)
+
+    def run(self):
+        while True:
+            sleep(flush_interval())
+            close_old_connections()
+            flush_session_bookkeeping()
+            close_old_connections()
+
+
+def flush_interval() -> int:
+    """Interval in which bookkeeping changes of sessions are written"""
+    return CONFIG.get_int("sessions.cache.flush_interval", 60)
+
+
+def _reset_flusher():
+    """Threads don't survive a fork, so make sure children start their own flusher"""
+    global _flusher  # noqa: PLW0603
+    _flusher = None
+    _pending.clear()
+
+
+register_at_fork(after_in_child=_reset_flusher)
+register(flush_session_bookkeeping)
+
+
+def _ensure_flusher():
+    global _flusher  # noqa: PLW0603
+    if _flusher is None:
+        with _pending_lock:
+            if _flusher is None:
+                _flusher = BookkeepingFlusher()
+                _flusher.start()
 
 
 class SessionStore(SessionBase):
@@ -21,6 +117,8 @@ class SessionStore(SessionBase):
             "last_ip": last_ip or ClientIPMiddleware.default_ip,
             "last_user_agent": last_user_agent,
         }
+        self._loaded_session_data: bytes | None = None
+        self._loaded_expires: datetime | None = None
 
     @classmethod
     def get_model_class(cls):
@@ -32,7 +130,49 @@ class SessionStore(SessionBase):
     def model_fields(self):
         return [k.value for k in self.model.Keys]
 
+    @cached_property
+    def cache_enabled(self) -> bool:
+        return session_cache_enabled()
+
+    def _get_session_from_cache(self):
+        if not self.cache_enabled or not self.session_key:
+            return None
+        s = cache.get(cache_key(self.session_key))
+        if s is None or s.expires <= timezone.now():
+            return None
+        return s
+
+    def _get_session_from_db_cached(self):
+        """Load the session from the database and store it in the cache. The user is not
+        cached and loaded on access instead, so changes to them apply immediately.
+
+        The session row is locked until the cache is updated, so that deleting the session
+        (and removing it from the cache) can't happen in between."""
+        with transaction.atomic():
+            try:
+                s = (
+                    self.model.objects.select_related("authenticatedsession")
+                    .select_for_update(no_key=True, of=("self",))
+                    .get(
+                        session_key=self.session_key,
+                        expires__gt=timezone.now(),
+                    )
+                )
+            except (self.model.DoesNotExist, SuspiciousOperation) as exc:
+                if isinstance(exc, SuspiciousOperation):
+                    LOGGER.warning(str(exc))
+                self._session_key = None
+                return None
+            timeout = min(
+                CONFIG.get_int("sessions.cache.timeout", 300),
+                (s.expires - timezone.now()).total_seconds(),
+            )
+            cache.set(cache_key(s.session_key), s, timeout=timeout)
+        return s
+
     def _get_session_from_db(self):
+        if self.cache_enabled:
+            return self._get_session_from_cache() or self._get_session_from_db_cached()
         try:
             return self.model.objects.select_related(
                 "authenticatedsession",
@@ -47,6 +187,10 @@ class SessionStore(SessionBase):
             self._session_key = None
 
     async def _aget_session_from_db(self):
+        if self.cache_enabled and self.session_key:
+            s = await cache.aget(cache_key(self.session_key))
+            if s is not None and s.expires > timezone.now():
+                return s
         try:
             return await self.model.objects.select_related(
                 "authenticatedsession",
@@ -72,27 +216,29 @@ class SessionStore(SessionBase):
             pass
         return {}
 
-    def load(self):
-        s = self._get_session_from_db()
-        if s:
-            return {
-                "authenticatedsession": getattr(s, "authenticatedsession", None),
-                **{k: getattr(s, k) for k in self.model_fields},
-                **self.decode(s.session_data),
-            }
-        else:
+    def _load_model(self, s) -> dict:
+        if not s:
             return {}
+        self._loaded_session_data = bytes(s.session_data)
+        data = {
+            "authenticatedsession": getattr(s, "authenticatedsession", None),
+            **{k: getattr(s, k) for k in self.model_fields},
+            **self.decode(s.session_data),
+        }
+        self._loaded_expires = s.expires
+        if self.cache_enabled:
+            with _pending_lock:
+                pending = _pending.get(connection.schema_name, (None, {}))[1]
+                fields = pending.get(s.session_key, {})
+            self._loaded_expires = fields.get("expires", s.expires)
+            data.update({k: v for k, v in fields.items() if k in self.model_fields})
+        return data
+
+    def load(self):
+        return self._load_model(self._get_session_from_db())
 
     async def aload(self):
-        s = await self._aget_session_from_db()
-        if s:
-            return {
-                "authenticatedsession": getattr(s, "authenticatedsession", None),
-                **{k: getattr(s, k) for k in self.model_fields},
-                **self.decode(s.session_data),
-            }
-        else:
-            return {}
+        return self._load_model(await self._aget_session_from_db())
 
     def create_model_instance(self, data):
         args = {
@@ -134,6 +280,41 @@ class SessionStore(SessionBase):
         args["session_data"] = self.encode(args["session_data"])
         return self.model(**args)
 
+    def _save_bookkeeping(self) -> bool:
+        """Defer the write if only bookkeeping fields (last IP, user agent) changed since the
+        session was loaded, so they can be written in bulk with other sessions"""
+        if self._loaded_session_data is None or self._loaded_expires is None:
+            return False
+        # Write directly if the session would expire in the database before the deferred
+        # write extends it
+        if self._loaded_expires - timezone.now() < timedelta(seconds=flush_interval() * 2):
+            return False
+        obj = self.create_model_instance(self._get_session())
+        if obj.session_data != self._loaded_session_data:
+            return False
+        fields = {k: getattr(obj, k) for k in self.model_fields}
+        fields[self.model.Keys.LAST_USED] = timezone.now()
+        fields["expires"] = obj.expires
+        with _pending_lock:
+            _pending.setdefault(connection.schema_name, (getattr(connection, "tenant", None), {}))[
+                1
+            ][obj.session_key] = fields
+        _ensure_flusher()
+        return True
+
+    def save(self, must_create=False):
+        if (
+            self.cache_enabled
+            and not must_create
+            and self.session_key is not None
+            and self._save_bookkeeping()
+        ):
+            return
+        if self.cache_enabled and self.session_key is not None:
+            with _pending_lock:
+                _pending.get(connection.schema_name, (None, {}))[1].pop(self.session_key, None)
+        super().save(must_create=must_create)
+
     @classmethod
     def clear_expired(cls):
         cls.get_model_class().objects.filter(expires__lt=timezone.now()).delete()
@@ -19,6 +19,7 @@ from authentik.core.models import (
     User,
     default_token_duration,
 )
+from authentik.core.sessions import invalidate_cached_sessions
 from authentik.flows.apps import RefreshOtherFlowsAfterAuthentication
 from authentik.root.ws.consumer import build_device_group
 
@@ -39,8 +40,7 @@ def post_save_application(sender: type[Model], instance, created: bool, **_):
         return
 
     # Also delete user application cache
-    keys = cache.keys(user_app_cache_key("*"))
-    cache.delete_many(keys)
+    cache.delete_pattern(user_app_cache_key("*"))
 
 
 @receiver(user_logged_in)
@@ -68,6 +68,21 @@ def authenticated_session_delete(sender: type[Model], instance: "AuthenticatedSe
     Session.objects.filter(session_key=instance.pk).delete()
 
 
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def session_invalidate_cache(sender: type[Model], instance: "Session", **_):
+    """Remove session from cache when it is changed or deleted"""
+    invalidate_cached_sessions(instance.session_key)
+
+
+@receiver(post_save, sender=AuthenticatedSession)
+def authenticated_session_invalidate_cache(
+    sender: type[Model], instance: "AuthenticatedSession", **_
+):
+    """Remove session from cache when it is authenticated"""
+    invalidate_cached_sessions(instance.session_id)
+
+
 @receiver(pre_save)
 def backchannel_provider_pre_save(sender: type[Model], instance: Model, **_):
     """Ensure backchannel providers have is_backchannel set to true"""
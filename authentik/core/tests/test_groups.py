@@ -1,8 +1,11 @@
 """group tests"""
 
-from django.test.testcases import TestCase
+from threading import Event, Thread, Timer
 
-from authentik.core.models import Group, User
+from django.db import connection, transaction
+from django.test.testcases import TestCase, TransactionTestCase
+
+from authentik.core.models import Group, GroupAncestryNode, User
 from authentik.lib.generators import generate_id
 
 
@@ -62,6 +65,51 @@ class TestGroups(TestCase):
         self.assertTrue(group.is_member(user))
         self.assertTrue(group2.is_member(user))
 
+    def test_group_ancestry_incremental(self):
+        """Test ancestry is kept up to date when edges are added and removed"""
+        root = Group.objects.create(name=generate_id())
+        left = Group.objects.create(name=generate_id())
+        right = Group.objects.create(name=generate_id())
+        leaf = Group.objects.create(name=generate_id())
+        left.parents.add(root)
+        right.parents.add(root)
+        leaf.parents.add(left, right)
+
+        def ancestors(group: Group) -> set[Group]:
+            return set(Group.objects.filter(pk=group.pk).with_ancestors())
+
+        def descendants(group: Group) -> set[Group]:
+            return set(Group.objects.filter(pk=group.pk).with_descendants())
+
+        self.assertEqual(ancestors(leaf), {leaf, left, right, root})
+        self.assertEqual(descendants(root), {root, left, right, leaf})
+        # root is still reachable through right
+        leaf.parents.remove(left)
+        self.assertEqual(ancestors(leaf), {leaf, right, root})
+        self.assertTrue(GroupAncestryNode.objects.filter(descendant=leaf, ancestor=root).exists())
+        right.parents.remove(root)
+        self.assertEqual(ancestors(leaf), {leaf, right})
+        self.assertEqual(descendants(root), {root, left})
+        left.delete()
+        self.assertEqual(descendants(root), {root})
+        self.assertFalse(GroupAncestryNode.objects.filter(ancestor=root).exists())
+
+    def test_group_ancestry_cycle(self):
+        """Test removing an edge from a cycle"""
+        first = Group.objects.create(name=generate_id())
+        second = Group.objects.create(name=generate_id())
+        third = Group.objects.create(name=generate_id())
+        second.parents.add(first)
+        third.parents.add(second)
+        first.parents.add(third)
+        self.assertEqual(GroupAncestryNode.objects.filter(descendant=first).count(), 3)
+        second.parents.remove(first)
+        self.assertEqual(set(Group.objects.filter(pk=third.pk).with_ancestors()), {third, second})
+        self.assertEqual(
+            set(Group.objects.filter(pk=first.pk).with_ancestors()), {first, third, second}
+        )
+        self.assertFalse(GroupAncestryNode.objects.filter(descendant=first, ancestor=first))
+
     def test_group_managed_role(self):
         """Test group managed role"""
         perm = "authentik_core.view_user"
@@ -72,3 +120,41 @@ class TestGroups(TestCase):
         self.assertEqual(group.roles.count(), 1)
         self.assertEqual(user.roles.count(), 0)
         self.assertTrue(user.has_perm(perm))
+
+
+class TestGroupAncestryConcurrent(TransactionTestCase):
+    """Test group ancestry with committed, concurrent edge changes"""
+
+    def test_group_ancestry_concurrent(self):
+        """Test edges added concurrently by two transactions are both in the ancestry"""
+        first = Group.objects.create(name=generate_id())
+        second = Group.objects.create(name=generate_id())
+        third = Group.objects.create(name=generate_id())
+        added = Event()
+        commit = Event()
+
+        def add_parent():
+            try:
+                with transaction.atomic():
+                    second.parents.add(first)
+                    added.set()
+                    commit.wait(10)
+            finally:
+                connection.close()
+
+        thread = Thread(target=add_parent)
+        thread.start()
+        self.assertTrue(added.wait(10))
+        # Let the other transaction commit while this one is waiting for it
+        timer = Timer(1, commit.set)
+        timer.start()
+        with transaction.atomic():
+            third.parents.add(second)
+        thread.join()
+        timer.join()
+        self.assertEqual(
+            set(Group.objects.filter(pk=third.pk).with_ancestors()), {third, second, first}
+        )
+        self.assertEqual(
+            set(Group.objects.filter(pk=first.pk).with_descendants()), {first, second, third}
+        )
@@ -0,0 +1,87 @@
+"""Test session store"""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from authentik.core.models import AuthenticatedSession, Session
+from authentik.core.sessions import (
+    SessionStore,
+    flush_session_bookkeeping,
+    invalidate_cached_sessions,
+)
+from authentik.core.tests.utils import create_test_user
+from authentik.lib.config import CONFIG
+
+
+class TestSessionStore(TestCase):
+    """Test session store"""
+
+    def setUp(self):
+        self.user = create_test_user()
+
+    def create_session(self) -> str:
+        """Create an authenticated session"""
+        store = SessionStore()
+        store["foo"] = "bar"
+        store.save()
+        AuthenticatedSession.objects.create(
+            session=Session.objects.get(session_key=store.session_key), user=self.user
+        )
+        return store.session_key
+
+    @CONFIG.patch("sessions.cache.enabled", True)
+    def test_cache(self):
+        """Test sessions are loaded from the cache"""
+        session_key = self.create_session()
+        self.assertEqual(SessionStore(session_key)["foo"], "bar")
+        with CaptureQueriesContext(connection) as ctx:
+            store = SessionStore(session_key)
+            self.assertEqual(store["foo"], "bar")
+            self.assertEqual(store["authenticatedsession"].user, self.user)
+        self.assertFalse(
+            [query for query in ctx.captured_queries if Session._meta.db_table in query["sql"]]
+        )
+
+    @CONFIG.patch("sessions.cache.enabled", True)
+    def test_cache_revoke(self):
+        """Test deleted sessions are removed from the cache"""
+        session_key = self.create_session()
+        self.assertEqual(SessionStore(session_key)["foo"], "bar")
+        AuthenticatedSession.objects.filter(session__session_key=session_key).delete()
+        self.assertEqual(SessionStore(session_key).load(), {})
+
+    @CONFIG.patch("sessions.cache.enabled", True)
+    @CONFIG.patch("sessions.cache.flush_interval", 3600)
+    def test_bookkeeping(self):
+        """Test changes to only bookkeeping fields are written in batches"""
+        session_key = self.create_session()
+        flush_session_bookkeeping()
+        store = SessionStore(session_key)
+        store[Session.Keys.LAST_IP] = "10.0.0.1"
+        store.save()
+        self.assertNotEqual(Session.objects.get(session_key=session_key).last_ip, "10.0.0.1")
+        self.assertEqual(SessionStore(session_key)[Session.Keys.LAST_IP], "10.0.0.1")
+        flush_session_bookkeeping()
+        self.assertEqual(Session.objects.get(session_key=session_key).last_ip, "10.0.0.1")
+
+    @CONFIG.patch("sessions.cache.enabled", True)
+    @CONFIG.patch("sessions.cache.flush_interval", 3600)
+    def test_bookkeeping_expiry(self):
+        """Test deferred bookkeeping writes extend the session's expiry"""
+        session_key = self.create_session()
+        Session.objects.filter(session_key=session_key).update(expires=now() + timedelta(hours=3))
+        invalidate_cached_sessions(session_key)
+        store = SessionStore(session_key)
+        store[Session.Keys.LAST_IP] = "10.0.0.1"
+        store.save()
+        self.assertLess(
+            Session.objects.get(session_key=session_key).expires, now() + timedelta(hours=4)
+        )
+        flush_session_bookkeeping()
+        self.assertGreater(
+            Session.objects.get(session_key=session_key).expires, now() + timedelta(hours=12)
+        )
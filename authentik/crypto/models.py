@@ -2,9 +2,12 @@
 
 from base64 import urlsafe_b64encode
 from binascii import hexlify
-from hashlib import md5, sha512
+from collections.abc import Callable
+from hashlib import md5, sha256, sha512
 from ssl import PEM_FOOTER, PEM_HEADER
 from textwrap import wrap
+from threading import Lock
+from typing import Any
 from uuid import uuid4
 
 from cryptography.hazmat.backends import default_backend
@@ -19,6 +22,7 @@ from cryptography.hazmat.primitives.serialization import load_pem_private_key
 from cryptography.x509 import Certificate, load_pem_x509_certificate
 from django.db import models
 from django.utils.translation import gettext_lazy as _
+from jwcrypto.jwk import JWK
 from rest_framework.serializers import Serializer
 from structlog.stdlib import get_logger
 
@@ -27,6 +31,33 @@ from authentik.lib.models import CreatedUpdatedModel, SerializerModel
 
 LOGGER = get_logger()
 
+# Parsed keys shared by all instances of a keypair within this process, keyed by
+# keypair pk, kind of key and a digest of the PEM data they were parsed from
+_PARSED_KEYS: dict[tuple[str, str, str], Any] = {}
+_PARSED_KEYS_LOCK = Lock()
+_PARSED_KEYS_MAX_SIZE = 1024
+
+
+def _get_parsed_key(pk: Any, kind: str, data: str, parse: Callable[[], Any]) -> Any:
+    """Get a parsed key from the process-wide cache, or parse and cache it"""
+    key = (str(pk), kind, sha256(data.encode("utf-8")).hexdigest())
+    with _PARSED_KEYS_LOCK:
+        if key in _PARSED_KEYS:
+            return _PARSED_KEYS[key]
+    parsed = parse()
+    with _PARSED_KEYS_LOCK:
+        if len(_PARSED_KEYS) >= _PARSED_KEYS_MAX_SIZE:
+            _PARSED_KEYS.clear()
+        _PARSED_KEYS[key] = parsed
+    return parsed
+
+
+def invalidate_parsed_keys(pk: Any):
+    """Remove all parsed keys of a keypair from the process-wide cache"""
+    with _PARSED_KEYS_LOCK:
+        for key in [key for key in _PARSED_KEYS if key[0] == str(pk)]:
+            del _PARSED_KEYS[key]
+
 
 def format_cert(raw_pam: str) -> str:
     """Format a PEM certificate that is either missing its header/footer or is in a single line"""
@@ -146,11 +177,26 @@ class CertificateKeyPair(SerializerModel, ManagedModel, CreatedUpdatedModel):
     def certificate(self) -> Certificate:
         """Get python cryptography Certificate instance"""
         if not self._cert:
-            self._cert = load_pem_x509_certificate(
-                self.certificate_data.encode("utf-8"), default_backend()
+            self._cert = _get_parsed_key(
+                self.pk,
+                "certificate",
+                self.certificate_data,
+                lambda: load_pem_x509_certificate(
+                    self.certificate_data.encode("utf-8"), default_backend()
+                ),
             )
         return self._cert
 
+    @property
+    def certificate_jwk(self) -> JWK:
+        """Get the certificate's public key as JWK, used to encrypt data for this keypair"""
+        return _get_parsed_key(
+            self.pk,
+            "certificate_jwk",
+            self.certificate_data,
+            lambda: JWK.from_pem(self.certificate_data.encode("utf-8")),
+        )
+
     @property
     def public_key(self) -> PublicKeyTypes | None:
         """Get public key of the private key"""
@@ -165,10 +211,15 @@ class CertificateKeyPair(SerializerModel, ManagedModel, CreatedUpdatedModel):
         """Get python cryptography PrivateKey instance"""
         if not self._private_key and self.key_data != "":
             try:
-                self._private_key = load_pem_private_key(
-                    str.encode("\n".join([x.strip() for x in self.key_data.split("\n")])),
-                    password=None,
-                    backend=default_backend(),
+                self._private_key = _get_parsed_key(
+                    self.pk,
+                    "private_key",
+                    self.key_data,
+                    lambda: load_pem_private_key(
+                        str.encode("\n".join([x.strip() for x in self.key_data.split("\n")])),
+                        password=None,
+                        backend=default_backend(),
+                    ),
                 )
             except ValueError as exc:
                 LOGGER.warning(exc)
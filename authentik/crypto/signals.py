@@ -6,7 +6,7 @@ from ssl import CertificateError
 
 from cryptography.hazmat.primitives import hashes
 from cryptography.x509 import Certificate
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from structlog.stdlib import get_logger
 
@@ -16,6 +16,7 @@ from authentik.crypto.models import (
     fingerprint_sha256,
     generate_key_id,
     generate_key_id_legacy,
+    invalidate_parsed_keys,
 )
 
 LOGGER = get_logger()
@@ -68,3 +69,12 @@ def certificate_key_pair_pre_save(
         legacy_kid = generate_key_id_legacy(instance.key_data)
         if instance.kid not in (new_kid, legacy_kid):
             instance.kid = new_kid
+
+
+@receiver(post_save, sender="authentik_crypto.CertificateKeyPair")
+@receiver(post_delete, sender="authentik_crypto.CertificateKeyPair")
+def certificate_key_pair_invalidate_keys(
+    sender: type[CertificateKeyPair], instance: CertificateKeyPair, **_
+):
+    """Drop parsed keys of a keypair from the process-wide cache when it is changed"""
+    invalidate_parsed_keys(instance.pk)
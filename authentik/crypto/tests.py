@@ -540,3 +540,20 @@ class TestCrypto(APITestCase):
         # Kid should now be SHA512 for the new key
         self.assertNotEqual(cert.kid, legacy_kid)
         self.assertEqual(cert.kid, generate_key_id(cert.key_data))
+
+    def test_parsed_key_cache(self):
+        """Test parsed keys are shared between instances and invalidated on change"""
+        cert = create_test_cert()
+        other = CertificateKeyPair.objects.get(pk=cert.pk)
+        self.assertIs(cert.private_key, other.private_key)
+        self.assertIs(cert.certificate, other.certificate)
+        self.assertIs(cert.certificate_jwk, other.certificate_jwk)
+
+        builder = CertificateBuilder(generate_id())
+        builder.build(subject_alt_names=[], validity_days=3)
+        cert.key_data = builder.private_key
+        cert.certificate_data = builder.certificate
+        cert.save()
+        updated = CertificateKeyPair.objects.get(pk=cert.pk)
+        self.assertIsNot(updated.private_key, other.private_key)
+        self.assertEqual(updated.certificate.public_key(), updated.private_key.public_key())
@@ -2,13 +2,17 @@ from django.http import Http404
 
 from authentik.crypto.apps import MANAGED_KEY
 from authentik.crypto.models import CertificateKeyPair
-from authentik.providers.oauth2.views.jwks import JWKSView
+from authentik.providers.oauth2.views.jwks import JWKSView, jwks_cache_key
 
 
 class AppleJWKSView(JWKSView):
 
-    def get_keys(self):
+    def get_keypairs(self):
         kp = CertificateKeyPair.objects.filter(managed=MANAGED_KEY).first()
         if not kp:
             raise Http404
-        yield self.get_jwk_for_key(kp, "sig")
+        yield kp, "sig"
+
+    def get_cache_key(self):
+        # Application slugs can't contain slashes, so this can't collide with them
+        return jwks_cache_key(f"managed/{MANAGED_KEY}")
@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.db.models import Model
 from django.http import HttpResponseBadRequest, HttpResponseNotFound
 from google.auth.exceptions import GoogleAuthError, TransportError
@@ -11,6 +13,7 @@ from authentik.lib.sync.outgoing import HTTP_CONFLICT
 from authentik.lib.sync.outgoing.base import SAFE_METHODS, BaseOutgoingSyncClient
 from authentik.lib.sync.outgoing.exceptions import (
     BadRequestSyncException,
+    BaseSyncException,
     DryRunRejected,
     NotFoundSyncException,
     ObjectExistsSyncException,
@@ -18,6 +21,9 @@ from authentik.lib.sync.outgoing.exceptions import (
     TransientSyncException,
 )
 
+# Google allows up to 1000 requests per batch, however smaller batches are recommended
+BATCH_SIZE = 50
+
 
 class GoogleWorkspaceSyncClient[TModel: Model, TConnection: Model, TSchema: dict](
     BaseOutgoingSyncClient[TModel, TConnection, TSchema, GoogleWorkspaceProvider]
@@ -48,28 +54,66 @@ class GoogleWorkspaceSyncClient[TModel: Model, TConnection: Model, TSchema: dict
             raise DryRunRejected(request.uri, request.method, request.body)
         try:
             response = request.execute()
-        except GoogleAuthError as exc:
-            if isinstance(exc, TransportError):
-                raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
-            raise StopSync(exc) from exc
-        except HttpLib2Error as exc:
-            if isinstance(exc, HttpLib2ErrorWithResponse):
-                self._response_handle_status_code(request.body, exc.response.status, exc)
-            raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
-        except HttpError as exc:
-            self._response_handle_status_code(request.body, exc.status_code, exc)
-            raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
-        except Error as exc:
-            raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
+        except (GoogleAuthError, HttpLib2Error, Error) as exc:
+            raise self._sync_exception(exc, request.body) from exc
         return response
 
-    def _response_handle_status_code(self, request: dict, status_code: int, root_exc: Exception):
+    def _batch(self, requests: list[HttpRequest]) -> list[Any | BaseSyncException]:
+        """Send requests using batch requests, returning the response or the exception
+        of each request in the same order"""
+        results = []
+        for offset in range(0, len(requests), BATCH_SIZE):
+            results.extend(self._batch_chunk(requests[offset : offset + BATCH_SIZE]))
+        return results
+
+    def _batch_chunk(self, requests: list[HttpRequest]) -> list[Any | BaseSyncException]:
+        if len(requests) == 1:
+            try:
+                return [self._request(requests[0])]
+            except BaseSyncException as exc:
+                return [exc]
+        results: list[Any | BaseSyncException] = [
+            TransientSyncException("No response received in batch") for _ in requests
+        ]
+
+        def callback(request_id: str, response: Any, exception: Exception | None):
+            idx = int(request_id)
+            if exception:
+                results[idx] = self._sync_exception(exception, requests[idx].body)
+            else:
+                results[idx] = response
+
+        batch = self.directory_service.new_batch_http_request()
+        for idx, request in enumerate(requests):
+            if self.provider.dry_run and request.method.upper() not in SAFE_METHODS:
+                results[idx] = DryRunRejected(request.uri, request.method, request.body)
+                continue
+            batch.add(request, callback=callback, request_id=str(idx))
+        try:
+            batch.execute()
+        except (GoogleAuthError, HttpLib2Error, Error) as exc:
+            error = self._sync_exception(exc, None)
+            return [result if isinstance(result, DryRunRejected) else error for result in results]
+        return results
+
+    def _sync_exception(self, exc: Exception, body: str | None) -> BaseSyncException:
+        """Convert an exception raised by the google client into a sync exception"""
+        if isinstance(exc, GoogleAuthError):
+            if isinstance(exc, TransportError):
+                return TransientSyncException(f"Failed to send request: {str(exc)}")
+            return StopSync(exc)
+        status_code = None
+        if isinstance(exc, HttpLib2ErrorWithResponse):
+            status_code = exc.response.status
+        elif isinstance(exc, HttpError):
+            status_code = exc.status_code
         if status_code == HttpResponseNotFound.status_code:
-            raise NotFoundSyncException("Object not found") from root_exc
+            return NotFoundSyncException("Object not found")
         if status_code == HTTP_CONFLICT:
-            raise ObjectExistsSyncException("Object exists") from root_exc
+            return ObjectExistsSyncException("Object exists")
         if status_code == HttpResponseBadRequest.status_code:
-            raise BadRequestSyncException("Bad request", request) from root_exc
+            return BadRequestSyncException("Bad request", body)
+        return TransientSyncException(f"Failed to send request: {str(exc)}")
 
     def check_email_valid(self, *emails: str):
         for email in emails:
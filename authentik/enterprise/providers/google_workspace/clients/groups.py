@@ -12,9 +12,9 @@ from authentik.enterprise.providers.google_workspace.models import (
 from authentik.lib.sync.mapper import PropertyMappingManager
 from authentik.lib.sync.outgoing.base import Direction
 from authentik.lib.sync.outgoing.exceptions import (
+    BaseSyncException,
     NotFoundSyncException,
     ObjectExistsSyncException,
-    TransientSyncException,
 )
 from authentik.lib.sync.outgoing.models import OutgoingSyncDeleteAction
 
@@ -125,24 +125,25 @@ class GoogleWorkspaceGroupClient(
             return self._patch_remove_users(group, users_set)
 
     def _patch(self, google_group_id: str, direction: Direction, members: list[str]):
+        requests = []
         for user in members:
-            try:
-                if direction == Direction.add:
-                    self._request(
-                        self.directory_service.members().insert(
-                            groupKey=google_group_id, body={"email": user}
-                        )
+            if direction == Direction.add:
+                requests.append(
+                    self.directory_service.members().insert(
+                        groupKey=google_group_id, body={"email": user}
                     )
-                if direction == Direction.remove:
-                    self._request(
-                        self.directory_service.members().delete(
-                            groupKey=google_group_id, memberKey=user
-                        )
+                )
+            if direction == Direction.remove:
+                requests.append(
+                    self.directory_service.members().delete(
+                        groupKey=google_group_id, memberKey=user
                     )
-            except ObjectExistsSyncException:
-                pass
-            except TransientSyncException:
-                raise
+                )
+        for result in self._batch(requests):
+            if isinstance(result, ObjectExistsSyncException):
+                continue
+            if isinstance(result, BaseSyncException):
+                raise result
 
     def _patch_add_users(self, group: Group, users_set: set[int]):
         """Add users in users_set to group"""
@@ -1,3 +1,6 @@
+from collections.abc import Iterator
+from typing import Any
+
 from django.db import transaction
 
 from authentik.core.models import User
@@ -8,7 +11,10 @@ from authentik.enterprise.providers.google_workspace.models import (
     GoogleWorkspaceProviderUser,
 )
 from authentik.lib.sync.mapper import PropertyMappingManager
+from authentik.lib.sync.outgoing.base import SYNC_OBJECT_EXCEPTIONS
 from authentik.lib.sync.outgoing.exceptions import (
+    BaseSyncException,
+    NotFoundSyncException,
     ObjectExistsSyncException,
     TransientSyncException,
 )
@@ -94,6 +100,72 @@ class GoogleWorkspaceUserClient(GoogleWorkspaceSyncClient[User, GoogleWorkspaceP
         connection.attributes = response
         connection.save()
 
+    def write_many(self, users: list[User]) -> Iterator[tuple[User, Exception | None]]:
+        """Create and update users using batch requests"""
+        if self.provider.dry_run:
+            yield from super().write_many(users)
+            return
+        connections = {
+            conn.user_id: conn
+            for conn in GoogleWorkspaceProviderUser.objects.filter(
+                provider=self.provider, user__in=users
+            )
+        }
+        pending: list[tuple[User, GoogleWorkspaceProviderUser | None]] = []
+        requests = []
+        for user in users:
+            connection = connections.get(user.pk)
+            try:
+                google_user = self.to_schema(user, connection)
+                self.check_email_valid(
+                    google_user["primaryEmail"],
+                    *[x["address"] for x in google_user.get("emails", [])],
+                )
+            except SYNC_OBJECT_EXCEPTIONS as exc:
+                yield user, exc
+                continue
+            if connection:
+                request = self.directory_service.users().update(
+                    userKey=connection.google_id, body=google_user
+                )
+            else:
+                request = self.directory_service.users().insert(body=google_user)
+            pending.append((user, connection))
+            requests.append(request)
+        for (user, connection), result in zip(pending, self._batch(requests), strict=True):
+            yield user, self._apply_batch_result(user, connection, result)
+
+    def _apply_batch_result(
+        self,
+        user: User,
+        connection: GoogleWorkspaceProviderUser | None,
+        result: dict[str, Any] | BaseSyncException,
+    ) -> Exception | None:
+        """Create or update the connection of a user based on the result of its request"""
+        if isinstance(result, NotFoundSyncException) and connection:
+            # User was deleted in google workspace, so re-create them
+            connection.delete()
+            return self.try_write(user)
+        if isinstance(result, ObjectExistsSyncException) and not connection:
+            # user already exists in google workspace, so we can connect them manually
+            GoogleWorkspaceProviderUser.objects.create(
+                provider=self.provider, user=user, google_id=user.email, attributes={}
+            )
+            return None
+        if isinstance(result, BaseSyncException):
+            return result
+        if connection:
+            connection.attributes = result
+            connection.save()
+        else:
+            GoogleWorkspaceProviderUser.objects.create(
+                provider=self.provider,
+                user=user,
+                google_id=result["primaryEmail"],
+                attributes=result,
+            )
+        return None
+
     def discover(self):
         """Iterate through all users and connect them with authentik users if possible"""
         request = self.directory_service.users().list(
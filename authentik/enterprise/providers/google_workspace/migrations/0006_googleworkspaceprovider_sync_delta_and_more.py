@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "authentik_providers_google_workspace",
+            "0005_googleworkspaceprovider_sync_page_size_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="googleworkspaceprovider",
+            name="sync_delta",
+            field=models.BooleanField(
+                default=False,
+                help_text="When enabled, scheduled syncs only write objects which changed since they were last synced.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="googleworkspaceprovider",
+            name="sync_watermark",
+            field=models.DateTimeField(default=None, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="googleworkspaceprovideruser",
+            name="fingerprint",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="googleworkspaceprovidergroup",
+            name="fingerprint",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
@@ -40,6 +40,7 @@ class GoogleWorkspaceProviderUser(InternallyManagedMixin, SerializerModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     provider = models.ForeignKey("GoogleWorkspaceProvider", on_delete=models.CASCADE)
     attributes = models.JSONField(default=dict)
+    fingerprint = models.TextField(default="", blank=True)
 
     @property
     def serializer(self) -> type[Serializer]:
@@ -66,6 +67,7 @@ class GoogleWorkspaceProviderGroup(InternallyManagedMixin, SerializerModel):
     group = models.ForeignKey(Group, on_delete=models.CASCADE)
     provider = models.ForeignKey("GoogleWorkspaceProvider", on_delete=models.CASCADE)
     attributes = models.JSONField(default=dict)
+    fingerprint = models.TextField(default="", blank=True)
 
     @property
     def serializer(self) -> type[Serializer]:
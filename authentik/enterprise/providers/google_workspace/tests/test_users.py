@@ -8,6 +8,7 @@ from django.test import TestCase
 from authentik.blueprints.tests import apply_blueprint
 from authentik.core.models import Application, Group, User
 from authentik.enterprise.providers.google_workspace.clients.test_http import MockHTTP
+from authentik.enterprise.providers.google_workspace.clients.users import GoogleWorkspaceUserClient
 from authentik.enterprise.providers.google_workspace.models import (
     GoogleWorkspaceProvider,
     GoogleWorkspaceProviderMapping,
@@ -370,3 +371,142 @@ class GoogleWorkspaceUserTests(TestCase):
                 ).exists()
             )
             self.assertFalse(Event.objects.filter(action=EventAction.SYSTEM_EXCEPTION).exists())
+
+    def test_sync_batch(self):
+        """Test users are created with a batch request"""
+        uids = [generate_id(), generate_id()]
+        http = MockHTTP()
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/customer/my_customer/domains?key={self.api_key}&alt=json",
+            domains_list_v1_mock,
+        )
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/users?customer=my_customer&maxResults=500&orderBy=email&key={self.api_key}&alt=json",
+            method="GET",
+            body={"users": []},
+        )
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/groups?customer=my_customer&maxResults=500&orderBy=email&key={self.api_key}&alt=json",
+            method="GET",
+            body={"groups": []},
+        )
+        parts = [
+            "--batch_boundary\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-{generate_id()}+{idx}>\r\n"
+            "\r\n"
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/json; charset=UTF-8\r\n"
+            "\r\n"
+            f'{{"primaryEmail": "{uid}@goauthentik.io"}}\r\n'
+            for idx, uid in enumerate(uids)
+        ]
+        self.app.backchannel_providers.remove(self.provider)
+        users = [
+            User.objects.create(username=uid, name=uid, email=f"{uid}@goauthentik.io")
+            for uid in uids
+        ]
+        self.app.backchannel_providers.add(self.provider)
+        with patch(
+            "authentik.enterprise.providers.google_workspace.models.GoogleWorkspaceProvider.google_credentials",
+            MagicMock(return_value={"developerKey": self.api_key, "http": http}),
+        ):
+            batch_uri = (
+                GoogleWorkspaceUserClient(self.provider)
+                .directory_service.new_batch_http_request()
+                ._batch_uri
+            )
+            http.add_response(
+                batch_uri,
+                method="POST",
+                body="".join(parts) + "--batch_boundary--\r\n",
+                meta={
+                    "status": "200",
+                    "content-type": "multipart/mixed; boundary=batch_boundary",
+                },
+            )
+            google_workspace_sync.send(self.provider.pk).get_result()
+            for user, uid in zip(users, uids, strict=True):
+                self.assertEqual(
+                    GoogleWorkspaceProviderUser.objects.get(
+                        provider=self.provider, user=user
+                    ).google_id,
+                    f"{uid}@goauthentik.io",
+                )
+            self.assertFalse(Event.objects.filter(action=EventAction.SYSTEM_EXCEPTION).exists())
+            batch_requests = [request for request in http.requests() if request[0] == batch_uri]
+            self.assertEqual(len(batch_requests), 1)
+
+    def test_sync_batch_not_found(self):
+        """Test users whose insert fails with an error that isn't handled explicitly
+        don't stop the sync of other users"""
+        uids = [generate_id(), generate_id()]
+        http = MockHTTP()
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/customer/my_customer/domains?key={self.api_key}&alt=json",
+            domains_list_v1_mock,
+        )
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/users?customer=my_customer&maxResults=500&orderBy=email&key={self.api_key}&alt=json",
+            method="GET",
+            body={"users": []},
+        )
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/groups?customer=my_customer&maxResults=500&orderBy=email&key={self.api_key}&alt=json",
+            method="GET",
+            body={"groups": []},
+        )
+        parts = [
+            "--batch_boundary\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-{generate_id()}+0>\r\n"
+            "\r\n"
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/json; charset=UTF-8\r\n"
+            "\r\n"
+            f'{{"primaryEmail": "{uids[0]}@goauthentik.io"}}\r\n',
+            "--batch_boundary\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-{generate_id()}+1>\r\n"
+            "\r\n"
+            "HTTP/1.1 404 Not Found\r\n"
+            "Content-Type: application/json; charset=UTF-8\r\n"
+            "\r\n"
+            '{"error": {"code": 404, "message": "Resource Not Found: userKey"}}\r\n',
+        ]
+        self.app.backchannel_providers.remove(self.provider)
+        users = [
+            User.objects.create(username=uid, name=uid, email=f"{uid}@goauthentik.io")
+            for uid in uids
+        ]
+        self.app.backchannel_providers.add(self.provider)
+        with patch(
+            "authentik.enterprise.providers.google_workspace.models.GoogleWorkspaceProvider.google_credentials",
+            MagicMock(return_value={"developerKey": self.api_key, "http": http}),
+        ):
+            batch_uri = (
+                GoogleWorkspaceUserClient(self.provider)
+                .directory_service.new_batch_http_request()
+                ._batch_uri
+            )
+            http.add_response(
+                batch_uri,
+                method="POST",
+                body="".join(parts) + "--batch_boundary--\r\n",
+                meta={
+                    "status": "200",
+                    "content-type": "multipart/mixed; boundary=batch_boundary",
+                },
+            )
+            google_workspace_sync.send(self.provider.pk).get_result()
+            self.assertTrue(
+                GoogleWorkspaceProviderUser.objects.filter(
+                    provider=self.provider, user=users[0]
+                ).exists()
+            )
+            self.assertFalse(
+                GoogleWorkspaceProviderUser.objects.filter(
+                    provider=self.provider, user=users[1]
+                ).exists()
+            )
+            self.assertFalse(Event.objects.filter(action=EventAction.SYSTEM_EXCEPTION).exists())
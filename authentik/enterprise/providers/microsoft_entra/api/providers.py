@@ -39,6 +39,7 @@ class MicrosoftEntraProviderSerializer(EnterpriseRequiredMixin, ProviderSerializ
             "sync_page_size",
             "sync_page_timeout",
             "dry_run",
+            "sync_delta",
         ]
         extra_kwargs = {}
 
@@ -11,9 +11,10 @@ from azure.core.exceptions import (
 )
 from azure.identity.aio import ClientSecretCredential
 from django.db.models import Model
-from django.http import HttpResponseBadRequest, HttpResponseNotFound
+from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpResponseServerError
 from kiota_abstractions.api_error import APIError
 from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import Parsable
 from kiota_authentication_azure.azure_identity_authentication_provider import (
     AzureIdentityAuthenticationProvider,
 )
@@ -23,14 +24,22 @@ from msgraph.generated.models.o_data_errors.o_data_error import ODataError
 from msgraph.graph_request_adapter import GraphRequestAdapter, options
 from msgraph.graph_service_client import GraphServiceClient
 from msgraph_core import GraphClientFactory
+from msgraph_core.requests.batch_request_content import BatchRequestContent
+from msgraph_core.requests.batch_request_item import BatchRequestItem
 from opentelemetry import trace
 
 from authentik.enterprise.providers.microsoft_entra.models import MicrosoftEntraProvider
 from authentik.events.utils import sanitize_item
-from authentik.lib.sync.outgoing import HTTP_CONFLICT
+from authentik.lib.sync.outgoing import (
+    HTTP_CONFLICT,
+    HTTP_NO_CONTENT,
+    HTTP_SERVICE_UNAVAILABLE,
+    HTTP_TOO_MANY_REQUESTS,
+)
 from authentik.lib.sync.outgoing.base import SAFE_METHODS, BaseOutgoingSyncClient
 from authentik.lib.sync.outgoing.exceptions import (
     BadRequestSyncException,
+    BaseSyncException,
     DryRunRejected,
     NotFoundSyncException,
     ObjectExistsSyncException,
@@ -111,6 +120,49 @@ class MicrosoftEntraSyncClient[TModel: Model, TConnection: Model, TSchema: dict]
                 raise ObjectExistsSyncException("Object exists", exc.response_headers) from exc
             raise exc
 
+    def _batch[T: Parsable](
+        self, requests: list[RequestInformation], response_type: type[T] | None = None
+    ) -> list[T | None | BaseSyncException]:
+        """Send requests using JSON batching, returning the parsed response or the exception
+        of each request in the same order"""
+        results = []
+        for offset in range(0, len(requests), BatchRequestContent.MAX_REQUESTS):
+            chunk = requests[offset : offset + BatchRequestContent.MAX_REQUESTS]
+            items = {
+                str(idx): BatchRequestItem(request_information=request, id=str(idx))
+                for idx, request in enumerate(chunk)
+            }
+            try:
+                response = self._request(self.client.batch.post(BatchRequestContent(items)))
+            except BaseSyncException as exc:
+                results.extend(exc for _ in chunk)
+                continue
+            for request_id in items:
+                item = response.get_response_by_id(request_id)
+                if not item or not item.status:
+                    results.append(TransientSyncException("No response received in batch"))
+                elif item.status >= HttpResponseBadRequest.status_code:
+                    results.append(self._batch_exception(item.status, item.headers))
+                elif response_type and item.status != HTTP_NO_CONTENT and item.body:
+                    results.append(response.response_body(request_id, response_type))
+                else:
+                    results.append(None)
+        return results
+
+    def _batch_exception(self, status_code: int, headers: dict) -> BaseSyncException:
+        """Convert the status of a failed request in a batch into a sync exception"""
+        if status_code == HttpResponseNotFound.status_code:
+            return NotFoundSyncException("Object not found")
+        if status_code == HttpResponseBadRequest.status_code:
+            return BadRequestSyncException("Bad request", headers)
+        if status_code == HTTP_CONFLICT:
+            return ObjectExistsSyncException("Object exists", headers)
+        if status_code in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+            return TransientSyncException("Request was throttled")
+        if status_code >= HttpResponseServerError.status_code:
+            return TransientSyncException(f"Request failed with status {status_code}")
+        return StopSync(Exception(f"Request failed with status {status_code}"), None, None)
+
     def __prefetch_domains(self):
         self.domains = []
         organizations = self._request(self.client.organization.get())
@@ -128,6 +180,9 @@ class MicrosoftEntraSyncClient[TModel: Model, TConnection: Model, TSchema: dict]
             if not any(email.endswith(f"@{domain_name}") for domain_name in self.domains):
                 raise BadRequestSyncException(f"Invalid email domain: {email}")
 
+    def schema_as_dict(self, schema: TSchema) -> dict:
+        return self.entity_as_dict(schema)
+
     def entity_as_dict(self, entity: Entity) -> dict:
         """Create a dictionary of a model instance, making sure to remove (known) things
         we can't JSON serialize"""
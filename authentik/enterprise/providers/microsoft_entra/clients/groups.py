@@ -15,10 +15,10 @@ from authentik.enterprise.providers.microsoft_entra.models import (
 from authentik.lib.sync.mapper import PropertyMappingManager
 from authentik.lib.sync.outgoing.base import Direction
 from authentik.lib.sync.outgoing.exceptions import (
+    BaseSyncException,
     NotFoundSyncException,
     ObjectExistsSyncException,
     StopSync,
-    TransientSyncException,
 )
 from authentik.lib.sync.outgoing.models import OutgoingSyncDeleteAction
 
@@ -136,27 +136,52 @@ class MicrosoftEntraGroupClient(
             return self._patch_remove_users(group, users_set)
 
     def _patch(self, microsoft_group_id: str, direction: Direction, members: list[str]):
+        members = list(members)
+        if len(members) == 1:
+            return self._patch_member(microsoft_group_id, direction, members[0])
+        client = self.client
+        requests = []
         for user in members:
-            try:
-                if direction == Direction.add:
-                    request_body = ReferenceCreate(
-                        odata_id=f"https://graph.microsoft.com/v1.0/directoryObjects/{user}",
-                    )
-                    self._request(
-                        self.client.groups.by_group_id(microsoft_group_id).members.ref.post(
-                            request_body
-                        )
-                    )
-                if direction == Direction.remove:
-                    self._request(
-                        self.client.groups.by_group_id(microsoft_group_id)
-                        .members.by_directory_object_id(user)
-                        .ref.delete()
+            if direction == Direction.add:
+                request_body = ReferenceCreate(
+                    odata_id=f"https://graph.microsoft.com/v1.0/directoryObjects/{user}",
+                )
+                requests.append(
+                    client.groups.by_group_id(
+                        microsoft_group_id
+                    ).members.ref.to_post_request_information(request_body)
+                )
+            if direction == Direction.remove:
+                requests.append(
+                    client.groups.by_group_id(microsoft_group_id)
+                    .members.by_directory_object_id(user)
+                    .ref.to_delete_request_information()
+                )
+        for result in self._batch(requests):
+            if isinstance(result, ObjectExistsSyncException):
+                continue
+            if isinstance(result, BaseSyncException):
+                raise result
+
+    def _patch_member(self, microsoft_group_id: str, direction: Direction, user: str):
+        try:
+            if direction == Direction.add:
+                request_body = ReferenceCreate(
+                    odata_id=f"https://graph.microsoft.com/v1.0/directoryObjects/{user}",
+                )
+                self._request(
+                    self.client.groups.by_group_id(microsoft_group_id).members.ref.post(
+                        request_body
                     )
-            except ObjectExistsSyncException:
-                pass
-            except TransientSyncException:
-                raise
+                )
+            if direction == Direction.remove:
+                self._request(
+                    self.client.groups.by_group_id(microsoft_group_id)
+                    .members.by_directory_object_id(user)
+                    .ref.delete()
+                )
+        except ObjectExistsSyncException:
+            pass
 
     def _patch_add_users(self, group: Group, users_set: set[int]):
         """Add users in users_set to group"""
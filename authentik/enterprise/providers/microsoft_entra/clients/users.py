@@ -1,3 +1,5 @@
+from collections.abc import Iterator
+
 from deepmerge import always_merger
 from django.db import transaction
 from msgraph.generated.models.user import User as MSUser
@@ -11,7 +13,10 @@ from authentik.enterprise.providers.microsoft_entra.models import (
     MicrosoftEntraProviderUser,
 )
 from authentik.lib.sync.mapper import PropertyMappingManager
+from authentik.lib.sync.outgoing.base import SYNC_OBJECT_EXCEPTIONS
 from authentik.lib.sync.outgoing.exceptions import (
+    BaseSyncException,
+    NotFoundSyncException,
     ObjectExistsSyncException,
     StopSync,
     TransientSyncException,
@@ -137,6 +142,68 @@ class MicrosoftEntraUserClient(MicrosoftEntraSyncClient[User, MicrosoftEntraProv
             always_merger.merge(connection.attributes, self.entity_as_dict(response))
             connection.save()
 
+    def write_many(self, users: list[User]) -> Iterator[tuple[User, Exception | None]]:
+        """Create and update users using JSON batching"""
+        if self.provider.dry_run or len(users) <= 1:
+            yield from super().write_many(users)
+            return
+        connections = {
+            conn.user_id: conn
+            for conn in MicrosoftEntraProviderUser.objects.filter(
+                provider=self.provider, user__in=users
+            )
+        }
+        client = self.client
+        pending: list[tuple[User, MicrosoftEntraProviderUser | None]] = []
+        requests = []
+        for user in users:
+            connection = connections.get(user.pk)
+            try:
+                microsoft_user = self.to_schema(user, connection)
+                self.check_email_valid(microsoft_user.user_principal_name)
+            except SYNC_OBJECT_EXCEPTIONS as exc:
+                yield user, exc
+                continue
+            if connection:
+                request = client.users.by_user_id(
+                    connection.microsoft_id
+                ).to_patch_request_information(microsoft_user)
+            else:
+                request = client.users.to_post_request_information(microsoft_user)
+            pending.append((user, connection))
+            requests.append(request)
+        for (user, connection), result in zip(pending, self._batch(requests, MSUser), strict=True):
+            yield user, self._apply_batch_result(user, connection, result)
+
+    def _apply_batch_result(
+        self,
+        user: User,
+        connection: MicrosoftEntraProviderUser | None,
+        result: MSUser | None | BaseSyncException,
+    ) -> Exception | None:
+        """Create or update the connection of a user based on the result of its request"""
+        if isinstance(result, NotFoundSyncException) and connection:
+            # User was deleted in microsoft entra, so re-create them
+            connection.delete()
+            return self.try_write(user)
+        if isinstance(result, ObjectExistsSyncException) and not connection:
+            # user already exists in microsoft entra, which is handled by self.create
+            return self.try_write(user)
+        if isinstance(result, BaseSyncException):
+            return result
+        if connection:
+            if result:
+                always_merger.merge(connection.attributes, self.entity_as_dict(result))
+                connection.save()
+        elif result:
+            MicrosoftEntraProviderUser.objects.create(
+                provider=self.provider,
+                user=user,
+                microsoft_id=result.id,
+                attributes=self.entity_as_dict(result),
+            )
+        return None
+
     def discover(self):
         """Iterate through all users and connect them with authentik users if possible"""
         request_configuration = UsersRequestBuilder.UsersRequestBuilderGetRequestConfiguration(
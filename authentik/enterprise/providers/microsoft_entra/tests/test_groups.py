@@ -15,6 +15,7 @@ from msgraph.generated.models.verified_domain import VerifiedDomain
 from authentik.blueprints.tests import apply_blueprint
 from authentik.core.models import Application, Group, User
 from authentik.core.tests.utils import create_test_user
+from authentik.enterprise.providers.microsoft_entra.clients.groups import MicrosoftEntraGroupClient
 from authentik.enterprise.providers.microsoft_entra.models import (
     MicrosoftEntraProvider,
     MicrosoftEntraProviderGroup,
@@ -22,8 +23,11 @@ from authentik.enterprise.providers.microsoft_entra.models import (
     MicrosoftEntraProviderUser,
 )
 from authentik.enterprise.providers.microsoft_entra.tasks import microsoft_entra_sync
+from authentik.enterprise.providers.microsoft_entra.tests.test_users import batch_response
 from authentik.events.models import Event, EventAction
 from authentik.lib.generators import generate_id
+from authentik.lib.sync.outgoing.base import Direction
+from authentik.lib.sync.outgoing.exceptions import TransientSyncException
 from authentik.lib.sync.outgoing.models import OutgoingSyncDeleteAction
 from authentik.tenants.models import Tenant
 
@@ -511,3 +515,38 @@ class MicrosoftEntraGroupTests(TestCase):
                 )
                 self.assertFalse(Event.objects.filter(action=EventAction.SYSTEM_EXCEPTION).exists())
                 mod_group_list.assert_called_once()
+
+    def test_group_member_add_batch(self):
+        """Test members are added with JSON batching"""
+        with (
+            patch(
+                "authentik.enterprise.providers.microsoft_entra.models.MicrosoftEntraProvider.microsoft_credentials",
+                MagicMock(return_value={"credentials": self.creds}),
+            ),
+            patch(
+                "msgraph.generated.organization.organization_request_builder.OrganizationRequestBuilder.get",
+                AsyncMock(
+                    return_value=OrganizationCollectionResponse(
+                        value=[
+                            Organization(verified_domains=[VerifiedDomain(name="goauthentik.io")])
+                        ]
+                    )
+                ),
+            ),
+            patch(
+                "msgraph_core.requests.batch_request_builder.BatchRequestBuilder.post",
+                AsyncMock(),
+            ) as batch,
+        ):
+            client = MicrosoftEntraGroupClient(self.provider)
+            members = [generate_id(), generate_id(), generate_id()]
+            # Members which already exist are ignored
+            batch.return_value = batch_response((204, None), (409, None), (204, None))
+            client._patch(generate_id(), Direction.add, members)
+            batch.assert_called_once()
+            batch_items = batch.call_args[0][0].requests
+            self.assertEqual(len(batch_items), 3)
+            # A temporary failure of any member fails the entire change
+            batch.return_value = batch_response((204, None), (204, None), (504, None))
+            with self.assertRaises(TransientSyncException):
+                client._patch(generate_id(), Direction.remove, members)
@@ -1,5 +1,7 @@
 """Microsoft Entra User tests"""
 
+from io import BytesIO
+from json import dumps
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from azure.identity.aio import ClientSecretCredential
@@ -10,11 +12,14 @@ from msgraph.generated.models.organization_collection_response import Organizati
 from msgraph.generated.models.user import User as MSUser
 from msgraph.generated.models.user_collection_response import UserCollectionResponse
 from msgraph.generated.models.verified_domain import VerifiedDomain
+from msgraph_core.requests.batch_response_content import BatchResponseContent
+from msgraph_core.requests.batch_response_item import BatchResponseItem
 from rest_framework.test import APITestCase
 
 from authentik.blueprints.tests import apply_blueprint
 from authentik.core.models import Application, Group, User
 from authentik.core.tests.utils import create_test_admin_user
+from authentik.enterprise.providers.microsoft_entra.clients.users import MicrosoftEntraUserClient
 from authentik.enterprise.providers.microsoft_entra.models import (
     MicrosoftEntraProvider,
     MicrosoftEntraProviderMapping,
@@ -23,10 +28,26 @@ from authentik.enterprise.providers.microsoft_entra.models import (
 from authentik.enterprise.providers.microsoft_entra.tasks import microsoft_entra_sync
 from authentik.events.models import Event, EventAction
 from authentik.lib.generators import generate_id
+from authentik.lib.sync.outgoing.exceptions import TransientSyncException
 from authentik.lib.sync.outgoing.models import OutgoingSyncDeleteAction
 from authentik.tenants.models import Tenant
 
 
+def batch_response(*items: tuple[int, dict | None]) -> BatchResponseContent:
+    """Build the response of a $batch request, with one item per request in the same order"""
+    response = BatchResponseContent()
+    responses = {}
+    for idx, (status, body) in enumerate(items):
+        item = BatchResponseItem()
+        item.id = str(idx)
+        item.status = status
+        item.headers = {"Content-Type": "application/json"}
+        item.body = BytesIO(dumps(body).encode()) if body else None
+        responses[item.id] = item
+    response.responses = responses
+    return response
+
+
 class MicrosoftEntraUserTests(APITestCase):
     """Microsoft Entra User tests"""
 
@@ -514,3 +535,86 @@ class MicrosoftEntraUserTests(APITestCase):
             )
             self.assertEqual(response.status_code, 201)
             user_get.assert_called_once()
+
+    def test_user_write_batch(self):
+        """Test users are written with JSON batching, mapping each result back to its user"""
+        created_id = generate_id()
+        with (
+            patch(
+                "authentik.enterprise.providers.microsoft_entra.models.MicrosoftEntraProvider.microsoft_credentials",
+                MagicMock(return_value={"credentials": self.creds}),
+            ),
+            patch(
+                "msgraph.generated.organization.organization_request_builder.OrganizationRequestBuilder.get",
+                AsyncMock(
+                    return_value=OrganizationCollectionResponse(
+                        value=[
+                            Organization(verified_domains=[VerifiedDomain(name="goauthentik.io")])
+                        ]
+                    )
+                ),
+            ),
+            patch(
+                "msgraph.generated.users.users_request_builder.UsersRequestBuilder.post",
+                AsyncMock(side_effect=lambda *args, **kwargs: MSUser(id=generate_id())),
+            ) as user_create,
+            patch(
+                "msgraph_core.requests.batch_request_builder.BatchRequestBuilder.post",
+                AsyncMock(
+                    return_value=batch_response(
+                        # Created
+                        (201, {"id": created_id}),
+                        # Updated
+                        (204, None),
+                        # Deleted remotely, re-created with a single request
+                        (404, None),
+                        # Already exists remotely, created with a single request
+                        (409, None),
+                        # Throttled
+                        (429, None),
+                        # Failed temporarily
+                        (502, None),
+                    )
+                ),
+            ) as batch,
+        ):
+            users = []
+            for _ in range(6):
+                uid = generate_id()
+                users.append(
+                    User.objects.create(
+                        username=uid,
+                        name=f"{uid} {uid}",
+                        email=f"{uid}@goauthentik.io",
+                    )
+                )
+            MicrosoftEntraProviderUser.objects.filter(
+                provider=self.provider, user__in=[users[0], users[3], users[4]]
+            ).delete()
+            user_create.reset_mock()
+
+            results = list(MicrosoftEntraUserClient(self.provider).write_many(users))
+
+            batch.assert_called_once()
+            self.assertEqual([user for user, _ in results], users)
+            self.assertEqual([exc for _, exc in results[:4]], [None, None, None, None])
+            self.assertIsInstance(results[4][1], TransientSyncException)
+            self.assertIsInstance(results[5][1], TransientSyncException)
+            self.assertEqual(user_create.call_count, 2)
+            self.assertEqual(
+                MicrosoftEntraProviderUser.objects.get(
+                    provider=self.provider, user=users[0]
+                ).microsoft_id,
+                created_id,
+            )
+            self.assertEqual(
+                MicrosoftEntraProviderUser.objects.filter(
+                    provider=self.provider, user__in=[users[1], users[2], users[3], users[5]]
+                ).count(),
+                4,
+            )
+            self.assertFalse(
+                MicrosoftEntraProviderUser.objects.filter(
+                    provider=self.provider, user=users[4]
+                ).exists()
+            )
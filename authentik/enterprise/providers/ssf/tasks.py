@@ -5,6 +5,7 @@ from django.http import HttpRequest
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from dramatiq.actor import actor
+from dramatiq.broker import get_broker
 from requests.exceptions import RequestException
 from structlog.stdlib import get_logger
 
@@ -49,11 +50,14 @@ def send_ssf_events(
 
 @actor(description=_("Dispatch SSF events."))
 def ssf_events_dispatch(events_data: dict[str, dict[str, Any]]):
-    for stream_uuid, event_data in events_data.items():
-        stream = Stream.objects.filter(pk=stream_uuid).first()
-        if not stream:
-            continue
-        send_ssf_event.send_with_options(args=(stream_uuid, event_data), rel_obj=stream.provider)
+    with get_broker().batch():
+        for stream_uuid, event_data in events_data.items():
+            stream = Stream.objects.filter(pk=stream_uuid).first()
+            if not stream:
+                continue
+            send_ssf_event.send_with_options(
+                args=(stream_uuid, event_data), rel_obj=stream.provider
+            )
 
 
 def _check_app_access(stream: Stream, event_data: dict) -> bool:
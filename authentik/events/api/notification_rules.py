@@ -23,6 +23,9 @@ class NotificationRuleSerializer(ModelSerializer):
             "destination_group",
             "destination_group_obj",
             "destination_event_user",
+            "match_actions",
+            "match_apps",
+            "match_models",
         ]
 
 
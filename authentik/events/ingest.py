@@ -0,0 +1,169 @@
+"""Buffered event ingestion"""
+
+from atexit import register
+from os import register_at_fork
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from time import monotonic
+from typing import TYPE_CHECKING
+from weakref import WeakSet
+
+from django.db import close_old_connections, connection, transaction
+from dramatiq.broker import get_broker
+from structlog.stdlib import get_logger
+
+from authentik.lib.config import CONFIG
+
+if TYPE_CHECKING:
+    from authentik.events.models import Event
+    from authentik.tenants.models import Tenant
+
+LOGGER = get_logger()
+
+INGEST_MODE_SYNC = "sync"
+INGEST_MODE_ASYNC = "async"
+
+_INGESTER: "EventIngester | None" = None
+_INGESTER_LOCK = Lock()
+# Events which are queued but not written yet
+_QUEUED: "WeakSet[Event]" = WeakSet()
+_QUEUED_LOCK = Lock()
+
+
+def is_event_queued(event: "Event") -> bool:
+    """Check if an event is queued to be written"""
+    with _QUEUED_LOCK:
+        return event in _QUEUED
+
+
+def _set_queued(event: "Event", queued: bool):
+    with _QUEUED_LOCK:
+        if queued:
+            _QUEUED.add(event)
+        else:
+            _QUEUED.discard(event)
+
+
+def dispatch_event_notifications(events: list["Event"]):
+    """Start tasks to check if any policies trigger a notification on these events"""
+    from authentik.events.tasks import event_trigger_dispatch
+
+    with get_broker().batch():
+        for event in events:
+            event_trigger_dispatch.send(event.event_uuid)
+
+
+def write_events(events: list["Event"]):
+    """Insert events with a single query and dispatch notification rules for them"""
+    from authentik.events.models import Event
+
+    try:
+        Event.objects.bulk_create(events)
+    finally:
+        # Events which failed to be written can be saved again
+        for event in events:
+            _set_queued(event, False)
+    dispatch_event_notifications(events)
+
+
+class EventIngester(Thread):
+    """Collect events of this process in a bounded queue and write them in batches,
+    at most `events.ingest.flush_interval` seconds after they were created"""
+
+    def __init__(self):
+        super().__init__(name="authentik-event-ingest", daemon=True)
+        self.queue: Queue[tuple[Tenant | None, Event]] = Queue(
+            maxsize=CONFIG.get_int("events.ingest.queue_size", 10000)
+        )
+        self.batch_size = CONFIG.get_int("events.ingest.batch_size", 500)
+        self.flush_interval = CONFIG.get_int("events.ingest.flush_interval", 1)
+
+    def submit(self, event: "Event") -> bool:
+        """Queue an event, returns False if the queue is full"""
+        try:
+            self.queue.put_nowait((getattr(connection, "tenant", None), event))
+        except Full:
+            return False
+        _set_queued(event, True)
+        return True
+
+    def _get_batch(self) -> list[tuple["Tenant | None", "Event"]]:
+        batch = [self.queue.get()]
+        deadline = monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except Empty:
+                break
+        return batch
+
+    def _write(self, batch: list[tuple["Tenant | None", "Event"]]):
+        by_tenant: dict[str | None, tuple[Tenant | None, list[Event]]] = {}
+        for tenant, event in batch:
+            key = tenant.schema_name if tenant else None
+            by_tenant.setdefault(key, (tenant, []))[1].append(event)
+        close_old_connections()
+        for tenant, events in by_tenant.values():
+            try:
+                if tenant:
+                    connection.set_tenant(tenant)
+                write_events(events)
+            except Exception as exc:  # noqa
+                for event in events:
+                    _set_queued(event, False)
+                LOGGER.warning("Failed to write events", exc=exc, count=len(events))
+        close_old_connections()
+
+    def run(self):
+        while True:
+            self._write(self._get_batch())
+
+    def flush(self):
+        """Write all queued events from the calling thread"""
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except Empty:
+                break
+        if batch:
+            self._write(batch)
+
+
+def _reset_ingester():
+    """Threads don't survive a fork, so make sure children create their own ingester"""
+    global _INGESTER  # noqa: PLW0603
+    _INGESTER = None
+
+
+register_at_fork(after_in_child=_reset_ingester)
+
+
+def get_event_ingester() -> EventIngester | None:
+    """Get the process-wide event ingester, or None if events are written synchronously"""
+    global _INGESTER  # noqa: PLW0603
+    if CONFIG.get("events.ingest.mode", INGEST_MODE_SYNC) != INGEST_MODE_ASYNC:
+        return None
+    if _INGESTER is None:
+        with _INGESTER_LOCK:
+            if _INGESTER is None:
+                _INGESTER = EventIngester()
+                _INGESTER.start()
+                register(_INGESTER.flush)
+    return _INGESTER
+
+
+def ingest_event(event: "Event") -> bool:
+    """Hand an event to the ingester, returns False if it needs to be written synchronously.
+    Events created in a transaction are only queued once it is committed."""
+    ingester = get_event_ingester()
+    if not ingester:
+        return False
+    if connection.in_atomic_block:
+        _set_queued(event, True)
+        transaction.on_commit(lambda: ingester.submit(event) or write_events([event]))
+        return True
+    return ingester.submit(event)
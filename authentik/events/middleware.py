@@ -74,7 +74,8 @@ def audit_ignore():
 
 
 class EventNewThread(Thread):
-    """Create Event in background thread"""
+    """Create Event from a request. Despite the name this runs in the request's thread,
+    the event is written in the background when events are ingested asynchronously"""
 
     action: str
     request: HttpRequest
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_events", "0014_notification_hyperlink_notification_hyperlink_label_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationrule",
+            name="match_actions",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.TextField(),
+                blank=True,
+                default=list,
+                help_text="Only check this rule for events with one of these actions. If empty, events with any action are checked.",
+                size=None,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationrule",
+            name="match_apps",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.TextField(),
+                blank=True,
+                default=list,
+                help_text="Only check this rule for events created by one of these apps. If empty, events from any app are checked.",
+                size=None,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationrule",
+            name="match_models",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.TextField(),
+                blank=True,
+                default=list,
+                help_text="Only check this rule for events about one of these models, in the format app_label.model_name. If empty, events about any or no model are checked.",
+                size=None,
+            ),
+        ),
+    ]
@@ -1,17 +1,20 @@
 """authentik events models"""
 
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from datetime import timedelta
 from difflib import get_close_matches
 from functools import lru_cache
 from inspect import currentframe
+from itertools import chain
 from typing import Any
 from uuid import uuid4
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from django.apps import apps
-from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.core.cache import cache
+from django.db import connection, models
 from django.http import HttpRequest
 from django.http.request import QueryDict
 from django.utils.timezone import now
@@ -29,6 +32,7 @@ from authentik.core.middleware import (
 )
 from authentik.core.models import ExpiringModel, Group, PropertyMapping, User
 from authentik.events.context_processors.base import get_context_processors
+from authentik.events.ingest import ingest_event, is_event_queued
 from authentik.events.utils import (
     cleanse_dict,
     get_user,
@@ -243,6 +247,9 @@ class Event(SerializerModel, ExpiringModel):
         return self
 
     def save(self, *args, **kwargs):
+        # Queued events are written with their state at the time they're written
+        if is_event_queued(self):
+            return
         if self._state.adding:
             LOGGER.info(
                 "Created Event",
@@ -251,6 +258,12 @@ class Event(SerializerModel, ExpiringModel):
                 client_ip=self.client_ip,
                 user=self.user,
             )
+            if not args and not kwargs:
+                # Queued events are used before they're written, for example as the
+                # login event stored in the session
+                self.created = now()
+                if ingest_event(self):
+                    return
         super().save(*args, **kwargs)
 
     @property
@@ -620,6 +633,68 @@ class NotificationRule(TasksModel, SerializerModel, PolicyBindingModel):
         ),
     )
 
+    match_actions = ArrayField(
+        models.TextField(),
+        default=list,
+        blank=True,
+        help_text=_(
+            "Only check this rule for events with one of these actions. "
+            "If empty, events with any action are checked."
+        ),
+    )
+    match_apps = ArrayField(
+        models.TextField(),
+        default=list,
+        blank=True,
+        help_text=_(
+            "Only check this rule for events created by one of these apps. "
+            "If empty, events from any app are checked."
+        ),
+    )
+    match_models = ArrayField(
+        models.TextField(),
+        default=list,
+        blank=True,
+        help_text=_(
+            "Only check this rule for events about one of these models, in the format "
+            "app_label.model_name. If empty, events about any or no model are checked."
+        ),
+    )
+
+    def matches_event(self, event: Event) -> bool:
+        """Check if the static predicates of this rule match `event`"""
+        if self.match_actions and event.action not in self.match_actions:
+            return False
+        if self.match_apps and event.app not in self.match_apps:
+            return False
+        if self.match_models:
+            model = event.context.get("model")
+            if not isinstance(model, dict):
+                return False
+            if f"{model.get('app')}.{model.get('model_name')}" not in self.match_models:
+                return False
+        return True
+
+    @staticmethod
+    def matching(event: Event) -> list["NotificationRule"]:
+        """Get all rules whose static predicates match `event`, using a per-process
+        index which is rebuilt when any rule is changed"""
+        version = cache.get(CACHE_KEY_RULE_INDEX_VERSION)
+        if version is None:
+            version = NotificationRule.invalidate_index()
+        cached = _RULE_INDEXES.get(connection.schema_name)
+        if cached is None or cached[0] != version:
+            cached = (version, NotificationRuleIndex(NotificationRule.objects.all()))
+            _RULE_INDEXES[connection.schema_name] = cached
+        return cached[1].match(event)
+
+    @staticmethod
+    def invalidate_index() -> str:
+        """Make all processes rebuild their index of rules"""
+        version = uuid4().hex
+        cache.set(CACHE_KEY_RULE_INDEX_VERSION, version, timeout=None)
+        return version
+
     def destination_users(self, event: Event) -> Generator[User, Any]:
         if self.destination_event_user and event.user.get("pk"):
             yield User(pk=event.user.get("pk"))
@@ -640,6 +715,32 @@ class NotificationRule(TasksModel, SerializerModel, PolicyBindingModel):
         verbose_name_plural = _("Notification Rules")
 
 
+class NotificationRuleIndex:
+    """Index of notification rules by the actions they match"""
+
+    def __init__(self, rules: Iterable[NotificationRule]):
+        self.by_action: dict[str, list[NotificationRule]] = {}
+        self.any_action: list[NotificationRule] = []
+        for rule in rules:
+            if not rule.match_actions:
+                self.any_action.append(rule)
+            for action in rule.match_actions:
+                self.by_action.setdefault(action, []).append(rule)
+
+    def match(self, event: Event) -> list[NotificationRule]:
+        """Get all rules whose static predicates match `event`"""
+        return [
+            rule
+            for rule in chain(self.by_action.get(event.action, []), self.any_action)
+            if rule.matches_event(event)
+        ]
+
+
+CACHE_KEY_RULE_INDEX_VERSION = "goauthentik.io/events/notification_rules/index_version"
+# Index of notification rules and the version it was built for, by schema
+_RULE_INDEXES: dict[str, tuple[str, NotificationRuleIndex]] = {}
+
+
 class NotificationWebhookMapping(PropertyMapping):
     """Modify the payload of outgoing webhook requests"""
 
@@ -5,14 +5,15 @@ from typing import Any
 
 from django.conf import settings
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from django.db.models.signals import post_save, pre_delete
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.http import HttpRequest
 from rest_framework.request import Request
 
 from authentik.core.models import AuthenticatedSession, User
 from authentik.core.signals import login_failed, password_changed
-from authentik.events.models import Event, EventAction
+from authentik.events.models import Event, EventAction, NotificationRule
 from authentik.flows.models import Stage
 from authentik.flows.planner import (
     PLAN_CONTEXT_DEVICE,
@@ -124,6 +125,15 @@ def event_post_save_notification(sender, instance: Event, **_):
     event_trigger_dispatch.send(instance.event_uuid)
 
 
+@receiver(post_save, sender=NotificationRule)
+@receiver(post_delete, sender=NotificationRule)
+def notification_rule_invalidate_index(sender, **_):
+    """Rebuild indexes of notification rules after a rule was changed. This is done again
+    on commit, as other processes could've rebuilt their index before the change was visible"""
+    NotificationRule.invalidate_index()
+    transaction.on_commit(NotificationRule.invalidate_index)
+
+
 @receiver(pre_delete, sender=User)
 def event_user_pre_delete_cleanup(sender, instance: User, **_):
     """If gdpr_compliance is enabled, remove all the user's events"""
@@ -5,6 +5,7 @@ from uuid import UUID
 from django.db.models.query_utils import Q
 from django.utils.translation import gettext_lazy as _
 from dramatiq.actor import actor
+from dramatiq.broker import get_broker
 from guardian.shortcuts import get_anonymous_user
 from structlog.stdlib import get_logger
 
@@ -25,8 +26,15 @@ LOGGER = get_logger()
 
 @actor(description=_("Dispatch new event notifications."))
 def event_trigger_dispatch(event_uuid: UUID):
-    for trigger in NotificationRule.objects.all():
-        event_trigger_handler.send_with_options(args=(event_uuid, trigger.name), rel_obj=trigger)
+    event = Event.objects.filter(event_uuid=event_uuid).first()
+    if not event:
+        CurrentTask.get_task().warning("event doesn't exist yet or anymore", event_uuid=event_uuid)
+        return
+    with get_broker().batch():
+        for trigger in NotificationRule.matching(event):
+            event_trigger_handler.send_with_options(
+                args=(event_uuid, trigger.name), rel_obj=trigger
+            )
 
 
 @actor(
@@ -1,8 +1,10 @@
 """event tests"""
 
+from unittest.mock import patch
 from urllib.parse import urlencode
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import DatabaseError
 from django.test import RequestFactory, TestCase
 from django.views.debug import SafeExceptionReporterFilter
 from guardian.shortcuts import get_anonymous_user
@@ -10,9 +12,11 @@ from guardian.shortcuts import get_anonymous_user
 from authentik.brands.models import Brand
 from authentik.core.models import Group, User
 from authentik.core.tests.utils import create_test_user
+from authentik.events.ingest import EventIngester, is_event_queued
 from authentik.events.models import Event
 from authentik.flows.planner import PLAN_CONTEXT_PENDING_USER, FlowPlan
 from authentik.flows.views.executor import QS_QUERY, SESSION_KEY_PLAN
+from authentik.lib.config import CONFIG
 from authentik.lib.generators import generate_id
 from authentik.policies.dummy.models import DummyPolicy
 
@@ -34,6 +38,56 @@ class TestEvents(TestCase):
             model_content_type.app_label,
         )
 
+    def test_ingest(self):
+        """Test events are queued and written in a batch"""
+        ingester = EventIngester()
+        with (
+            patch("authentik.events.ingest.get_event_ingester", return_value=ingester),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            for _ in range(3):
+                event = Event.new(generate_id())
+                event.save()
+                # Saving a queued event again doesn't write it twice
+                event.save()
+        self.assertEqual(ingester.queue.qsize(), 3)
+        self.assertFalse(Event.objects.filter(event_uuid=event.event_uuid).exists())
+        ingester.flush()
+        self.assertTrue(Event.objects.filter(event_uuid=event.event_uuid).exists())
+        self.assertEqual(ingester.queue.qsize(), 0)
+
+    def test_ingest_failed(self):
+        """Test events which failed to be written can be saved again"""
+        ingester = EventIngester()
+        with (
+            patch("authentik.events.ingest.get_event_ingester", return_value=ingester),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            event = Event.new(generate_id())
+            event.save()
+        self.assertTrue(is_event_queued(event))
+        self.assertIsNotNone(event.created)
+        with patch.object(Event.objects, "bulk_create", side_effect=DatabaseError):
+            ingester.flush()
+        self.assertFalse(is_event_queued(event))
+        event.save()
+        self.assertTrue(Event.objects.filter(event_uuid=event.event_uuid).exists())
+
+    @CONFIG.patch("events.ingest.queue_size", 1)
+    def test_ingest_full(self):
+        """Test events are written directly when the queue is full"""
+        ingester = EventIngester()
+        with (
+            patch("authentik.events.ingest.get_event_ingester", return_value=ingester),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            queued = Event.new(generate_id())
+            queued.save()
+            written = Event.new(generate_id())
+            written.save()
+        self.assertFalse(Event.objects.filter(event_uuid=queued.event_uuid).exists())
+        self.assertTrue(Event.objects.filter(event_uuid=written.event_uuid).exists())
+
     def test_new_with_user(self):
         """Create a new Event passing a user as kwarg"""
         event = Event.new("unittest", test={"model": get_anonymous_user()})
@@ -79,6 +79,43 @@ class TestEventsNotifications(APITestCase):
         notification: Notification = execute_mock.call_args[0][0]
         self.assertEqual(notification.user, user)
 
+    def test_trigger_static_predicates(self):
+        """Test rules are only checked for events matching their static predicates"""
+        group = Group.objects.create(name=generate_id())
+        any_event = NotificationRule.objects.create(name=generate_id())
+        login = NotificationRule.objects.create(
+            name=generate_id(), match_actions=[EventAction.LOGIN]
+        )
+        group_update = NotificationRule.objects.create(
+            name=generate_id(),
+            match_actions=[EventAction.MODEL_UPDATED],
+            match_apps=["authentik.core"],
+            match_models=["authentik_core.group"],
+        )
+
+        rules = NotificationRule.matching(Event.new(EventAction.LOGIN))
+        self.assertIn(any_event, rules)
+        self.assertIn(login, rules)
+        self.assertNotIn(group_update, rules)
+
+        rules = NotificationRule.matching(
+            Event.new(EventAction.MODEL_UPDATED, app="authentik.core", model=group)
+        )
+        self.assertIn(any_event, rules)
+        self.assertNotIn(login, rules)
+        self.assertIn(group_update, rules)
+        self.assertNotIn(
+            group_update,
+            NotificationRule.matching(
+                Event.new(EventAction.MODEL_UPDATED, app="authentik.core", model=self.user)
+            ),
+        )
+
+        # Changing a rule updates the index
+        login.match_actions = [EventAction.LOGOUT]
+        login.save()
+        self.assertNotIn(login, NotificationRule.matching(Event.new(EventAction.LOGIN)))
+
     def test_trigger_no_group(self):
         """Test trigger without group"""
         trigger = NotificationRule.objects.create(name=generate_id())
@@ -138,9 +138,8 @@ class FlowViewSet(UsedByMixin, ModelViewSet):
     @action(detail=False, methods=["POST"])
     def cache_clear(self, request: Request) -> Response:
         """Clear flow cache"""
-        keys = cache.keys(f"{CACHE_PREFIX}*")
-        cache.delete_many(keys)
-        LOGGER.debug("Cleared flow cache", keys=len(keys))
+        count = cache.delete_pattern(f"{CACHE_PREFIX}*")
+        LOGGER.debug("Cleared flow cache", keys=count)
         return Response(status=204)
 
     @permission_required(
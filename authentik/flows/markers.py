@@ -1,13 +1,13 @@
 """Stage Markers"""
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from django.contrib.messages import INFO, add_message
 from django.http.request import HttpRequest
 from structlog.stdlib import get_logger
 
-from authentik.flows.models import FlowStageBinding
+from authentik.flows.models import FlowStageBinding, FlowStageBindingReference
 from authentik.policies.engine import PolicyEngine
 from authentik.policies.models import PolicyBinding
 
@@ -38,6 +38,15 @@ class ReevaluateMarker(StageMarker):
 
     binding: PolicyBinding
 
+    def __getstate__(self) -> dict[str, Any]:
+        return {"binding": FlowStageBindingReference.of(self.binding)}
+
+    def __setstate__(self, state: dict[str, Any] | tuple[Any, dict[str, Any]]):
+        if isinstance(state, tuple):
+            # Markers pickled before bindings were stored as references
+            state = state[1]
+        self.binding = state["binding"]
+
     def process(
         self,
         plan: "FlowPlan",
@@ -47,6 +56,10 @@ class ReevaluateMarker(StageMarker):
         """Re-evaluate policies bound to stage, and if they fail, remove from plan"""
         from authentik.flows.planner import PLAN_CONTEXT_PENDING_USER
 
+        if isinstance(self.binding, FlowStageBindingReference):
+            # The marker is usually created for the binding it's attached to
+            self.binding = binding if binding.pk == self.binding.pk else self.binding.resolve()
+
         LOGGER.debug(
             "f(plan_inst): running re-evaluation",
             marker="ReevaluateMarker",
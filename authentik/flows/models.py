@@ -1,9 +1,10 @@
 """Flow models"""
 
 from base64 import b64decode, b64encode
+from dataclasses import dataclass
 from pickle import dumps, loads  # nosec
 from typing import TYPE_CHECKING
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from django.core.validators import validate_slug
 from django.db import models
@@ -272,6 +273,26 @@ class FlowStageBinding(SerializerModel, PolicyBindingModel):
         unique_together = (("target", "stage", "order"),)
 
 
+@dataclass(slots=True, frozen=True)
+class FlowStageBindingReference:
+    """Reference to a saved FlowStageBinding, used to store flow plans
+    without storing the full binding and stage"""
+
+    pk: UUID
+
+    @staticmethod
+    def of(
+        binding: "FlowStageBinding | FlowStageBindingReference",
+    ) -> "FlowStageBinding | FlowStageBindingReference":
+        """Reference `binding` if it is saved, in-memory bindings are returned as-is"""
+        if not isinstance(binding, FlowStageBinding) or binding._state.adding:
+            return binding
+        return FlowStageBindingReference(binding.pk)
+
+    def resolve(self) -> "FlowStageBinding":
+        return FlowStageBinding.objects.get(pk=self.pk)
+
+
 class ConfigurableStage(models.Model):
     """Abstract base class for a Stage that can be configured by the enduser.
     The stage should create a default flow with the configure_stage designation during
@@ -1,6 +1,7 @@
 """Flows Planner"""
 
 from dataclasses import dataclass, field
+from pickle import UnpicklingError  # nosec
 from typing import TYPE_CHECKING, Any
 
 from django.core.cache import cache
@@ -19,6 +20,7 @@ from authentik.flows.models import (
     FlowAuthenticationRequirement,
     FlowDesignation,
     FlowStageBinding,
+    FlowStageBindingReference,
     Stage,
     in_memory_stage,
 )
@@ -48,6 +50,8 @@ PLAN_CONTEXT_IS_REDIRECTED = "is_redirected"
 PLAN_CONTEXT_REDIRECT_STAGE_TARGET = "redirect_stage_target"
 CACHE_TIMEOUT = CONFIG.get_int("cache.timeout_flows")
 CACHE_PREFIX = "goauthentik.io/flows/planner/"
+# Version of the format flow plans are pickled with, see `FlowPlan.__getstate__`
+FLOW_PLAN_VERSION = 1
 
 
 def cache_key(flow: Flow, user: User | None = None) -> str:
@@ -58,6 +62,33 @@ def cache_key(flow: Flow, user: User | None = None) -> str:
     return prefix
 
 
+def delete_cached_plans(flow: Flow):
+    """Delete the cached plans of a flow, both the generic one and the ones of each user"""
+    cache.delete(cache_key(flow))
+    cache.delete_pattern(f"{cache_key(flow)}#*")
+
+
+class FlowPlanBindings(list):
+    """Bindings of a flow plan loaded from storage. Saved bindings are stored as references,
+    which are resolved when they are accessed."""
+
+    def _resolve(self, index: int) -> FlowStageBinding:
+        binding = list.__getitem__(self, index)
+        if isinstance(binding, FlowStageBindingReference):
+            binding = binding.resolve()
+            list.__setitem__(self, index, binding)
+        return binding
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._resolve(idx) for idx in range(*index.indices(len(self)))]
+        return self._resolve(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._resolve(index)
+
+
 @dataclass(slots=True)
 class FlowPlan:
     """This data-class is the output of a FlowPlanner. It holds a flat list
@@ -69,6 +100,29 @@ class FlowPlan:
     context: dict[str, Any] = field(default_factory=dict)
     markers: list[StageMarker] = field(default_factory=list)
 
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "version": FLOW_PLAN_VERSION,
+            "flow_pk": self.flow_pk,
+            # Iterate over the raw list to not resolve references
+            "bindings": [
+                FlowStageBindingReference.of(binding) for binding in list.__iter__(self.bindings)
+            ],
+            "context": self.context,
+            "markers": self.markers,
+        }
+
+    def __setstate__(self, state: dict[str, Any] | tuple[Any, dict[str, Any]]):
+        if isinstance(state, tuple):
+            # Plans pickled before the format was versioned, which hold full bindings
+            state = {"version": 0, **state[1]}
+        if state["version"] > FLOW_PLAN_VERSION:
+            raise UnpicklingError(f"Unsupported flow plan version {state['version']}")
+        self.flow_pk = state["flow_pk"]
+        self.bindings = FlowPlanBindings(state["bindings"])
+        self.context = state["context"]
+        self.markers = state["markers"]
+
     def append_stage(self, stage: Stage, marker: StageMarker | None = None):
         """Append `stage` to the end of the plan, optionally with stage marker"""
         return self.append(FlowStageBinding(stage=stage), marker)
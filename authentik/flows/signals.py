@@ -15,9 +15,7 @@ LOGGER = get_logger()
 
 def delete_cache_prefix(prefix: str) -> int:
     """Delete keys prefixed with `prefix` and return count of deleted keys."""
-    keys = cache.keys(prefix)
-    cache.delete_many(keys)
-    return len(keys)
+    return cache.delete_pattern(prefix)
 
 
 @receiver(monitoring_set)
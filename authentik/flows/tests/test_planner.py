@@ -1,5 +1,6 @@
 """flow planner tests"""
 
+from pickle import UnpicklingError, dumps, loads  # nosec
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
 from django.core.cache import cache
@@ -22,13 +23,17 @@ from authentik.flows.models import (
     FlowAuthenticationRequirement,
     FlowDesignation,
     FlowStageBinding,
+    FlowStageBindingReference,
     in_memory_stage,
 )
 from authentik.flows.planner import (
+    FLOW_PLAN_VERSION,
     PLAN_CONTEXT_IS_REDIRECTED,
     PLAN_CONTEXT_PENDING_USER,
+    FlowPlan,
     FlowPlanner,
     cache_key,
+    delete_cached_plans,
 )
 from authentik.flows.stage import StageView
 from authentik.lib.generators import generate_id
@@ -180,6 +185,24 @@ class TestFlowPlanner(TestCase):
         key = cache_key(flow, user)
         self.assertTrue(cache.get(key) is not None)
 
+    def test_delete_cached_plans(self):
+        """Test deleting the cached plans of a flow keeps those of other flows"""
+        flow = create_test_flow()
+        other_flow = create_test_flow()
+        user = User.objects.create(username=generate_id())
+        cache.set(cache_key(flow), "foo")
+        cache.set(cache_key(flow, user), "foo")
+        cache.set(cache_key(other_flow), "foo")
+        cache.set(cache_key(other_flow, user), "foo")
+        # Keys of other flows sharing the same prefix
+        cache.set(f"{cache_key(flow)}-foo", "foo")
+        delete_cached_plans(flow)
+        self.assertIsNone(cache.get(cache_key(flow)))
+        self.assertIsNone(cache.get(cache_key(flow, user)))
+        self.assertEqual(cache.get(cache_key(other_flow)), "foo")
+        self.assertEqual(cache.get(cache_key(other_flow, user)), "foo")
+        self.assertEqual(cache.get(f"{cache_key(flow)}-foo"), "foo")
+
     def test_planner_marker_reevaluate(self):
         """Test that the planner creates the proper marker"""
         flow = create_test_flow()
@@ -237,6 +260,51 @@ class TestFlowPlanner(TestCase):
             self.assertIsInstance(plan.markers[0], StageMarker)
             self.assertIsInstance(plan.markers[1], ReevaluateMarker)
 
+    def test_plan_serialization(self):
+        """Test plans store saved bindings as references, which are resolved on access"""
+        flow = create_test_flow()
+        stage = DummyStage.objects.create(name=generate_id())
+        binding = FlowStageBinding.objects.create(
+            target=flow, stage=stage, order=0, re_evaluate_policies=True
+        )
+        request = self.request_factory.get(
+            reverse("authentik_api:flow-executor", kwargs={"flow_slug": flow.slug}),
+        )
+        plan = FlowPlanner(flow).plan(request)
+        plan.append_stage(in_memory_stage(StageView))
+
+        serialized = dumps(plan)
+        self.assertNotIn(stage.name.encode(), serialized)
+        restored: FlowPlan = loads(serialized)  # nosec
+        self.assertIsInstance(list.__getitem__(restored.bindings, 0), FlowStageBindingReference)
+        self.assertIsInstance(restored.markers[0].binding, FlowStageBindingReference)
+        self.assertEqual(restored.bindings[0], binding)
+        self.assertIsInstance(restored.bindings[0].stage, DummyStage)
+        self.assertTrue(restored.bindings[1].stage.is_in_memory)
+
+    def test_plan_serialization_legacy(self):
+        """Test plans pickled before the format was versioned can be loaded,
+        and plans from newer versions are rejected"""
+        flow = create_test_flow()
+        binding = FlowStageBinding.objects.create(
+            target=flow, stage=DummyStage.objects.create(name=generate_id()), order=0
+        )
+        plan = FlowPlan.__new__(FlowPlan)
+        plan.__setstate__(
+            (
+                None,
+                {
+                    "flow_pk": flow.pk.hex,
+                    "bindings": [binding],
+                    "context": {},
+                    "markers": [StageMarker()],
+                },
+            )
+        )
+        self.assertEqual(plan.bindings[0], binding)
+        with self.assertRaises(UnpicklingError):
+            plan.__setstate__({**plan.__getstate__(), "version": FLOW_PLAN_VERSION + 1})
+
     def test_to_redirect(self):
         """Test to_redirect and skipping the flow executor"""
         flow = create_test_flow()
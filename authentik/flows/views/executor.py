@@ -1,10 +1,10 @@
 """authentik multi-stage authentication engine"""
 
 from copy import deepcopy
+from pickle import UnpicklingError  # nosec
 
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.cache import cache
 from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect
 from django.http.request import QueryDict
 from django.shortcuts import get_object_or_404, redirect
@@ -46,12 +46,12 @@ from authentik.flows.models import (
     Stage,
 )
 from authentik.flows.planner import (
-    CACHE_PREFIX,
     PLAN_CONTEXT_IS_RESTORED,
     PLAN_CONTEXT_PENDING_USER,
     PLAN_CONTEXT_REDIRECT,
     FlowPlan,
     FlowPlanner,
+    delete_cached_plans,
 )
 from authentik.flows.stage import AccessDeniedStage, StageView
 from authentik.lib.sentry import SentryIgnoredException, should_ignore_exception
@@ -140,7 +140,7 @@ class FlowExecutorView(APIView):
         plan = None
         try:
             plan = token.plan
-        except (AttributeError, EOFError, ImportError, IndexError) as exc:
+        except (AttributeError, EOFError, ImportError, IndexError, UnpicklingError) as exc:
             LOGGER.warning("f(exec): Failed to restore token plan", exc=exc)
         finally:
             if token.revoke_on_execution:
@@ -201,16 +201,12 @@ class FlowExecutorView(APIView):
             # We don't save the Plan after getting the next stage
             # as it hasn't been successfully passed yet
             try:
-                # This is the first time we actually access any attribute on the selected plan
-                # if the cached plan is from an older version, it might have different attributes
-                # in which case we just delete the plan and invalidate everything
+                # This is the first time we actually access any bindings of the selected plan,
+                # which might fail if they were deleted since the plan was created
                 next_binding = self.plan.next(self.request)
             except Exception as exc:  # noqa
-                self._logger.warning(
-                    "f(exec): found incompatible flow plan, invalidating run", exc=exc
-                )
-                keys = cache.keys(f"{CACHE_PREFIX}*")
-                cache.delete_many(keys)
+                self._logger.warning("f(exec): found invalid flow plan, invalidating run", exc=exc)
+                delete_cached_plans(self.flow)
                 return self.stage_invalid()
             if not next_binding:
                 self._logger.debug("f(exec): no more stages, flow is done.")
@@ -355,12 +351,11 @@ class FlowExecutorView(APIView):
         self.request.session[SESSION_KEY_PLAN] = plan
         try:
             # Call the has_stages getter to check that
-            # there are no issues with the class we might've gotten
-            # from the cache. If there are errors, just delete all cached flows
+            # there are no issues with the plan we might've gotten
+            # from the cache. If there are errors, delete the cached plans of this flow
             _ = plan.has_stages
         except Exception:  # noqa
-            keys = cache.keys(f"{CACHE_PREFIX}*")
-            cache.delete_many(keys)
+            delete_cached_plans(self.flow)
             return self._initiate_plan()
         return plan
 
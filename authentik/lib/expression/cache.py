@@ -0,0 +1,61 @@
+"""Process-wide cache of compiled expressions"""
+
+from hashlib import sha256
+from threading import Lock
+from types import CodeType
+
+from cachetools import LRUCache
+
+CODE_CACHE_SIZE = 1024
+
+
+class CompiledCodeCache:
+    """Bounded cache of compiled code objects, keyed by a hash of the filename and
+    the wrapped source (which includes the parameter signature of the handler)"""
+
+    hits: int
+    misses: int
+
+    def __init__(self, maxsize: int = CODE_CACHE_SIZE):
+        self._cache: LRUCache[str, CodeType] = LRUCache(maxsize=maxsize)
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source: str, filename: str) -> str:
+        """Content-addressed key for `source` compiled as `filename`"""
+        digest = sha256(filename.encode())
+        digest.update(b"\0")
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def compile(self, source: str, filename: str) -> CodeType:
+        """Get compiled code for `source`, compiling it on a miss. Raises SyntaxError
+        or ValueError if the syntax is incorrect, failures are not cached."""
+        key = self.key(source, filename)
+        with self._lock:
+            code = self._cache.get(key)
+            if code is not None:
+                self.hits += 1
+                return code
+            self.misses += 1
+        code = compile(source, filename, "exec")
+        with self._lock:
+            self._cache[key] = code
+        return code
+
+    @property
+    def size(self) -> int:
+        """Number of cached code objects"""
+        return self._cache.currsize
+
+    def clear(self):
+        """Remove all cached code and reset counters"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+CODE_CACHE = CompiledCodeCache()
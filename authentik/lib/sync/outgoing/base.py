@@ -1,19 +1,35 @@
 """Basic outgoing sync Client"""
 
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from enum import StrEnum
-from typing import TYPE_CHECKING
+from hashlib import sha256
+from queue import Empty, Queue
+from threading import Event as ThreadEvent
+from typing import TYPE_CHECKING, Any
 
 from deepmerge import always_merger
-from django.db import DatabaseError
+from django.db import DatabaseError, connection
+from orjson import OPT_SORT_KEYS, dumps
 from structlog.stdlib import get_logger
 
 from authentik.core.expression.exceptions import (
     PropertyMappingExpressionException,
+    SkipObjectException,
 )
+from authentik.core.models import Group
 from authentik.events.models import Event, EventAction
+from authentik.events.utils import sanitize_item
 from authentik.lib.expression.exceptions import ControlFlowException
 from authentik.lib.sync.mapper import PropertyMappingManager
-from authentik.lib.sync.outgoing.exceptions import NotFoundSyncException, StopSync
+from authentik.lib.sync.outgoing.exceptions import (
+    BadRequestSyncException,
+    DryRunRejected,
+    NotFoundSyncException,
+    StopSync,
+    TransientSyncException,
+)
 
 if TYPE_CHECKING:
     from django.db.models import Model
@@ -34,6 +50,15 @@ SAFE_METHODS = [
     "TRACE",
 ]
 
+# Exceptions which only fail the sync of a single object
+SYNC_OBJECT_EXCEPTIONS = (
+    SkipObjectException,
+    DryRunRejected,
+    BadRequestSyncException,
+    TransientSyncException,
+    StopSync,
+)
+
 
 class BaseOutgoingSyncClient[
     TModel: "Model", TConnection: "Model", TSchema: dict, TProvider: "OutgoingSyncProvider"
@@ -50,6 +75,7 @@ class BaseOutgoingSyncClient[
     def __init__(self, provider: TProvider):
         self.logger = get_logger().bind(provider=provider.name)
         self.provider = provider
+        self._fingerprints: dict[Any, str] = {}
 
     def create(self, obj: TModel) -> TConnection:
         """Create object in remote destination"""
@@ -82,6 +108,79 @@ class BaseOutgoingSyncClient[
                 connection.delete()
         return None, False
 
+    def try_write(self, obj: TModel) -> Exception | None:
+        """Write object to destination, returning the exception raised while writing it"""
+        try:
+            self.write(obj)
+        except SYNC_OBJECT_EXCEPTIONS as exc:
+            return exc
+        return None
+
+    def write_many(self, objects: list[TModel]) -> Iterator[tuple[TModel, Exception | None]]:
+        """Write multiple objects to destination, yielding each object and the exception
+        raised while writing it, if any. Can be overwritten to write objects in bulk"""
+        for obj in objects:
+            yield obj, self.try_write(obj)
+
+    def _write_worker(
+        self,
+        objects: Queue[tuple[TModel, Future]],
+        stop: ThreadEvent,
+        tenant,
+    ):
+        """Write objects from `objects` until it is empty. Each worker uses its own client,
+        as property mappings keep the context of the object they're evaluated for"""
+        if tenant:
+            connection.set_tenant(tenant)
+        client = None
+        try:
+            while not stop.is_set():
+                try:
+                    obj, future = objects.get_nowait()
+                except Empty:
+                    return
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if client is None:
+                        client = self.__class__(self.provider)
+                    future.set_result(client.try_write(obj))
+                except Exception as exc:  # noqa
+                    future.set_exception(exc)
+        finally:
+            # The pool's threads end with the page, which would leave their connection open
+            connection.close()
+
+    def write_concurrently(
+        self, objects: list[TModel], workers: int
+    ) -> Iterator[tuple[TModel, Exception | None]]:
+        """Write objects with up to `workers` concurrent requests, yielding results in the
+        order of `objects`. Writes which haven't started yet are cancelled when the caller
+        stops iterating"""
+        if workers <= 1 or len(objects) <= 1:
+            yield from BaseOutgoingSyncClient.write_many(self, objects)
+            return
+        tenant = getattr(connection, "tenant", None)
+        pending: Queue[tuple[TModel, Future]] = Queue()
+        futures = []
+        for obj in objects:
+            future = Future()
+            futures.append(future)
+            pending.put((obj, future))
+        stop = ThreadEvent()
+        workers = min(workers, len(objects))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="authentik-sync")
+        try:
+            for _ in range(workers):
+                pool.submit(self._write_worker, pending, stop, tenant)
+            for obj, future in zip(objects, futures, strict=True):
+                yield obj, future.result()
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+
     def delete(self, obj: TModel):
         """Delete object from destination"""
         raise NotImplementedError()
@@ -115,6 +214,67 @@ class BaseOutgoingSyncClient[
             raw_final_object.setdefault(key, value)
         return raw_final_object
 
+    def schema_as_dict(self, schema: TSchema) -> dict:
+        """Convert the output of `to_schema` into a JSON-serializable dictionary"""
+        return schema
+
+    def fingerprint(self, obj: TModel, connection: TConnection | None) -> str:
+        """Fingerprint of the schema rendered for an object, used to detect objects
+        which changed since they were last written"""
+        data = {"schema": self.schema_as_dict(self.to_schema(obj, connection))}
+        if isinstance(obj, Group):
+            # Group writes also sync the members of the group
+            data["members"] = sorted(obj.users.values_list("pk", flat=True))
+        fingerprint = sha256(dumps(sanitize_item(data), option=OPT_SORT_KEYS)).hexdigest()
+        self._fingerprints[obj.pk] = fingerprint
+        return fingerprint
+
+    def filter_changed(self, objects: list[TModel], since: datetime | None) -> list[TModel]:
+        """Filter objects to those whose fingerprint changed since they were last written,
+        or which were modified after `since`"""
+        connections = {
+            getattr(conn, f"{self.connection_type_query}_id"): conn
+            for conn in self.connection_type.objects.filter(
+                provider=self.provider, **{f"{self.connection_type_query}__in": objects}
+            )
+        }
+        changed = []
+        for obj in objects:
+            connection = connections.get(obj.pk)
+            try:
+                fingerprint = self.fingerprint(obj, connection)
+            except SYNC_OBJECT_EXCEPTIONS:
+                # Errors are reported when the object is written
+                changed.append(obj)
+                continue
+            last_updated = getattr(obj, "last_updated", None)
+            if (
+                not connection
+                or fingerprint != connection.fingerprint
+                or not since
+                or (last_updated and last_updated > since)
+            ):
+                changed.append(obj)
+        return changed
+
+    def save_fingerprints(self, objects: list[TModel]):
+        """Store the fingerprints computed by `filter_changed` on the connections
+        of objects which were written successfully"""
+        if self.provider.dry_run:
+            return
+        fingerprints = {
+            obj.pk: self._fingerprints[obj.pk] for obj in objects if obj.pk in self._fingerprints
+        }
+        changed = []
+        for conn in self.connection_type.objects.filter(
+            provider=self.provider, **{f"{self.connection_type_query}__pk__in": fingerprints}
+        ):
+            fingerprint = fingerprints[getattr(conn, f"{self.connection_type_query}_id")]
+            if conn.fingerprint != fingerprint:
+                conn.fingerprint = fingerprint
+                changed.append(conn)
+        self.connection_type.objects.bulk_update(changed, ["fingerprint"])
+
     def discover(self):
         """Optional method. Can be used to implement a "discovery" where
         upon creation of this provider, this function will be called and can
@@ -44,6 +44,14 @@ class OutgoingSyncProvider(ScheduledModel, Model):
             "When enabled, provider will not modify or create objects in the remote system."
         ),
     )
+    sync_delta = models.BooleanField(
+        default=False,
+        help_text=_(
+            "When enabled, scheduled syncs only write objects which changed since "
+            "they were last synced."
+        ),
+    )
+    sync_watermark = models.DateTimeField(null=True, default=None, editable=False)
 
     class Meta:
         abstract = True
@@ -1,7 +1,9 @@
 from django.core.paginator import Paginator
 from django.db.models import Model, QuerySet
 from django.db.models.query import Q
+from django.utils.timezone import now
 from dramatiq.actor import Actor
+from dramatiq.broker import get_broker
 from dramatiq.composition import group
 from dramatiq.errors import Retry
 from structlog.stdlib import BoundLogger, get_logger
@@ -41,6 +43,7 @@ class SyncTasks:
         sync_objects: Actor[[str, int, int, bool], None],
         paginator: Paginator,
         object_type: type[User | Group],
+        delta: bool = False,
         **options,
     ):
         tasks = []
@@ -48,6 +51,7 @@ class SyncTasks:
         for page in paginator.page_range:
             page_sync = sync_objects.message_with_options(
                 args=(class_to_path(object_type), page, provider.pk),
+                kwargs={"delta": delta},
                 time_limit=time_limit,
                 # Assign tasks to the same schedule as the current one
                 rel_obj=current_task.rel_obj,
@@ -74,8 +78,12 @@ class SyncTasks:
         if not provider:
             task.warning("No provider found. Is it assigned to an application?")
             return
-        task.info("Starting full provider sync")
+        if provider.sync_delta:
+            task.info("Starting delta provider sync")
+        else:
+            task.info("Starting full provider sync")
         self.logger.debug("Starting provider sync")
+        started = now()
         with provider.sync_lock as lock_acquired:
             if not lock_acquired:
                 task.info("Synchronization is already running. Skipping.")
@@ -89,6 +97,7 @@ class SyncTasks:
                         sync_objects=sync_objects,
                         paginator=provider.get_paginator(User),
                         object_type=User,
+                        delta=provider.sync_delta,
                     )
                 )
                 group_tasks = group(
@@ -98,10 +107,17 @@ class SyncTasks:
                         sync_objects=sync_objects,
                         paginator=provider.get_paginator(Group),
                         object_type=Group,
+                        delta=provider.sync_delta,
                     )
                 )
-                users_tasks.run().wait(timeout=provider.get_object_sync_time_limit_ms(User))
-                group_tasks.run().wait(timeout=provider.get_object_sync_time_limit_ms(Group))
+                with get_broker().batch():
+                    users_tasks.run()
+                users_tasks.wait(timeout=provider.get_object_sync_time_limit_ms(User))
+                with get_broker().batch():
+                    group_tasks.run()
+                group_tasks.wait(timeout=provider.get_object_sync_time_limit_ms(Group))
+                # Objects modified after the sync started are written by the next delta sync
+                self._provider_model.objects.filter(pk=provider.pk).update(sync_watermark=started)
             except TransientSyncException as exc:
                 self.logger.warning("transient sync exception", exc=exc)
                 task.warning("Sync encountered a transient exception. Retrying", exc=exc)
@@ -116,6 +132,7 @@ class SyncTasks:
         page: int,
         provider_pk: int,
         override_dry_run=False,
+        delta=False,
         **filter,
     ):
         task = CurrentTask.get_task()
@@ -149,14 +166,20 @@ class SyncTasks:
             client.discover()
         self.logger.debug("starting sync for page", page=page)
         task.info(f"Syncing page {page} or {_object_type._meta.verbose_name_plural}")
-        for obj in paginator.page(page).object_list:
+        objects = list(paginator.page(page).object_list)
+        if delta:
+            changed = client.filter_changed(objects, provider.sync_watermark)
+            task.info(f"Skipping {len(objects) - len(changed)} unchanged objects")
+            objects = changed
+        written = []
+        for obj, exc in client.write_many(objects):
             obj: Model
-            try:
-                client.write(obj)
-            except SkipObjectException:
-                self.logger.debug("skipping object due to SkipObject", obj=obj)
+            if exc is None:
+                written.append(obj)
                 continue
-            except DryRunRejected as exc:
+            if isinstance(exc, SkipObjectException):
+                self.logger.debug("skipping object due to SkipObject", obj=obj)
+            elif isinstance(exc, DryRunRejected):
                 task.info(
                     "Dropping mutating request due to dry run",
                     obj=sanitize_item(obj),
@@ -164,7 +187,7 @@ class SyncTasks:
                     url=exc.url,
                     body=exc.body,
                 )
-            except BadRequestSyncException as exc:
+            elif isinstance(exc, BadRequestSyncException):
                 self.logger.warning("failed to sync object", exc=exc, obj=obj)
                 task.warning(
                     f"Failed to sync {str(obj)} due to error: {str(exc)}",
@@ -172,20 +195,29 @@ class SyncTasks:
                     obj=sanitize_item(obj),
                     exception=exception_to_dict(exc),
                 )
-            except TransientSyncException as exc:
+            elif isinstance(exc, TransientSyncException):
                 self.logger.warning("failed to sync object", exc=exc, user=obj)
                 task.warning(
                     f"Failed to sync {str(obj)} due to transient error: {str(exc)}",
                     obj=sanitize_item(obj),
                     exception=exception_to_dict(exc),
                 )
-            except StopSync as exc:
+            elif isinstance(exc, StopSync):
                 self.logger.warning("Stopping sync", exc=exc)
                 task.warning(
                     f"Stopping sync due to error: {exc.detail()}",
                     obj=sanitize_item(obj),
                 )
                 break
+            else:
+                self.logger.warning("failed to sync object", exc=exc, obj=obj)
+                task.warning(
+                    f"Failed to sync {str(obj)} due to error: {str(exc)}",
+                    obj=sanitize_item(obj),
+                    exception=exception_to_dict(exc),
+                )
+        if delta:
+            client.save_fingerprints(written)
 
     def sync_signal_direct_dispatch(
         self,
@@ -9,6 +9,7 @@ from jwt import decode
 from authentik.blueprints.tests import apply_blueprint
 from authentik.core.tests.utils import create_test_admin_user, create_test_flow, create_test_user
 from authentik.events.models import Event
+from authentik.lib.expression.cache import CODE_CACHE, CompiledCodeCache
 from authentik.lib.expression.evaluator import BaseEvaluator
 from authentik.lib.generators import generate_id
 from authentik.providers.oauth2.models import OAuth2Provider, ScopeMapping
@@ -37,6 +38,33 @@ class TestEvaluator(TestCase):
         """Test expr_is_group_member"""
         self.assertFalse(BaseEvaluator.expr_is_group_member(create_test_admin_user(), name="test"))
 
+    def test_compile_cache(self):
+        """Test compiled code is shared between evaluators"""
+        CODE_CACHE.clear()
+        evaluator = BaseEvaluator(generate_id())
+        evaluator._context = {"foo": "bar"}
+        self.assertEqual(evaluator.evaluate("return foo"), "bar")
+        self.assertEqual(CODE_CACHE.misses, 1)
+        other = BaseEvaluator(evaluator._filename)
+        other._context = {"foo": "baz"}
+        self.assertEqual(other.evaluate("return foo"), "baz")
+        self.assertEqual(CODE_CACHE.hits, 1)
+        # Different parameter signature compiles separately
+        other._context = {"foo": "baz", "bar": "qux"}
+        self.assertEqual(other.evaluate("return bar"), "qux")
+        self.assertEqual(CODE_CACHE.misses, 2)
+
+    def test_compile_cache_bounded(self):
+        """Test compiled code cache size is bounded"""
+        cache = CompiledCodeCache(maxsize=2)
+        for idx in range(5):
+            cache.compile(f"result = {idx}", "test")
+        self.assertEqual(cache.size, 2)
+        self.assertEqual(cache.misses, 5)
+        with self.assertRaises(SyntaxError):
+            cache.compile("result = (", "test")
+        self.assertEqual(cache.size, 2)
+
     def test_expr_event_create(self):
         """Test expr_event_create"""
         evaluator = BaseEvaluator(generate_id())
@@ -486,20 +486,22 @@ class OutpostState:
         if not keys:
             return []
         states = []
-        for key in keys:
+        for key, data in cache.get_many(keys).items():
             instance_uid = key.replace(f"{outpost.state_cache_prefix}/", "")
-            states.append(OutpostState.for_instance_uid(outpost, instance_uid))
+            states.append(OutpostState._from_cache(outpost, key, instance_uid, data))
         return states
 
     @staticmethod
     def for_instance_uid(outpost: Outpost, uid: str) -> "OutpostState":
         """Get state for a single instance"""
         key = f"{outpost.state_cache_prefix}/{uid}"
-        default_data = {"uid": uid}
-        data = cache.get(key, default_data)
+        return OutpostState._from_cache(outpost, key, uid, cache.get(key, {"uid": uid}))
+
+    @staticmethod
+    def _from_cache(outpost: Outpost, key: str, uid: str, data: dict | str) -> "OutpostState":
         if isinstance(data, str):
             cache.delete(key)
-            data = default_data
+            data = {"uid": uid}
         state = from_dict(OutpostState, data)
 
         state._outpost = outpost
@@ -113,12 +113,10 @@ class PolicyViewSet(
     @action(detail=False, methods=["POST"])
     def cache_clear(self, request: Request) -> Response:
         """Clear policy cache"""
-        keys = cache.keys(f"{CACHE_PREFIX}*")
-        cache.delete_many(keys)
-        LOGGER.debug("Cleared Policy cache", keys=len(keys))
+        count = cache.delete_pattern(f"{CACHE_PREFIX}*")
+        LOGGER.debug("Cleared Policy cache", keys=count)
         # Also delete user application cache
-        keys = cache.keys(user_app_cache_key("*"))
-        cache.delete_many(keys)
+        cache.delete_pattern(user_app_cache_key("*"))
         return Response(status=204)
 
     @permission_required("authentik_policies.view_policy")
@@ -1,10 +1,16 @@
 """authentik policy engine"""
 
 from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from multiprocessing import Pipe, current_process
 from multiprocessing.connection import Connection
+from os import register_at_fork
+from threading import Condition, Lock
+from time import perf_counter
 
 from django.core.cache import cache
+from django.db import close_old_connections, connection
 from django.db.models import Count, Q, QuerySet
 from django.http import HttpRequest
 from sentry_sdk import start_span
@@ -12,6 +18,7 @@ from sentry_sdk.tracing import Span
 from structlog.stdlib import BoundLogger, get_logger
 
 from authentik.core.models import User
+from authentik.lib.config import CONFIG
 from authentik.lib.utils.reflection import class_to_path
 from authentik.policies.apps import HIST_POLICIES_ENGINE_TOTAL_TIME, HIST_POLICIES_EXECUTION_TIME
 from authentik.policies.exceptions import PolicyEngineException
@@ -20,21 +27,146 @@ from authentik.policies.process import PolicyProcess, cache_key
 from authentik.policies.types import PolicyRequest, PolicyResult
 
 CURRENT_PROCESS = current_process()
+LOGGER = get_logger()
+
+_POOL: ThreadPoolExecutor | None = None
+_POOL_WORKERS = 0
+# Number of policies submitted to the pool which haven't finished yet
+_POOL_IN_FLIGHT = 0
+_POOL_LOCK = Lock()
+# Notified whenever a policy submitted to the pool finishes
+_POOL_SLOT_FREED = Condition(_POOL_LOCK)
+
+
+def _reset_pool():
+    """Threads don't survive a fork, so make sure children create their own pool"""
+    global _POOL, _POOL_IN_FLIGHT  # noqa: PLW0603
+    _POOL = None
+    _POOL_IN_FLIGHT = 0
+
+
+register_at_fork(after_in_child=_reset_pool)
+
+
+def get_policy_pool() -> ThreadPoolExecutor | None:
+    """Get the process-wide pool used to evaluate policies concurrently, or None
+    if concurrent evaluation is disabled"""
+    global _POOL, _POOL_WORKERS  # noqa: PLW0603
+    workers = CONFIG.get_int("policies.engine.workers", 0)
+    if workers < 1:
+        return None
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="authentik-policy"
+                )
+                _POOL_WORKERS = workers
+    return _POOL
+
+
+def _pool_task_done(_: Future):
+    global _POOL_IN_FLIGHT  # noqa: PLW0603
+    with _POOL_SLOT_FREED:
+        _POOL_IN_FLIGHT = max(_POOL_IN_FLIGHT - 1, 0)
+        _POOL_SLOT_FREED.notify()
+
+
+def _evaluate_in_thread(info: "PolicyProcessInfo", tenant) -> PolicyResult:
+    """Evaluate a policy on a pool thread, using the same tenant as the caller"""
+    close_old_connections()
+    if tenant:
+        connection.set_tenant(tenant)
+    try:
+        return info.process.profiling_wrapper()
+    except Exception as exc:  # noqa
+        LOGGER.warning("Policy failed to run", exc=exc)
+        return PolicyResult(False, str(exc))
+    finally:
+        close_old_connections()
+
+
+def submit_policy(info: "PolicyProcessInfo") -> bool:
+    """Evaluate a policy on the pool, returns False if it has to be evaluated in the
+    calling thread instead. Pool threads use their own database connection, so they can't
+    see uncommitted data of the caller. When all workers are busy, wait for one to become
+    free; the time spent waiting counts towards the binding's timeout."""
+    global _POOL_IN_FLIGHT  # noqa: PLW0603
+    pool = get_policy_pool()
+    if not pool:
+        return False
+    if connection.in_atomic_block:
+        LOGGER.debug(
+            "P_ENG: Inside of a transaction, evaluating policy in calling thread",
+            binding=info.binding,
+        )
+        return False
+    info.submitted = perf_counter()
+    with _POOL_SLOT_FREED:
+        if not _POOL_SLOT_FREED.wait_for(
+            lambda: _POOL_IN_FLIGHT < _POOL_WORKERS, timeout=info.binding.timeout
+        ):
+            info.timed_out()
+            return True
+        _POOL_IN_FLIGHT += 1
+    info.future = pool.submit(_evaluate_in_thread, info, getattr(connection, "tenant", None))
+    info.future.add_done_callback(_pool_task_done)
+    return True
 
 
 class PolicyProcessInfo:
     """Dataclass to hold all information and communication channels to a process"""
 
     process: PolicyProcess
-    connection: Connection
+    connection: Connection | None
+    future: Future[PolicyResult] | None
     result: PolicyResult | None
     binding: PolicyBinding
+    # When the policy was submitted to the pool, its timeout is counted from here
+    submitted: float
 
-    def __init__(self, process: PolicyProcess, connection: Connection, binding: PolicyBinding):
+    def __init__(
+        self,
+        process: PolicyProcess,
+        connection: Connection | None,
+        binding: PolicyBinding,
+    ):
         self.process = process
         self.connection = connection
         self.binding = binding
+        self.future = None
         self.result = None
+        self.submitted = 0
+
+    def timed_out(self):
+        """Use the failure result of the binding"""
+        LOGGER.warning(
+            "P_ENG: Policy timed out, using failure result",
+            binding=self.binding,
+            timeout=self.binding.timeout,
+        )
+        self.result = PolicyResult(self.binding.failure_result, "Policy timed out")
+        self.result.source_binding = self.binding
+
+    def collect(self):
+        """Wait for the result of this policy until its timeout, counted from when it
+        was submitted"""
+        if self.result is not None:
+            return
+        if self.future is None:
+            if self.process.is_alive():
+                self.process.join(self.binding.timeout)
+            # Only call .recv() if no result is saved, otherwise we just deadlock here
+            if not self.result:
+                self.result = self.connection.recv()
+            return
+        try:
+            timeout = self.submitted + self.binding.timeout - perf_counter()
+            self.result = self.future.result(timeout=max(timeout, 0))
+        except FutureTimeoutError:
+            # Only cancels the policy if it hasn't started yet, running threads can't be stopped
+            self.future.cancel()
+            self.timed_out()
 
 
 class PolicyEngine:
@@ -167,24 +299,21 @@ class PolicyEngine:
                 if self._check_cache(binding):
                     continue
                 self.logger.debug("P_ENG: Evaluating policy", binding=binding, request=self.request)
-                our_end, task_end = Pipe(False)
-                task = PolicyProcess(binding, self.request, task_end)
+                task = PolicyProcess(binding, self.request, None)
+                info = PolicyProcessInfo(process=task, connection=None, binding=binding)
+                self.__processes.append(info)
+                if submit_policy(info):
+                    continue
+                info.connection, task.connection = Pipe(False)
                 task.daemon = False
                 self.logger.debug("P_ENG: Starting Process", binding=binding, request=self.request)
                 if not CURRENT_PROCESS._config.get("daemon"):
                     task.run()
                 else:
                     task.start()
-                self.__processes.append(
-                    PolicyProcessInfo(process=task, connection=our_end, binding=binding)
-                )
             # If all policies are cached, we have an empty list here.
             for proc_info in self.__processes:
-                if proc_info.process.is_alive():
-                    proc_info.process.join(proc_info.binding.timeout)
-                # Only call .recv() if no result is saved, otherwise we just deadlock here
-                if not proc_info.result:
-                    proc_info.result = proc_info.connection.recv()
+                proc_info.collect()
             return self
 
     @property
@@ -2,14 +2,15 @@
 
 from django.core.cache import cache
 from django.db import connections
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.test.utils import CaptureQueriesContext
 
 from authentik.core.models import Group
 from authentik.core.tests.utils import create_test_user
+from authentik.lib.config import CONFIG
 from authentik.lib.generators import generate_id
 from authentik.policies.dummy.models import DummyPolicy
-from authentik.policies.engine import PolicyEngine
+from authentik.policies.engine import PolicyEngine, _reset_pool
 from authentik.policies.exceptions import PolicyEngineException
 from authentik.policies.expression.models import ExpressionPolicy
 from authentik.policies.models import Policy, PolicyBinding, PolicyBindingModel, PolicyEngineMode
@@ -112,6 +113,17 @@ class TestPolicyEngine(TestCase):
         self.assertEqual(result.passing, True)
         self.assertEqual(result.messages, ("division by zero",))
 
+    def test_engine_concurrent_atomic(self):
+        """Test policies are evaluated in the calling thread inside of a transaction,
+        where pool threads couldn't see uncommitted data"""
+        pbm = PolicyBindingModel.objects.create()
+        PolicyBinding.objects.create(target=pbm, policy=self.policy_true, order=0)
+        with CONFIG.patch("policies.engine.workers", 2):
+            engine = PolicyEngine(pbm, self.user)
+            engine.use_cache = False
+            result = engine.build().result
+        self.assertEqual(result.passing, True)
+
     def test_engine_policy_type(self):
         """Test invalid policy type"""
         pbm = PolicyBindingModel.objects.create()
@@ -186,3 +198,90 @@ class TestPolicyEngine(TestCase):
             engine.build()
         self.assertLess(ctx.final_queries, 1000)
         self.assertTrue(engine.result.passing)
+
+
+class TestPolicyEngineConcurrent(TransactionTestCase):
+    """PolicyEngine tests with policies evaluated on the pool, which requires
+    committed data"""
+
+    def setUp(self):
+        clear_policy_cache()
+        _reset_pool()
+        self.user = create_test_user()
+        self.policy_false = DummyPolicy.objects.create(
+            name=generate_id(), result=False, wait_min=0, wait_max=1
+        )
+        self.policy_true = DummyPolicy.objects.create(
+            name=generate_id(), result=True, wait_min=0, wait_max=1
+        )
+
+    def test_engine_concurrent(self):
+        """Test concurrent evaluation keeps binding order"""
+        pbm = PolicyBindingModel.objects.create(policy_engine_mode=PolicyEngineMode.MODE_ANY)
+        PolicyBinding.objects.create(target=pbm, policy=self.policy_false, order=0)
+        PolicyBinding.objects.create(target=pbm, policy=self.policy_true, negate=True, order=1)
+        PolicyBinding.objects.create(target=pbm, policy=self.policy_true, order=2)
+        with CONFIG.patch("policies.engine.workers", 2):
+            engine = PolicyEngine(pbm, self.user)
+            engine.use_cache = False
+            result = engine.build().result
+        self.assertEqual(result.passing, True)
+        self.assertEqual(
+            [x.passing for x in result.source_results],
+            [False, False, True],
+        )
+
+    def test_engine_concurrent_timeout(self):
+        """Test policies exceeding their timeout use the failure result"""
+        policy_slow = DummyPolicy.objects.create(
+            name=generate_id(), result=True, wait_min=3, wait_max=4
+        )
+        pbm = PolicyBindingModel.objects.create()
+        PolicyBinding.objects.create(
+            target=pbm, policy=policy_slow, order=0, timeout=1, failure_result=False
+        )
+        with CONFIG.patch("policies.engine.workers", 2):
+            engine = PolicyEngine(pbm, self.user)
+            engine.use_cache = False
+            result = engine.build().result
+        self.assertEqual(result.passing, False)
+        self.assertEqual(result.messages, ("Policy timed out",))
+
+    def test_engine_concurrent_saturated(self):
+        """Test policies wait for a free worker when all workers are busy"""
+        policy_slow = DummyPolicy.objects.create(
+            name=generate_id(), result=True, wait_min=2, wait_max=3
+        )
+        pbm = PolicyBindingModel.objects.create()
+        PolicyBinding.objects.create(
+            target=pbm, policy=policy_slow, order=0, timeout=1, failure_result=False
+        )
+        PolicyBinding.objects.create(target=pbm, policy=self.policy_true, order=1)
+        with CONFIG.patch("policies.engine.workers", 1):
+            engine = PolicyEngine(pbm, self.user)
+            engine.use_cache = False
+            result = engine.build().result
+        self.assertEqual(
+            [x.passing for x in result.source_results],
+            [False, True],
+        )
+
+    def test_engine_concurrent_saturated_timeout(self):
+        """Test time spent waiting for a free worker counts towards the timeout"""
+        policy_slow = DummyPolicy.objects.create(
+            name=generate_id(), result=True, wait_min=2, wait_max=3
+        )
+        pbm = PolicyBindingModel.objects.create()
+        PolicyBinding.objects.create(target=pbm, policy=policy_slow, order=0)
+        PolicyBinding.objects.create(
+            target=pbm, policy=self.policy_true, order=1, timeout=1, failure_result=False
+        )
+        with CONFIG.patch("policies.engine.workers", 1):
+            engine = PolicyEngine(pbm, self.user)
+            engine.use_cache = False
+            result = engine.build().result
+        self.assertEqual(
+            [x.passing for x in result.source_results],
+            [True, False],
+        )
+        self.assertEqual(result.messages, ("Policy timed out",))
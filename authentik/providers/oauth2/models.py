@@ -27,7 +27,6 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from jwcrypto.common import json_encode
 from jwcrypto.jwe import JWE
-from jwcrypto.jwk import JWK
 from jwt import encode
 from rest_framework.serializers import Serializer
 from structlog.stdlib import get_logger
@@ -399,7 +398,7 @@ class OAuth2Provider(WebfingerProvider, Provider):
 
     def encrypt(self, raw: str) -> str:
         """Encrypt JWT"""
-        key = JWK.from_pem(self.encryption_key.certificate_data.encode())
+        key = self.encryption_key.certificate_jwk
         jwe = JWE(
             raw,
             json_encode(
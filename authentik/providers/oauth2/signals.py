@@ -1,10 +1,12 @@
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
+from django.core.cache import cache
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 from structlog.stdlib import get_logger
 
-from authentik.core.models import AuthenticatedSession, User
+from authentik.core.models import Application, AuthenticatedSession, User
+from authentik.crypto.models import CertificateKeyPair
 from authentik.flows.models import in_memory_stage
 from authentik.outposts.tasks import hash_session_key
 from authentik.providers.iframe_logout import IframeLogoutStageView
@@ -13,9 +15,11 @@ from authentik.providers.oauth2.models import (
     AccessToken,
     DeviceToken,
     OAuth2LogoutMethod,
+    OAuth2Provider,
     RefreshToken,
 )
 from authentik.providers.oauth2.tasks import backchannel_logout_notification_dispatch
+from authentik.providers.oauth2.views.jwks import CACHE_PREFIX as JWKS_CACHE_PREFIX
 from authentik.stages.user_logout.models import UserLogoutStage
 from authentik.stages.user_logout.stage import flow_pre_user_logout
 
@@ -142,3 +146,15 @@ def user_deactivated(sender, instance: User, **_):
     AccessToken.objects.filter(user=instance).delete()
     RefreshToken.objects.filter(user=instance).delete()
     DeviceToken.objects.filter(user=instance).delete()
+
+
+@receiver(post_save, sender=CertificateKeyPair)
+@receiver(pre_delete, sender=CertificateKeyPair)
+@receiver(post_save, sender=OAuth2Provider)
+@receiver(pre_delete, sender=OAuth2Provider)
+@receiver(post_save, sender=Application)
+@receiver(pre_delete, sender=Application)
+def invalidate_jwks_cache(sender, instance, **_):
+    """Invalidate cached JWKS when keys or the providers using them change"""
+    total = cache.delete_pattern(f"{JWKS_CACHE_PREFIX}*")
+    LOGGER.debug("Invalidating JWKS cache", instance=instance, len=total)
@@ -2,7 +2,9 @@
 
 from base64 import b64encode, urlsafe_b64encode
 from collections.abc import Generator
-from typing import Literal
+from hashlib import sha256
+from json import dumps
+from typing import Any, Literal
 
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric.ec import (
@@ -14,14 +16,20 @@ from cryptography.hazmat.primitives.asymmetric.ec import (
 )
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
 from cryptography.hazmat.primitives.serialization import Encoding
-from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.core.cache import cache
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.utils.timezone import now
 from django.views import View
 from jwt.utils import base64url_encode
 
 from authentik.core.models import Application
 from authentik.crypto.models import CertificateKeyPair
+from authentik.lib.config import CONFIG
 from authentik.providers.oauth2.models import JWTAlgorithms, OAuth2Provider
 
+CACHE_PREFIX = "goauthentik.io/providers/oauth2/jwks/"
+
 # See https://notes.salrahman.com/generate-es256-es384-es512-private-keys/
 # and _CURVE_TYPES in the same file as the below curve files
 ec_crv_map = {
@@ -62,6 +70,16 @@ def to_base64url_uint(val: int, min_length: int = 0) -> bytes:
     return base64url_encode(int_bytes)
 
 
+def jwks_cache_key(name: str) -> str:
+    """Cache key where a rendered JWKS is saved"""
+    return f"{CACHE_PREFIX}{name}"
+
+
+def jwks_cache_timeout() -> int:
+    """Maximum time in seconds a rendered JWKS is cached for, both by authentik and clients"""
+    return CONFIG.get_int("providers.oauth2.jwks_cache_timeout", 3600)
+
+
 class JWKSView(View):
     """Show RSA Key data for Provider"""
 
@@ -114,7 +132,7 @@ class JWKSView(View):
         )
         return key_data
 
-    def get_keys(self) -> Generator[dict | None]:
+    def get_keypairs(self) -> Generator[tuple[CertificateKeyPair, Literal["sig", "enc"]]]:
         provider_ids = Application.objects.filter(
             slug=self.kwargs["application_slug"],
         ).values_list(
@@ -131,19 +149,51 @@ class JWKSView(View):
             raise Http404()
 
         if signing_key := provider.signing_key:
-            yield JWKSView.get_jwk_for_key(signing_key, "sig")
+            yield signing_key, "sig"
         if encryption_key := provider.encryption_key:
-            yield JWKSView.get_jwk_for_key(encryption_key, "enc")
+            yield encryption_key, "enc"
 
-    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        """Show JWK Key data for Provider"""
+    def get_cache_key(self) -> str:
+        return jwks_cache_key(self.kwargs["application_slug"])
+
+    def render_jwks(self) -> dict[str, Any]:
+        """Render the JWKS, together with its ETag and the time at which
+        the first of its certificates expires"""
         response_data = {}
-        for jwk in self.get_keys():
-            if jwk:
+        expiries = []
+        for keypair, use in self.get_keypairs():
+            if keypair.cert_expiry:
+                expiries.append(keypair.cert_expiry)
+            if jwk := JWKSView.get_jwk_for_key(keypair, use):
                 response_data.setdefault("keys", [])
                 response_data["keys"].append(jwk)
+        content = dumps(response_data)
+        return {
+            "content": content,
+            "etag": f'"{sha256(content.encode()).hexdigest()}"',
+            "expiry": min(expiries) if expiries else None,
+        }
 
-        response = JsonResponse(response_data)
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Show JWK Key data for Provider"""
+        timeout = jwks_cache_timeout()
+        key = self.get_cache_key()
+        jwks = cache.get(key)
+        if jwks is None:
+            jwks = self.render_jwks()
+            cache.set(key, jwks, timeout=timeout)
+        # Clients shouldn't keep the JWKS past the expiry of its certificates,
+        # as the keys are likely to be rotated by then
+        max_age = timeout
+        if jwks["expiry"]:
+            max_age = max(0, min(max_age, int((jwks["expiry"] - now()).total_seconds())))
+
+        if jwks["etag"] in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(jwks["content"], content_type="application/json")
+        response["ETag"] = jwks["etag"]
+        response["Cache-Control"] = f"public, max-age={max_age}"
         response["Access-Control-Allow-Origin"] = "*"
 
         return response
@@ -15,7 +15,7 @@ from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from guardian.shortcuts import get_anonymous_user
-from jwt import PyJWK, PyJWT, PyJWTError, decode
+from jwt import PyJWT, PyJWTError, decode
 from sentry_sdk import start_span
 from structlog.stdlib import get_logger
 
@@ -68,7 +68,7 @@ from authentik.providers.oauth2.utils import (
     pkce_s256_challenge,
 )
 from authentik.providers.oauth2.views.authorize import FORBIDDEN_URI_SCHEMES
-from authentik.sources.oauth.models import OAuthSource
+from authentik.sources.oauth.models import OAuthSource, OAuthSourceKey
 from authentik.stages.password.stage import PLAN_CONTEXT_METHOD, PLAN_CONTEXT_METHOD_ARGS
 
 LOGGER = get_logger()
@@ -383,29 +383,27 @@ class TokenParams:
         token = source = None
         if not expected_kid or not fallback_alg:
             return None, None
-        for source in self.provider.jwt_federation_sources.filter(
-            oidc_jwks__keys__contains=[{"kid": expected_kid}]
-        ):
-            LOGGER.debug("verifying JWT with source", source=source.slug)
-            keys = source.oidc_jwks.get("keys", [])
-            for key in keys:
-                if key.get("kid") and key.get("kid") != expected_kid:
-                    continue
-                LOGGER.debug("verifying JWT with key", source=source.slug, key=key.get("kid"))
-                try:
-                    parsed_key = PyJWK.from_dict(key).key
-                    token = decode(
-                        assertion,
-                        parsed_key,
-                        algorithms=[key.get("alg")] if "alg" in key else [fallback_alg],
-                        options={
-                            "verify_aud": False,
-                        },
-                    )
-                # AttributeError is raised when the configured JWK is a private key
-                # and not a public key
-                except (PyJWTError, ValueError, TypeError, AttributeError) as exc:
-                    LOGGER.warning("failed to verify JWT", exc=exc, source=source.slug)
+        source_keys = OAuthSourceKey.objects.filter(
+            source__in=self.provider.jwt_federation_sources.all(), kid=expected_kid
+        ).select_related("source")
+        for source_key in source_keys:
+            source = source_key.source
+            key = source_key.key
+            LOGGER.debug("verifying JWT with key", source=source.slug, key=source_key.kid)
+            try:
+                token = decode(
+                    assertion,
+                    source_key.parsed_key.key,
+                    algorithms=[key.get("alg")] if "alg" in key else [fallback_alg],
+                    options={
+                        "verify_aud": False,
+                    },
+                )
+                break
+            # AttributeError is raised when the configured JWK is a private key
+            # and not a public key
+            except (PyJWTError, ValueError, TypeError, AttributeError) as exc:
+                LOGGER.warning("failed to verify JWT", exc=exc, source=source.slug)
         if token:
             LOGGER.info("successfully verified JWT with source", source=source.slug)
         return token, source
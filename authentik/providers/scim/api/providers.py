@@ -41,7 +41,9 @@ class SCIMProviderSerializer(
             "filter_group",
             "sync_page_size",
             "sync_page_timeout",
+            "sync_concurrency",
             "dry_run",
+            "sync_delta",
         ]
         extra_kwargs = {}
 
@@ -1,5 +1,6 @@
 """SCIM Client"""
 
+from collections.abc import Iterator
 from typing import TYPE_CHECKING
 
 from django.core.cache import cache
@@ -86,6 +87,13 @@ class SCIMClient[TModel: "Model", TConnection: "Model", TSchema: "BaseModel"](
             return {}
         return response.json()
 
+    def schema_as_dict(self, schema: TSchema) -> dict:
+        return schema.model_dump(mode="json", exclude_unset=True)
+
+    def write_many(self, objects: list[TModel]) -> Iterator[tuple[TModel, Exception | None]]:
+        """Write objects using up to `sync_concurrency` concurrent requests"""
+        return self.write_concurrently(objects, self.provider.sync_concurrency)
+
     def get_service_provider_config(self):
         """Get Service provider config"""
         default_config = ServiceProviderConfiguration.default()
@@ -31,4 +31,6 @@ class SCIMRequestException(TransientSyncException):
     def __str__(self):
         if self._response:
             return self._response.text
+        if self._message:
+            return self._message
         return super().__str__()
@@ -1,8 +1,12 @@
 """User client"""
 
+from collections.abc import Iterator
+from itertools import batched
+from json import JSONDecodeError
 from typing import Any
 
 from django.db import transaction
+from django.http import HttpResponseBadRequest, HttpResponseNotFound
 from django.utils.http import urlencode
 from orjson import dumps
 from pydantic import ValidationError
@@ -10,10 +14,23 @@ from pydantic import ValidationError
 from authentik.core.models import User
 from authentik.lib.merge import MERGE_LIST_UNIQUE
 from authentik.lib.sync.mapper import PropertyMappingManager
-from authentik.lib.sync.outgoing.exceptions import ObjectExistsSyncException, StopSync
+from authentik.lib.sync.outgoing import (
+    HTTP_CONFLICT,
+    HTTP_SERVICE_UNAVAILABLE,
+    HTTP_TOO_MANY_REQUESTS,
+)
+from authentik.lib.sync.outgoing.base import SYNC_OBJECT_EXCEPTIONS
+from authentik.lib.sync.outgoing.exceptions import (
+    BaseSyncException,
+    NotFoundSyncException,
+    ObjectExistsSyncException,
+    StopSync,
+    TransientSyncException,
+)
 from authentik.policies.utils import delete_none_values
 from authentik.providers.scim.clients.base import SCIMClient
-from authentik.providers.scim.clients.schema import SCIM_USER_SCHEMA
+from authentik.providers.scim.clients.exceptions import SCIMRequestException
+from authentik.providers.scim.clients.schema import SCIM_BULK_REQUEST_SCHEMA, SCIM_USER_SCHEMA
 from authentik.providers.scim.clients.schema import User as SCIMUserSchema
 from authentik.providers.scim.models import SCIMMapping, SCIMProvider, SCIMProviderUser
 
@@ -123,3 +140,120 @@ class SCIMUserClient(SCIMClient[User, SCIMProviderUser, SCIMUserSchema]):
         )
         connection.attributes = response
         connection.save()
+
+    def write_many(self, users: list[User]) -> Iterator[tuple[User, Exception | None]]:
+        """Write users with /Bulk requests if the remote system supports them"""
+        bulk = self._config.bulk
+        if self.provider.dry_run or not bulk.supported or bulk.maxOperations < 1:
+            yield from super().write_many(users)
+            return
+        for chunk in batched(users, bulk.maxOperations, strict=False):
+            yield from self._write_bulk(list(chunk))
+
+    def _write_bulk(self, users: list[User]) -> Iterator[tuple[User, Exception | None]]:
+        """Create and update users with a single /Bulk request. Operations the remote
+        system couldn't apply in bulk are retried with a single request"""
+        connections = {
+            conn.user_id: conn
+            for conn in SCIMProviderUser.objects.filter(provider=self.provider, user__in=users)
+        }
+        operations = {}
+        for user in users:
+            connection = connections.get(user.pk)
+            try:
+                scim_user = self.to_schema(user, connection)
+            except SYNC_OBJECT_EXCEPTIONS as exc:
+                yield user, exc
+                continue
+            operation = {"bulkId": str(user.pk)}
+            if connection:
+                scim_user.id = connection.scim_id
+                payload = scim_user.model_dump(mode="json", exclude_unset=True)
+                if not self.diff(payload, connection):
+                    self.logger.debug("Skipping user write as data has not changed")
+                    yield user, None
+                    continue
+                operation.update(method="PUT", path=f"/Users/{connection.scim_id}")
+            else:
+                payload = scim_user.model_dump(mode="json", exclude_unset=True)
+                operation.update(method="POST", path="/Users")
+            operation["data"] = payload
+            operations[user.pk] = (user, operation)
+        if not operations:
+            return
+        try:
+            response = self._request(
+                "POST",
+                "/Bulk",
+                json={
+                    "schemas": [SCIM_BULK_REQUEST_SCHEMA],
+                    "Operations": [operation for _, operation in operations.values()],
+                },
+            )
+        except (SCIMRequestException, NotFoundSyncException) as exc:
+            self.logger.warning("Failed to send bulk request, writing users one by one", exc=exc)
+            yield from super().write_many([user for user, _ in operations.values()])
+            return
+        except TransientSyncException as exc:
+            for user, _ in operations.values():
+                yield user, exc
+            return
+        except (BaseSyncException, JSONDecodeError) as exc:
+            # Conflicts, dry runs and the like are accounted for per user by the regular
+            # write logic
+            self.logger.warning("Failed to send bulk request, writing users one by one", exc=exc)
+            yield from super().write_many([user for user, _ in operations.values()])
+            return
+        if not isinstance(response, dict):
+            self.logger.warning("Invalid bulk response, writing users one by one")
+            yield from super().write_many([user for user, _ in operations.values()])
+            return
+        results = response.get("Operations", [])
+        by_bulk_id = {result.get("bulkId"): result for result in results}
+        for idx, (user, operation) in enumerate(operations.values()):
+            result = by_bulk_id.get(operation["bulkId"])
+            if not result and len(results) == len(operations):
+                result = results[idx]
+            yield user, self._apply_bulk_result(user, operation, result, connections.get(user.pk))
+
+    def _apply_bulk_result(
+        self,
+        user: User,
+        operation: dict,
+        result: dict | None,
+        connection: SCIMProviderUser | None,
+    ) -> Exception | None:
+        """Create or update the connection of a user based on the result of its operation"""
+        if not result:
+            return self.try_write(user)
+        status = result.get("status")
+        if isinstance(status, dict):
+            status = status.get("code")
+        try:
+            status = int(status)
+        except (TypeError, ValueError):
+            return self.try_write(user)
+        if status >= HttpResponseBadRequest.status_code:
+            # Missing and conflicting users are handled by the regular write logic
+            if (operation["method"] == "PUT" and status == HttpResponseNotFound.status_code) or (
+                operation["method"] == "POST" and status == HTTP_CONFLICT
+            ):
+                return self.try_write(user)
+            if status in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+                return TransientSyncException()
+            detail = (result.get("response") or {}).get("detail")
+            self.logger.warning("Failed to write user in bulk", user=user, response=result)
+            return SCIMRequestException(message=detail or f"Bulk operation failed ({status})")
+        attributes = result.get("response") or {**operation["data"]}
+        if connection:
+            connection.attributes = attributes
+            connection.save()
+            return None
+        scim_id = attributes.get("id") or (result.get("location") or "").rstrip("/").split("/")[-1]
+        if not scim_id:
+            return StopSync("SCIM Response with missing or invalid `id`")
+        attributes.setdefault("id", scim_id)
+        SCIMProviderUser.objects.create(
+            provider=self.provider, user=user, scim_id=scim_id, attributes=attributes
+        )
+        return None
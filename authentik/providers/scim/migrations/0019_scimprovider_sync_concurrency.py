@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_providers_scim", "0018_scimprovider_service_provider_config_cache_timeout"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scimprovider",
+            name="sync_concurrency",
+            field=models.PositiveIntegerField(
+                default=1,
+                help_text="Maximum number of objects written concurrently when the SCIM endpoint doesn't support bulk operations.",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_providers_scim", "0019_scimprovider_sync_concurrency"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scimprovider",
+            name="sync_delta",
+            field=models.BooleanField(
+                default=False,
+                help_text="When enabled, scheduled syncs only write objects which changed since they were last synced.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="scimprovider",
+            name="sync_watermark",
+            field=models.DateTimeField(default=None, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="scimprovideruser",
+            name="fingerprint",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="scimprovidergroup",
+            name="fingerprint",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
@@ -3,6 +3,7 @@
 from typing import Any, Self
 from uuid import uuid4
 
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import QuerySet
 from django.templatetags.static import static
@@ -30,6 +31,7 @@ class SCIMProviderUser(InternallyManagedMixin, SerializerModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     provider = models.ForeignKey("SCIMProvider", on_delete=models.CASCADE)
     attributes = models.JSONField(default=dict)
+    fingerprint = models.TextField(default="", blank=True)
 
     @property
     def serializer(self) -> type[Serializer]:
@@ -52,6 +54,7 @@ class SCIMProviderGroup(InternallyManagedMixin, SerializerModel):
     group = models.ForeignKey(Group, on_delete=models.CASCADE)
     provider = models.ForeignKey("SCIMProvider", on_delete=models.CASCADE)
     attributes = models.JSONField(default=dict)
+    fingerprint = models.TextField(default="", blank=True)
 
     @property
     def serializer(self) -> type[Serializer]:
@@ -135,6 +138,14 @@ class SCIMProvider(OutgoingSyncProvider, BackchannelProvider):
             "Cache duration for ServiceProviderConfig responses. Set minutes=0 to disable."
         ),
     )
+    sync_concurrency = models.PositiveIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        help_text=_(
+            "Maximum number of objects written concurrently when the SCIM endpoint "
+            "doesn't support bulk operations."
+        ),
+    )
 
     def scim_auth(self) -> AuthBase:
         if self.auth_mode == SCIMAuthenticationMode.OAUTH:
@@ -2,7 +2,7 @@
 
 from json import loads
 
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from jsonschema import validate
 from requests_mock import Mocker
 
@@ -397,6 +397,148 @@ class SCIMUserTests(TestCase):
             },
         )
 
+    @Mocker()
+    def test_sync_task_bulk(self, mock: Mocker):
+        """Test sync tasks with bulk support"""
+        scim_id = generate_id()
+        uid = generate_id()
+        mock.get(
+            "https://localhost/ServiceProviderConfig",
+            json={
+                "patch": {"supported": False},
+                "bulk": {"supported": True, "maxOperations": 10, "maxPayloadSize": 1048576},
+                "filter": {"supported": False},
+                "changePassword": {"supported": False},
+                "sort": {"supported": False},
+                "etag": {"supported": False},
+            },
+        )
+        mock.post(
+            "https://localhost/Users",
+            json={
+                "id": scim_id,
+            },
+        )
+        user = User.objects.create(
+            username=uid,
+            name=f"{uid} {uid}",
+            email=f"{uid}@goauthentik.io",
+        )
+        SCIMProviderUser.objects.filter(provider=self.provider).delete()
+        mock.post(
+            "https://localhost/Bulk",
+            json={
+                "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkResponse"],
+                "Operations": [
+                    {
+                        "location": f"https://localhost/Users/{scim_id}",
+                        "method": "POST",
+                        "bulkId": str(user.pk),
+                        "status": "201",
+                    }
+                ],
+            },
+        )
+
+        scim_sync.send(self.provider.pk)
+
+        self.assertEqual(mock.request_history[-1].method, "POST")
+        self.assertEqual(mock.request_history[-1].url, "https://localhost/Bulk")
+        body = loads(mock.request_history[-1].body)
+        self.assertEqual(len(body["Operations"]), 1)
+        self.assertEqual(body["Operations"][0]["method"], "POST")
+        self.assertEqual(body["Operations"][0]["path"], "/Users")
+        self.assertEqual(body["Operations"][0]["bulkId"], str(user.pk))
+        self.assertEqual(body["Operations"][0]["data"]["userName"], uid)
+        connection = SCIMProviderUser.objects.get(provider=self.provider, user=user)
+        self.assertEqual(connection.scim_id, scim_id)
+
+    @Mocker()
+    def test_sync_task_bulk_conflict(self, mock: Mocker):
+        """Test users are written one by one when the bulk request is rejected"""
+        scim_id = generate_id()
+        uid = generate_id()
+        mock.get(
+            "https://localhost/ServiceProviderConfig",
+            json={
+                "patch": {"supported": False},
+                "bulk": {"supported": True, "maxOperations": 10, "maxPayloadSize": 1048576},
+                "filter": {"supported": False},
+                "changePassword": {"supported": False},
+                "sort": {"supported": False},
+                "etag": {"supported": False},
+            },
+        )
+        mock.post(
+            "https://localhost/Users",
+            json={
+                "id": scim_id,
+            },
+        )
+        mock.post("https://localhost/Bulk", status_code=409)
+        user = User.objects.create(
+            username=uid,
+            name=f"{uid} {uid}",
+            email=f"{uid}@goauthentik.io",
+        )
+        SCIMProviderUser.objects.filter(provider=self.provider).delete()
+
+        scim_sync.send(self.provider.pk)
+
+        self.assertIn(
+            ("POST", "https://localhost/Bulk"),
+            [(request.method, request.url) for request in mock.request_history],
+        )
+        self.assertEqual(mock.request_history[-1].method, "POST")
+        self.assertEqual(mock.request_history[-1].url, "https://localhost/Users")
+        connection = SCIMProviderUser.objects.get(provider=self.provider, user=user)
+        self.assertEqual(connection.scim_id, scim_id)
+
+    @Mocker()
+    def test_sync_task_delta(self, mock: Mocker):
+        """Test delta sync only writes changed users"""
+        scim_id = generate_id()
+        uid = generate_id()
+        self.provider.sync_delta = True
+        self.provider.save()
+        mock.get(
+            "https://localhost/ServiceProviderConfig",
+            json={},
+        )
+        mock.post(
+            "https://localhost/Users",
+            json={
+                "id": scim_id,
+            },
+        )
+        mock.put(
+            f"https://localhost/Users/{scim_id}",
+            json={
+                "id": scim_id,
+            },
+        )
+        user = User.objects.create(
+            username=uid,
+            name=f"{uid} {uid}",
+            email=f"{uid}@goauthentik.io",
+        )
+
+        scim_sync.send(self.provider.pk)
+        connection = SCIMProviderUser.objects.get(provider=self.provider, user=user)
+        self.assertNotEqual(connection.fingerprint, "")
+        self.provider.refresh_from_db()
+        self.assertIsNotNone(self.provider.sync_watermark)
+        call_count = mock.call_count
+
+        scim_sync.send(self.provider.pk)
+        self.assertEqual(mock.call_count, call_count)
+
+        SCIMProviderUser.objects.filter(pk=connection.pk).update(fingerprint="foo")
+        scim_sync.send(self.provider.pk)
+        self.assertEqual(mock.request_history[-1].method, "PUT")
+        connection.refresh_from_db()
+        self.assertNotEqual(connection.fingerprint, "foo")
+
     def test_user_create_dry_run(self):
         """Test user creation (dry_run)"""
         # Update the provider before we start mocking as saving the provider triggers a full sync
@@ -537,3 +679,42 @@ class SCIMUserTests(TestCase):
         self.assertEqual(mock.call_count, 2)
         self.assertEqual(mock.request_history[0].method, "GET")
         self.assertEqual(mock.request_history[1].method, "POST")
+
+
+class SCIMUserConcurrentTests(TransactionTestCase):
+    """SCIM User tests with concurrent writes, which require committed data"""
+
+    @apply_blueprint("system/providers-scim.yaml")
+    def setUp(self) -> None:
+        Tenant.objects.update(avatars="none")
+        self.provider: SCIMProvider = SCIMProvider.objects.create(
+            name=generate_id(),
+            url="https://localhost",
+            token=generate_id(),
+            exclude_users_service_account=True,
+            sync_concurrency=4,
+        )
+        self.provider.property_mappings.add(
+            SCIMMapping.objects.get(managed="goauthentik.io/providers/scim/user")
+        )
+
+    @Mocker()
+    def test_write_concurrently(self, mock: Mocker):
+        """Test each user is written with their own attributes"""
+        mock.get("https://localhost/ServiceProviderConfig", json={})
+        mock.post(
+            "https://localhost/Users",
+            json=lambda request, context: {"id": loads(request.body)["userName"]},
+        )
+        users = []
+        for _ in range(8):
+            uid = generate_id()
+            users.append(User(username=uid, name=f"{uid} {uid}", email=f"{uid}@goauthentik.io"))
+        User.objects.bulk_create(users)
+        client = self.provider.client_for_model(User)
+        results = list(client.write_many(users))
+        self.assertEqual([user for user, _ in results], users)
+        self.assertEqual([exc for _, exc in results], [None] * len(users))
+        for user in users:
+            connection = SCIMProviderUser.objects.get(provider=self.provider, user=user)
+            self.assertEqual(connection.scim_id, user.username)
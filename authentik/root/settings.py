@@ -242,6 +242,10 @@ CACHES = {
         "BACKEND": "django_postgres_cache.backend.DatabaseCache",
         "KEY_FUNCTION": "django_tenants.cache.make_key",
         "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
+        "L1_MAX_ENTRIES": CONFIG.get_int("cache.l1.max_entries", 0),
+        "L1_TIMEOUT": CONFIG.get_int("cache.l1.timeout", 60),
+        "COMPRESS_MIN_SIZE": CONFIG.get_int("cache.compress_min_size", 4096),
+        "WRITE_LEGACY_VALUE": CONFIG.get_bool("cache.write_legacy_value", True),
     }
 }
 SESSION_ENGINE = "authentik.core.sessions"
@@ -399,6 +403,10 @@ DRAMATIQ = {
         "consumer_listen_timeout": timedelta_from_string(
             CONFIG.get("worker.consumer_listen_timeout")
         ).total_seconds(),
+        "consumer_claim_batch_size": CONFIG.get_int("worker.consumer_claim_batch_size", 0),
+        "consumer_lease_duration": timedelta_from_string(
+            CONFIG.get("worker.consumer_lease_duration")
+        ).total_seconds(),
         "watch_folder": BASE_DIR / "authentik",
     },
     "scheduler_class": "authentik.tasks.schedules.scheduler.Scheduler",
@@ -70,6 +70,9 @@ class PytestTestRunner(DiscoverRunner):  # pragma: no cover
             "blueprints_dir": "./blueprints",
             "outposts.container_image_base": f"ghcr.io/goauthentik/dev-%(type)s:{get_docker_tag()}",
             "tenants.enabled": False,
+            # Policy threads use their own database connections, which can't see
+            # data created inside of a test's transaction
+            "policies.engine.workers": 0,
             "outposts.disable_embedded_outpost": False,
             "error_reporting.sample_rate": 0,
             "error_reporting.environment": "testing",
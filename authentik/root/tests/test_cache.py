@@ -0,0 +1,152 @@
+"""Cache tests"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache.backends.db import DatabaseCache as LegacyDatabaseCache
+from django.test import TestCase
+from django.utils.timezone import now
+from django_postgres_cache.backend import DatabaseCache
+from django_postgres_cache.l1 import L1Cache
+from django_postgres_cache.models import CacheEntry
+
+from authentik.lib.generators import generate_id
+
+
+class TestL1Cache(TestCase):
+    """Test in-process cache tier"""
+
+    def setUp(self):
+        params = dict(settings.CACHES["default"])
+        params["L1_MAX_ENTRIES"] = 2
+        self.cache = DatabaseCache("", params)
+        # Don't start the listener, pretend it's connected
+        self.cache._ensure_l1_listener = lambda: None
+        self.cache.l1.listening = True
+
+    def test_l1_bounded(self):
+        """Test size and expiry bounds"""
+        l1 = L1Cache(max_entries=2, timeout=60)
+        l1.listening = True
+        for idx in range(3):
+            l1.set(str(idx), b"value", now() + timedelta(minutes=1), l1.generation)
+        self.assertIsNone(l1.get("0"))
+        self.assertEqual(l1.get("2"), b"value")
+        l1.set("expired", b"value", now() - timedelta(seconds=1), l1.generation)
+        self.assertIsNone(l1.get("expired"))
+
+    def test_l1_generation(self):
+        """Test values read before an invalidation are not cached"""
+        l1 = L1Cache(max_entries=2, timeout=60)
+        l1.listening = True
+        generation = l1.generation
+        l1.invalidate(["foo"])
+        l1.set("foo", b"value", now() + timedelta(minutes=1), generation)
+        self.assertIsNone(l1.get("foo"))
+
+    def test_l1_not_listening(self):
+        """Test nothing is served while invalidations can't be received"""
+        l1 = L1Cache(max_entries=2, timeout=60)
+        l1.set("foo", b"value", now() + timedelta(minutes=1), l1.generation)
+        self.assertIsNone(l1.get("foo"))
+
+    def test_backend(self):
+        """Test reads are served from memory and writes invalidate"""
+        key = generate_id()
+        self.cache.set(key, {"foo": "bar"})
+        self.assertEqual(self.cache.get(key), {"foo": "bar"})
+        self.assertEqual(self.cache.l1.misses, 1)
+        self.assertEqual(self.cache.get(key), {"foo": "bar"})
+        self.assertEqual(self.cache.l1.hits, 1)
+        self.cache.set(key, {"foo": "baz"})
+        self.assertEqual(self.cache.get(key), {"foo": "baz"})
+        self.cache.delete(key)
+        self.assertIsNone(self.cache.get(key))
+
+
+class TestCacheStorage(TestCase):
+    """Test cache storage format"""
+
+    def setUp(self):
+        params = dict(settings.CACHES["default"])
+        params["COMPRESS_MIN_SIZE"] = 100
+        self.cache = DatabaseCache("", params)
+
+    def test_compressed(self):
+        """Test large values are compressed"""
+        key = generate_id()
+        self.cache.write_legacy_value = False
+        self.cache.set(key, "a" * 1000)
+        entry = CacheEntry.objects.get(cache_key=self.cache.make_key(key))
+        self.assertIsNone(entry.value)
+        self.assertLess(len(entry.data), 100)
+        self.assertEqual(self.cache.get(key), "a" * 1000)
+        self.assertEqual(self.cache.get_many([key]), {key: "a" * 1000})
+
+    def test_legacy_value(self):
+        """Test entries written in the legacy text column can be read"""
+        key = generate_id()
+        self.cache.write_legacy_value = True
+        self.cache.set(key, {"foo": "bar"})
+        CacheEntry.objects.filter(cache_key=self.cache.make_key(key)).update(data=None)
+        self.assertEqual(self.cache.get(key), {"foo": "bar"})
+
+    def test_no_legacy_value(self):
+        """Test re-setting a legacy entry without the text column keeps it readable,
+        and entries with neither column are treated as missing"""
+        key = generate_id()
+        self.cache.write_legacy_value = True
+        self.cache.set(key, "old")
+        self.cache.write_legacy_value = False
+        self.cache.set(key, "new")
+        self.assertEqual(self.cache.get(key), "new")
+        self.assertEqual(self.cache.get_many([key]), {key: "new"})
+        CacheEntry.objects.filter(cache_key=self.cache.make_key(key)).update(data=None)
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.get(key, "default"), "default")
+        self.assertEqual(self.cache.get_many([key]), {})
+
+
+class TestCacheKeys(TestCase):
+    """Test key enumeration"""
+
+    def setUp(self):
+        self.cache = DatabaseCache("", dict(settings.CACHES["default"]))
+        self.prefix = f"{generate_id()}/"
+
+    def test_keys_prefix(self):
+        """Test prefix enumeration and deletion"""
+        self.cache.set(f"{self.prefix}a", 1)
+        self.cache.set(f"{self.prefix}b", 2)
+        # `_` and `%` must not act as wildcards
+        self.cache.set(f"{self.prefix[:-1]}_other", 3)
+        self.assertEqual(
+            sorted(self.cache.keys(f"{self.prefix}*")),
+            [f"{self.prefix}a", f"{self.prefix}b"],
+        )
+        self.assertEqual(self.cache.delete_pattern(f"{self.prefix[:-1]}%*"), 0)
+        self.assertEqual(self.cache.delete_pattern(f"{self.prefix}*"), 2)
+        self.assertEqual(self.cache.keys(f"{self.prefix}*"), [])
+        self.assertEqual(self.cache.get(f"{self.prefix[:-1]}_other"), 3)
+
+    def test_keys_glob(self):
+        """Test non-prefix globs"""
+        self.cache.set(f"{self.prefix}a/foo", 1)
+        self.cache.set(f"{self.prefix}b/bar", 2)
+        self.assertEqual(self.cache.keys(f"{self.prefix}*/foo"), [f"{self.prefix}a/foo"])
+        self.assertEqual(self.cache.delete_pattern(f"{self.prefix}*/foo"), 1)
+        self.assertEqual(self.cache.keys(f"{self.prefix}*"), [f"{self.prefix}b/bar"])
+
+    def test_mixed_versions(self):
+        """Test processes of an earlier version, which only use the text column,
+        and processes of this version share entries"""
+        legacy = LegacyDatabaseCache(CacheEntry._meta.db_table, dict(settings.CACHES["default"]))
+        key = generate_id()
+        self.cache.set(key, "new")
+        self.assertEqual(legacy.get(key), "new")
+        legacy.set(key, "old")
+        self.assertIsNone(CacheEntry.objects.get(cache_key=self.cache.make_key(key)).data)
+        self.assertEqual(self.cache.get(key), "old")
+        self.cache.set(key, "new")
+        self.assertEqual(self.cache.get(key), "new")
+        self.assertEqual(legacy.get(key), "new")
@@ -0,0 +1,91 @@
+"""Postgres channel layer tests"""
+
+from asyncio import Queue, wait_for
+from base64 import b64decode
+from secrets import token_bytes
+
+from django.test import TransactionTestCase
+from django_channels_postgres.layer import PostgresChannelLayer
+from django_channels_postgres.models import NOTIFY_CHANNEL, Message
+from psycopg import AsyncConnection, Notify, sql
+
+from authentik.lib.generators import generate_id
+
+
+class TestChannelLayerGroupSend(TransactionTestCase):
+    """Test messages sent to a group are notified together, and delivered to every channel"""
+
+    def setUp(self):
+        self.proxy = PostgresChannelLayer()
+        self.group = generate_id()
+
+    async def _group_send(self, channels: list[str], message: dict) -> list[Notify]:
+        """Add `channels` to the group, send `message` to it and return the notifications"""
+        layer = self.proxy._get_layer()
+        for channel in channels:
+            await layer.group_add(self.group, channel)
+        async with await AsyncConnection.connect(
+            conninfo=layer.make_conninfo(), autocommit=True
+        ) as conn:
+            await conn.execute(
+                sql.SQL("LISTEN {channel}").format(channel=sql.Identifier(NOTIFY_CHANNEL))
+            )
+            await layer.group_send(self.group, message)
+            return [notify async for notify in conn.notifies(timeout=1)]
+
+    async def _receive(self, channels: list[str], notifies: list[Notify]) -> dict[str, dict]:
+        """Deliver `notifies` to a receiver subscribed to `channels` and receive a message
+        on each of them"""
+        layer = self.proxy._get_layer()
+        for channel in channels:
+            layer.channels[channel] = Queue()
+            layer.receiver._subscribed_to.add(channel)
+        for notify in notifies:
+            await layer.receiver._receive_notify(notify)
+        return {channel: await wait_for(layer.receive(channel), 5) for channel in channels}
+
+    async def test_group_send(self):
+        """Test a message sent to multiple channels is notified once"""
+        channels = [f"test.{generate_id()}" for _ in range(3)]
+        message = {"type": "test", "text": generate_id()}
+        notifies = await self._group_send(channels, message)
+        self.assertEqual(len(notifies), 1)
+        message_ids, notified_channels, _, encoded = notifies[0].payload.split(":")
+        self.assertEqual(notified_channels.split(","), sorted(channels))
+        messages = {
+            str(msg.pk): msg.channel
+            async for msg in Message.objects.filter(pk__in=message_ids.split(","))
+        }
+        self.assertEqual(
+            messages, dict(zip(message_ids.split(","), notified_channels.split(","), strict=True))
+        )
+        self.assertEqual(self.proxy.deserialize(b64decode(encoded)), message)
+        received = await self._receive(channels, notifies)
+        self.assertEqual(received, {channel: message for channel in channels})
+
+    async def test_group_send_chunked(self):
+        """Test messages sent to more channels than fit in a single notification are
+        notified in chunks"""
+        channels = [f"test.{generate_id(80)}" for _ in range(120)]
+        message = {"type": "test", "text": generate_id()}
+        notifies = await self._group_send(channels, message)
+        self.assertGreater(len(notifies), 1)
+        notified_channels = []
+        for notify in notifies:
+            self.assertLess(len(notify.payload), 8000)
+            _, chunk_channels, _, _ = notify.payload.split(":")
+            notified_channels.extend(chunk_channels.split(","))
+        self.assertEqual(sorted(notified_channels), sorted(channels))
+        received = await self._receive(channels, notifies)
+        self.assertEqual(received, {channel: message for channel in channels})
+
+    async def test_group_send_oversized(self):
+        """Test messages which don't fit in a notification are read from the database"""
+        channels = [f"test.{generate_id()}" for _ in range(3)]
+        message = {"type": "test", "data": token_bytes(8000)}
+        notifies = await self._group_send(channels, message)
+        self.assertEqual(len(notifies), 1)
+        _, notified_channels, _ = notifies[0].payload.split(":")
+        self.assertEqual(notified_channels.split(","), sorted(channels))
+        received = await self._receive(channels, notifies)
+        self.assertEqual(received, {channel: message for channel in channels})
@@ -115,6 +115,10 @@ class LDAPSourceSerializer(SourceSerializer):
             "lookup_groups_from_user",
             "delete_not_found_objects",
             "sync_outgoing_trigger_mode",
+            "sync_page_size",
+            "sync_incremental",
+            "sync_change_marker",
+            "sync_full_interval",
         ]
         extra_kwargs = {"bind_password": {"write_only": True}}
 
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_sources_ldap", "0011_ldapsource_sync_outgoing_trigger_mode"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ldapsource",
+            name="sync_page_size",
+            field=models.PositiveIntegerField(
+                blank=True,
+                default=None,
+                help_text=(
+                    "Controls the number of objects synced in a single task. "
+                    "When not set, the global default is used."
+                ),
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+import authentik.lib.utils.time
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_sources_ldap", "0012_ldapsource_sync_page_size"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ldapsource",
+            name="sync_change_marker",
+            field=models.TextField(
+                choices=[("modifyTimestamp", "Modify Timestamp"), ("uSNChanged", "Usn Changed")],
+                default="modifyTimestamp",
+                help_text=(
+                    "Attribute used to detect changed objects for incremental synchronization."
+                ),
+            ),
+        ),
+        migrations.AddField(
+            model_name="ldapsource",
+            name="sync_full_interval",
+            field=models.TextField(
+                default="hours=24",
+                help_text=(
+                    "Interval in which a full synchronization is run when incremental "
+                    "synchronization is enabled (Format: hours=1;minutes=2;seconds=3)."
+                ),
+                validators=[authentik.lib.utils.time.timedelta_string_validator],
+            ),
+        ),
+        migrations.AddField(
+            model_name="ldapsource",
+            name="sync_incremental",
+            field=models.BooleanField(
+                default=False,
+                help_text=(
+                    "Only fetch objects which changed since the last synchronization. "
+                    "A full synchronization still runs periodically to detect deleted objects."
+                ),
+            ),
+        ),
+        migrations.AddField(
+            model_name="ldapsource",
+            name="sync_last_full",
+            field=models.DateTimeField(default=None, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="ldapsource",
+            name="sync_watermarks",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
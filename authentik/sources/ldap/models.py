@@ -8,8 +8,10 @@ from tempfile import NamedTemporaryFile, mkdtemp
 from typing import Any
 
 import pglock
+from django.core.validators import MinValueValidator
 from django.db import connection, models
 from django.templatetags.static import static
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from ldap3 import ALL, NONE, RANDOM, Connection, Server, ServerPool, Tls
 from ldap3.core.exceptions import LDAPException, LDAPInsufficientAccessRightsResult, LDAPSchemaError
@@ -25,7 +27,11 @@ from authentik.crypto.models import CertificateKeyPair
 from authentik.lib.config import CONFIG
 from authentik.lib.models import DomainlessURLValidator
 from authentik.lib.sync.incoming.models import IncomingSyncSource
-from authentik.lib.utils.time import fqdn_rand
+from authentik.lib.utils.time import (
+    fqdn_rand,
+    timedelta_from_string,
+    timedelta_string_validator,
+)
 from authentik.tasks.schedules.common import ScheduleSpec
 
 LDAP_TIMEOUT = 15
@@ -44,6 +50,14 @@ def flatten(value: Any) -> Any:
     return value
 
 
+class LDAPChangeMarker(models.TextChoices):
+    """Attribute used to find entries which changed since the last synchronization"""
+
+    MODIFY_TIMESTAMP = "modifyTimestamp"
+    # Active Directory only, the value is specific to each domain controller
+    USN_CHANGED = "uSNChanged"
+
+
 class MultiURLValidator(DomainlessURLValidator):
     """Same as DomainlessURLValidator but supports multiple URLs separated with a comma."""
 
@@ -143,6 +157,40 @@ class LDAPSource(IncomingSyncSource):
         ),
     )
 
+    sync_page_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        default=None,
+        validators=[MinValueValidator(1)],
+        help_text=_(
+            "Controls the number of objects synced in a single task. "
+            "When not set, the global default is used."
+        ),
+    )
+
+    sync_incremental = models.BooleanField(
+        default=False,
+        help_text=_(
+            "Only fetch objects which changed since the last synchronization. "
+            "A full synchronization still runs periodically to detect deleted objects."
+        ),
+    )
+    sync_change_marker = models.TextField(
+        choices=LDAPChangeMarker.choices,
+        default=LDAPChangeMarker.MODIFY_TIMESTAMP,
+        help_text=_("Attribute used to detect changed objects for incremental synchronization."),
+    )
+    sync_full_interval = models.TextField(
+        default="hours=24",
+        validators=[timedelta_string_validator],
+        help_text=_(
+            "Interval in which a full synchronization is run when incremental "
+            "synchronization is enabled (Format: hours=1;minutes=2;seconds=3)."
+        ),
+    )
+    sync_watermarks = models.JSONField(default=dict, editable=False)
+    sync_last_full = models.DateTimeField(null=True, default=None, editable=False)
+
     delete_not_found_objects = models.BooleanField(
         default=False,
         help_text=_(
@@ -151,6 +199,13 @@ class LDAPSource(IncomingSyncSource):
         ),
     )
 
+    @property
+    def sync_full_due(self) -> bool:
+        """Check if the next synchronization needs to read the entire directory"""
+        if not self.sync_incremental or not self.sync_last_full:
+            return True
+        return self.sync_last_full + timedelta_from_string(self.sync_full_interval) <= now()
+
     @property
     def component(self) -> str:
         return "ak-source-ldap-form"
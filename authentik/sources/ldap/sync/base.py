@@ -1,17 +1,31 @@
 """Sync LDAP Users and groups into authentik"""
 
 from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
 from django.conf import settings
-from ldap3 import DEREF_ALWAYS, SUBTREE, Connection
+from django.core.exceptions import FieldError
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.db.utils import IntegrityError
+from django.utils.timezone import now
+from ldap3 import BASE, DEREF_ALWAYS, SUBTREE, Connection
+from ldap3.core.exceptions import LDAPException
 from structlog.stdlib import BoundLogger, get_logger
 
+from authentik.core.models import AttributesMixin, UserSourceConnection
 from authentik.core.sources.mapper import SourceMapper
 from authentik.lib.config import CONFIG
 from authentik.lib.sync.mapper import PropertyMappingManager
-from authentik.sources.ldap.models import LDAPSource, flatten
+from authentik.sources.ldap.models import LDAP_UNIQUENESS, LDAPChangeMarker, LDAPSource, flatten
 from authentik.tasks.models import Task
 
+# Errors caused by the data of a single object, which shouldn't stop the sync
+OBJECT_ERRORS = (IntegrityError, FieldError, TypeError, AttributeError)
+# Allowed difference between our clock and the server's, for servers which don't publish theirs
+WATERMARK_CLOCK_SKEW = timedelta(minutes=5)
+
 
 class BaseLDAPSynchronizer:
     """Sync LDAP Users and groups into authentik"""
@@ -28,6 +42,12 @@ class BaseLDAPSynchronizer:
         self._task = task
         self._connection = source.connection()
         self._logger = get_logger().bind(source=source, syncer=self.__class__.__name__)
+        # When set, only entries changed since the last synchronization are fetched
+        self.incremental = False
+        # Change marker of the server before the first search, and the server it was read from
+        self.watermark: str | None = None
+        self.server: str | None = None
+        self._watermark_read = False
 
     @staticmethod
     def name() -> str:
@@ -65,6 +85,218 @@ class BaseLDAPSynchronizer:
         """Get objects from LDAP, implemented in subclass"""
         raise NotImplementedError()
 
+    @property
+    def watermark_key(self) -> str:
+        """Key of the watermark of this synchronizer, objects which share a
+        search filter share a watermark"""
+        return self.name()
+
+    def read_watermark(self):
+        """Read the current change marker of the server before searching, so entries
+        which change while the synchronization runs are fetched again by the next one.
+        `uSNChanged` is specific to each domain controller, so the server the marker was
+        read from is remembered too"""
+        self._watermark_read = True
+        root_dse = {}
+        try:
+            self._connection.search(
+                search_base="",
+                search_filter="(objectClass=*)",
+                search_scope=BASE,
+                attributes=["currentTime", "highestCommittedUSN", "dsServiceName"],
+            )
+            for entry in self._connection.response or []:
+                if entry.get("type") == "searchResEntry":
+                    root_dse = entry.get("attributes", {})
+                    break
+        except LDAPException as exc:
+            self._logger.warning("Failed to read root DSE", exc=exc)
+        self.server = flatten(root_dse.get("dsServiceName")) or None
+        if self._source.sync_change_marker == LDAPChangeMarker.USN_CHANGED:
+            usn = flatten(root_dse.get("highestCommittedUSN"))
+            self.watermark = str(int(usn)) if usn is not None else None
+            return
+        current = flatten(root_dse.get("currentTime"))
+        if current is None:
+            # Not all servers publish their time, fall back to ours
+            current = now() - WATERMARK_CLOCK_SKEW
+        if isinstance(current, datetime):
+            current = current.astimezone(UTC).strftime("%Y%m%d%H%M%SZ")
+        # Generalized time, optionally with fractional seconds
+        self.watermark = f"{str(current)[:14]}Z"
+
+    def change_filter(self, search_filter: str) -> str:
+        """Limit `search_filter` to entries changed since the last synchronization"""
+        if not self.incremental:
+            return search_filter
+        since = self._source.sync_watermarks.get(self.watermark_key)
+        if not isinstance(since, dict) or not since.get("marker"):
+            return search_filter
+        if since.get("server") != self.server:
+            self._logger.info(
+                "Server changed since the last synchronization, fetching all entries",
+                server=self.server,
+                previous_server=since.get("server"),
+            )
+            return search_filter
+        return f"(&{search_filter}({self._source.sync_change_marker}>={since['marker']}))"
+
+    def object_error(self, identifier: str, dn: str, exc: Exception):
+        """Report an object which could not be written, implemented in subclass"""
+        raise NotImplementedError()
+
+    def write_objects(
+        self,
+        model: type[AttributesMixin],
+        connection_model: type[UserSourceConnection],
+        connection_field: str,
+        objects: dict[str, tuple[str, list[dict[str, Any]]]],
+    ) -> Generator[tuple[str, AttributesMixin, bool]]:
+        """Create or update the objects of a page and their source connections with set-based
+        queries. `objects` maps each identifier to its DN and the properties of every entry
+        with that identifier. Yields every object which was written successfully."""
+        existing: dict[str, AttributesMixin] = {}
+        for instance in model.objects.filter(
+            **{f"attributes__{LDAP_UNIQUENESS}__in": list(objects.keys())}
+        ):
+            existing.setdefault(instance.attributes.get(LDAP_UNIQUENESS), instance)
+        # Identifier -> (object, created, changed)
+        pending: dict[str, tuple[AttributesMixin, bool, bool]] = {}
+        update_fields = {"attributes"}
+        for identifier, (dn, properties) in objects.items():
+            try:
+                instance = existing.get(identifier)
+                created = instance is None
+                if created:
+                    instance = model(**properties[0])
+                changed = created
+                for entry in properties[1:] if created else properties:
+                    changed = instance.merge_attributes(entry) or changed
+                    update_fields.update(entry.keys())
+            except OBJECT_ERRORS as exc:
+                self.object_error(identifier, dn, exc)
+                continue
+            pending[identifier] = (instance, created, changed)
+        written = self._save_objects(model, objects, pending, update_fields)
+        self._create_connections(connection_model, connection_field, objects, written)
+        for identifier, instance in written.items():
+            yield identifier, instance, pending[identifier][1]
+
+    def _save_objects(
+        self,
+        model: type[AttributesMixin],
+        objects: dict[str, tuple[str, list[dict[str, Any]]]],
+        pending: dict[str, tuple[AttributesMixin, bool, bool]],
+        update_fields: set[str],
+    ) -> dict[str, AttributesMixin]:
+        """Insert and update objects in bulk, and one by one if any of them conflicts"""
+        to_create = [instance for instance, created, _ in pending.values() if created]
+        to_update = [
+            instance for instance, created, changed in pending.values() if changed and not created
+        ]
+        fields = []
+        for field in model._meta.concrete_fields:
+            if field.primary_key:
+                continue
+            if getattr(field, "auto_now", False):
+                # `bulk_update` doesn't call `pre_save`, so timestamps need to be set explicitly
+                for instance in to_update:
+                    field.pre_save(instance, False)
+                fields.append(field.name)
+            elif field.name in update_fields or field.attname in update_fields:
+                fields.append(field.name)
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(to_create)
+                if to_update:
+                    model.objects.bulk_update(to_update, fields)
+        except IntegrityError:
+            self._logger.debug("Bulk write failed, writing objects one by one")
+            written = {}
+            for identifier, (instance, _, changed) in pending.items():
+                try:
+                    if changed:
+                        with transaction.atomic():
+                            instance.save()
+                except OBJECT_ERRORS as exc:
+                    self.object_error(identifier, objects[identifier][0], exc)
+                else:
+                    written[identifier] = instance
+            return written
+        # Bulk operations don't send signals, so send them explicitly for any object
+        # that would've been saved
+        for instance, created, changed in pending.values():
+            if changed:
+                post_save.send(
+                    sender=model,
+                    instance=instance,
+                    created=created,
+                    update_fields=None,
+                    raw=False,
+                    using=instance._state.db,
+                )
+        return {identifier: instance for identifier, (instance, _, _) in pending.items()}
+
+    def _create_connections(
+        self,
+        connection_model: type[UserSourceConnection],
+        connection_field: str,
+        objects: dict[str, tuple[str, list[dict[str, Any]]]],
+        written: dict[str, AttributesMixin],
+    ):
+        """Create missing source connections for all written objects"""
+        known = set(
+            connection_model.objects.filter(
+                source=self._source, identifier__in=list(written.keys())
+            ).values_list("identifier", flat=True)
+        )
+        connections = {
+            identifier: connection_model(
+                source=self._source, identifier=identifier, **{connection_field: instance}
+            )
+            for identifier, instance in written.items()
+            if identifier not in known
+        }
+        if not connections:
+            return
+        try:
+            with transaction.atomic():
+                self.bulk_create_connections(connection_model, list(connections.values()))
+        except IntegrityError:
+            for identifier, connection in connections.items():
+                try:
+                    with transaction.atomic():
+                        connection.save()
+                except OBJECT_ERRORS as exc:
+                    self.object_error(identifier, objects[identifier][0], exc)
+                    written.pop(identifier)
+
+    @staticmethod
+    def bulk_create_connections(
+        connection_model: type[UserSourceConnection], connections: list[UserSourceConnection]
+    ):
+        """Source connections use multi-table inheritance, which `bulk_create` doesn't support.
+        Instead create the rows of the parent table in bulk, and then insert the rows of the
+        connection table itself with a single query."""
+        parent_link = connection_model._meta.pk
+        parent_model = parent_link.related_model
+        parent_fields = [field.attname for field in parent_model._meta.concrete_fields]
+        parents = parent_model.objects.bulk_create(
+            [
+                parent_model(**{field: getattr(connection, field) for field in parent_fields})
+                for connection in connections
+            ]
+        )
+        for parent, connection in zip(parents, connections, strict=True):
+            for field in parent_fields:
+                setattr(connection, field, getattr(parent, field))
+            setattr(connection, parent_link.attname, parent.pk)
+            connection._state.adding = False
+            connection._state.db = parent._state.db
+        connection_model._base_manager._insert(
+            connections, fields=connection_model._meta.local_concrete_fields
+        )
+
     def get_attributes(self, object):
         if "attributes" not in object:
             return
@@ -92,8 +324,12 @@ class BaseLDAPSynchronizer:
     ):
         """Search in pages, returns each page"""
         cookie = True
+        if self._source.sync_incremental:
+            if not self._watermark_read:
+                self.read_watermark()
+            search_filter = self.change_filter(search_filter)
         if not paged_size:
-            paged_size = CONFIG.get_int("ldap.page_size", 50)
+            paged_size = self._source.sync_page_size or CONFIG.get_int("ldap.page_size", 50)
         while cookie:
             self._connection.search(
                 search_base,
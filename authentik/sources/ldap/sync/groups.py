@@ -2,7 +2,6 @@
 
 from collections.abc import Generator
 
-from django.core.exceptions import FieldError
 from django.db.utils import IntegrityError
 from ldap3 import ALL_ATTRIBUTES, ALL_OPERATIONAL_ATTRIBUTES, SUBTREE
 
@@ -20,7 +19,7 @@ from authentik.sources.ldap.models import (
     LDAPSource,
     flatten,
 )
-from authentik.sources.ldap.sync.base import BaseLDAPSynchronizer
+from authentik.sources.ldap.sync.base import OBJECT_ERRORS, BaseLDAPSynchronizer
 from authentik.tasks.models import Task
 
 
@@ -53,12 +52,25 @@ class GroupLDAPSynchronizer(BaseLDAPSynchronizer):
             **kwargs,
         )
 
+    def object_error(self, identifier: str, dn: str, exc: Exception):
+        Event.new(
+            EventAction.CONFIGURATION_ERROR,
+            message=(
+                f"Failed to create group: {str(exc)} "
+                "To merge new group with existing group, set the groups's "
+                f"Attribute '{LDAP_UNIQUENESS}' to '{identifier}'"
+            ),
+            source=self._source,
+            dn=dn,
+        ).save()
+
     def sync(self, page_data: list) -> int:
         """Iterate over all LDAP Groups and create authentik_core.Group instances"""
         if not self._source.sync_groups:
             self._task.info("Group syncing is disabled for this Source")
             return -1
-        group_count = 0
+        groups: dict[str, tuple[str, list[dict]]] = {}
+        group_parents: dict[str, Group] = {}
         for group in page_data:
             if (attributes := self.get_attributes(group)) is None:
                 continue
@@ -84,41 +96,29 @@ class GroupLDAPSynchronizer(BaseLDAPSynchronizer):
                 }
                 if "name" not in defaults:
                     raise IntegrityError("Name was not set by propertymappings")
-                # Special check for `users` field, as this is an M2M relation, and cannot be sync'd
-                if "users" in defaults:
-                    del defaults["users"]
-                parent = defaults.pop("parent", None)
-                ak_group, created = Group.update_or_create_attributes(
-                    {
-                        f"attributes__{LDAP_UNIQUENESS}": uniq,
-                    },
-                    defaults,
-                )
-                if parent:
-                    ak_group.parents.add(parent)
-                self._logger.debug("Created group with attributes", **defaults)
-                if not GroupLDAPSourceConnection.objects.filter(
-                    source=self._source, identifier=uniq
-                ):
-                    GroupLDAPSourceConnection.objects.create(
-                        source=self._source, group=ak_group, identifier=uniq
-                    )
             except SkipObjectException:
                 continue
             except PropertyMappingExpressionException as exc:
                 raise StopSync(exc, None, exc.mapping) from exc
-            except (IntegrityError, FieldError, TypeError, AttributeError) as exc:
-                Event.new(
-                    EventAction.CONFIGURATION_ERROR,
-                    message=(
-                        f"Failed to create group: {str(exc)} "
-                        "To merge new group with existing group, set the groups's "
-                        f"Attribute '{LDAP_UNIQUENESS}' to '{uniq}'"
-                    ),
-                    source=self._source,
-                    dn=group_dn,
-                ).save()
-            else:
-                self._logger.debug("Synced group", group=ak_group.name, created=created)
-                group_count += 1
+            except OBJECT_ERRORS as exc:
+                self.object_error(uniq, group_dn, exc)
+                continue
+            # Special check for `users` field, as this is an M2M relation, and cannot be sync'd
+            if "users" in defaults:
+                del defaults["users"]
+            if parent := defaults.pop("parent", None):
+                group_parents[uniq] = parent
+            self._logger.debug("Created group with attributes", **defaults)
+            groups.setdefault(uniq, (group_dn, []))[1].append(defaults)
+        group_count = 0
+        children: dict[Group, list[Group]] = {}
+        for uniq, ak_group, created in self.write_objects(
+            Group, GroupLDAPSourceConnection, "group", groups
+        ):
+            self._logger.debug("Synced group", group=ak_group.name, created=created)
+            group_count += 1
+            if parent := group_parents.get(uniq):
+                children.setdefault(parent, []).append(ak_group)
+        for parent, parent_children in children.items():
+            parent.children.add(*parent_children)
         return group_count
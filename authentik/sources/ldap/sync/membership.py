@@ -3,13 +3,14 @@
 from collections.abc import Generator
 from typing import Any
 
-from django.db.models import Q
+from django.db.models.signals import m2m_changed
 from ldap3 import SUBTREE
 from ldap3.utils.conv import escape_filter_chars
 
 from authentik.core.models import Group, User
 from authentik.sources.ldap.models import LDAP_DISTINGUISHED_NAME, LDAP_UNIQUENESS, LDAPSource
 from authentik.sources.ldap.sync.base import BaseLDAPSynchronizer
+from authentik.sources.ldap.sync.groups import GroupLDAPSynchronizer
 from authentik.tasks.models import Task
 
 
@@ -26,6 +27,11 @@ class MembershipLDAPSynchronizer(BaseLDAPSynchronizer):
     def name() -> str:
         return "membership"
 
+    @property
+    def watermark_key(self) -> str:
+        # Membership is read from the same entries as groups
+        return GroupLDAPSynchronizer.name()
+
     def get_objects(self, **kwargs) -> Generator:
         if not self._source.sync_groups:
             self._task.info("Group syncing is disabled for this Source")
@@ -49,20 +55,20 @@ class MembershipLDAPSynchronizer(BaseLDAPSynchronizer):
         if not self._source.sync_groups:
             self._task.info("Group syncing is disabled for this Source")
             return -1
-        membership_count = 0
+        group_members: dict[Group, list[str]] = {}
         for group in page_data:
             if self._source.lookup_groups_from_user:
                 group_dn = group.get("dn", {})
                 escaped_dn = escape_filter_chars(group_dn)
                 group_filter = f"({self._source.group_membership_field}={escaped_dn})"
-                group_members = self._source.connection().extend.standard.paged_search(
+                group_members_search = self._source.connection().extend.standard.paged_search(
                     search_base=self.base_dn_users,
                     search_filter=group_filter,
                     search_scope=SUBTREE,
                     attributes=[self._source.object_uniqueness_field],
                 )
                 members = []
-                for group_member in group_members:
+                for group_member in group_members_search:
                     group_member_dn = group_member.get("dn", {})
                     members.append(group_member_dn)
             else:
@@ -73,23 +79,72 @@ class MembershipLDAPSynchronizer(BaseLDAPSynchronizer):
             ak_group = self.get_group(group)
             if not ak_group:
                 continue
-
-            users = User.objects.filter(
-                Q(**{f"attributes__{self._source.user_membership_attribute}__in": members})
-                | Q(
-                    **{
-                        f"attributes__{self._source.user_membership_attribute}__isnull": True,
-                        "ak_groups__in": [ak_group],
-                    }
-                )
-            ).distinct()
-            membership_count += 1
-            membership_count += users.count()
-            ak_group.users.set(users)
-            ak_group.save()
+            group_members.setdefault(ak_group, []).extend(members)
+        membership_count = 0
+        for ak_group, (desired, current) in self.get_memberships(group_members).items():
+            membership_count += 1 + len(desired)
+            self.apply_membership(ak_group, desired - current, current - desired)
         self._logger.debug("Successfully updated group membership")
         return membership_count
 
+    def get_memberships(
+        self, group_members: dict[Group, list[str]]
+    ) -> dict[Group, tuple[set[int], set[int]]]:
+        """Get the desired and current member PKs of all groups with a fixed number of queries"""
+        membership_attribute = self._source.user_membership_attribute
+        all_members = {member for members in group_members.values() for member in members}
+        users_by_member: dict[str, set[int]] = {}
+        for pk, member in User.objects.filter(
+            **{f"attributes__{membership_attribute}__in": list(all_members)}
+        ).values_list("pk", f"attributes__{membership_attribute}"):
+            if isinstance(member, str):
+                users_by_member.setdefault(member, set()).add(pk)
+        current: dict[Group, set[int]] = {ak_group: set() for ak_group in group_members}
+        groups = {ak_group.pk: ak_group for ak_group in group_members}
+        for group_pk, user_pk in User.ak_groups.through.objects.filter(
+            group_id__in=groups.keys()
+        ).values_list("group_id", "user_id"):
+            current[groups[group_pk]].add(user_pk)
+        # Members which aren't managed by this source, as they don't have the membership
+        # attribute, are kept
+        unmanaged = set(
+            User.objects.filter(
+                pk__in={pk for pks in current.values() for pk in pks},
+                **{f"attributes__{membership_attribute}__isnull": True},
+            ).values_list("pk", flat=True)
+        )
+        memberships = {}
+        for ak_group, members in group_members.items():
+            desired = {pk for member in members for pk in users_by_member.get(member, ())}
+            desired.update(current[ak_group] & unmanaged)
+            memberships[ak_group] = (desired, current[ak_group])
+        return memberships
+
+    def apply_membership(self, ak_group: Group, added: set[int], removed: set[int]):
+        """Add and remove members of a group in bulk. As this bypasses the related manager,
+        `m2m_changed` is sent explicitly for any change"""
+        through = User.ak_groups.through
+        for action, pk_set in (("add", added), ("remove", removed)):
+            if not pk_set:
+                continue
+            signal_kwargs = {
+                "sender": through,
+                "instance": ak_group,
+                "reverse": True,
+                "model": User,
+                "pk_set": pk_set,
+                "using": ak_group._state.db,
+            }
+            m2m_changed.send(action=f"pre_{action}", **signal_kwargs)
+            if action == "add":
+                through.objects.bulk_create(
+                    [through(group_id=ak_group.pk, user_id=pk) for pk in pk_set],
+                    ignore_conflicts=True,
+                )
+            else:
+                through.objects.filter(group_id=ak_group.pk, user_id__in=pk_set).delete()
+            m2m_changed.send(action=f"post_{action}", **signal_kwargs)
+
     def get_group(self, group_dict: dict[str, Any]) -> Group | None:
         """Check if we fetched the group already, and if not cache it for later"""
         group_dn = group_dict.get("attributes", {}).get(LDAP_DISTINGUISHED_NAME, [])
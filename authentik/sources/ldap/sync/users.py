@@ -2,7 +2,6 @@
 
 from collections.abc import Generator
 
-from django.core.exceptions import FieldError
 from django.db.utils import IntegrityError
 from ldap3 import ALL_ATTRIBUTES, ALL_OPERATIONAL_ATTRIBUTES, SUBTREE
 
@@ -20,7 +19,7 @@ from authentik.sources.ldap.models import (
     UserLDAPSourceConnection,
     flatten,
 )
-from authentik.sources.ldap.sync.base import BaseLDAPSynchronizer
+from authentik.sources.ldap.sync.base import OBJECT_ERRORS, BaseLDAPSynchronizer
 from authentik.sources.ldap.sync.vendor.freeipa import FreeIPA
 from authentik.sources.ldap.sync.vendor.ms_ad import MicrosoftActiveDirectory
 from authentik.tasks.models import Task
@@ -54,12 +53,25 @@ class UserLDAPSynchronizer(BaseLDAPSynchronizer):
             **kwargs,
         )
 
+    def object_error(self, identifier: str, dn: str, exc: Exception):
+        Event.new(
+            EventAction.CONFIGURATION_ERROR,
+            message=(
+                f"Failed to create user: {str(exc)} "
+                "To merge new user with existing user, set the user's "
+                f"Attribute '{LDAP_UNIQUENESS}' to '{identifier}'"
+            ),
+            source=self._source,
+            dn=dn,
+        ).save()
+
     def sync(self, page_data: list) -> int:
         """Iterate over all LDAP Users and create authentik_core.User instances"""
         if not self._source.sync_users:
             self._task.info("User syncing is disabled for this Source")
             return -1
-        user_count = 0
+        users: dict[str, tuple[str, list[dict]]] = {}
+        user_attributes: dict[str, dict] = {}
         for user in page_data:
             if (attributes := self.get_attributes(user)) is None:
                 continue
@@ -86,35 +98,23 @@ class UserLDAPSynchronizer(BaseLDAPSynchronizer):
                 self._logger.debug("Writing user with attributes", **defaults)
                 if "username" not in defaults:
                     raise IntegrityError("Username was not set by propertymappings")
-                ak_user, created = User.update_or_create_attributes(
-                    {f"attributes__{LDAP_UNIQUENESS}": uniq}, defaults
-                )
-                if not UserLDAPSourceConnection.objects.filter(
-                    source=self._source, identifier=uniq
-                ):
-                    UserLDAPSourceConnection.objects.create(
-                        source=self._source, user=ak_user, identifier=uniq
-                    )
             except PropertyMappingExpressionException as exc:
                 raise StopSync(exc, None, exc.mapping) from exc
             except SkipObjectException:
                 continue
-            except (IntegrityError, FieldError, TypeError, AttributeError) as exc:
-                Event.new(
-                    EventAction.CONFIGURATION_ERROR,
-                    message=(
-                        f"Failed to create user: {str(exc)} "
-                        "To merge new user with existing user, set the user's "
-                        f"Attribute '{LDAP_UNIQUENESS}' to '{uniq}'"
-                    ),
-                    source=self._source,
-                    dn=user_dn,
-                ).save()
-            else:
-                self._logger.debug("Synced User", user=ak_user.username, created=created)
-                user_count += 1
-                MicrosoftActiveDirectory(self._source, self._task).sync(
-                    attributes, ak_user, created
-                )
-                FreeIPA(self._source, self._task).sync(attributes, ak_user, created)
+            except OBJECT_ERRORS as exc:
+                self.object_error(uniq, user_dn, exc)
+                continue
+            users.setdefault(uniq, (user_dn, []))[1].append(defaults)
+            user_attributes[uniq] = attributes
+        user_count = 0
+        for uniq, ak_user, created in self.write_objects(
+            User, UserLDAPSourceConnection, "user", users
+        ):
+            self._logger.debug("Synced User", user=ak_user.username, created=created)
+            user_count += 1
+            MicrosoftActiveDirectory(self._source, self._task).sync(
+                user_attributes[uniq], ak_user, created
+            )
+            FreeIPA(self._source, self._task).sync(user_attributes[uniq], ak_user, created)
         return user_count
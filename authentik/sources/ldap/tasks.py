@@ -1,8 +1,11 @@
 """LDAP Sync tasks"""
 
+from collections.abc import Generator
+from itertools import chain
 from uuid import uuid4
 
 from django.core.cache import cache
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from dramatiq.actor import actor
 from dramatiq.composition import group
@@ -66,44 +69,69 @@ def ldap_sync(source_pk: str):
             LOGGER.debug("Failed to acquire lock for LDAP sync, skipping task", source=source.slug)
             return
 
-        user_group_tasks = group(
-            ldap_sync_paginator(task, source, UserLDAPSynchronizer)
-            + ldap_sync_paginator(task, source, GroupLDAPSynchronizer)
-        )
-
-        membership_tasks = group(ldap_sync_paginator(task, source, MembershipLDAPSynchronizer))
-
-        deletion_tasks = group(
-            ldap_sync_paginator(task, source, UserLDAPForwardDeletion)
-            + ldap_sync_paginator(task, source, GroupLDAPForwardDeletion),
-        )
-
-        # User and group sync can happen at once, they have no dependencies on each other
-        user_group_tasks.run().wait(
-            timeout=60 * 60 * CONFIG.get_int("ldap.task_timeout_hours") * 1000
-        )
+        timeout = 60 * 60 * CONFIG.get_int("ldap.task_timeout_hours") * 1000
+        # Incremental syncs only fetch entries which changed since the last sync,
+        # a full sync still runs periodically to detect deleted entries
+        incremental = not source.sync_full_due
+        task.info("Starting incremental sync" if incremental else "Starting full sync")
+        started = now()
+        user_sync = UserLDAPSynchronizer(source, task)
+        group_sync = GroupLDAPSynchronizer(source, task)
+        membership_sync = MembershipLDAPSynchronizer(source, task)
+        for sync_inst in (user_sync, group_sync, membership_sync):
+            sync_inst.incremental = incremental
+
+        # User and group sync can happen at once, they have no dependencies on each other.
+        # Pages are queued as soon as they're received, so workers can start syncing them
+        # while the remaining pages are still being fetched
+        group(
+            list(
+                chain(
+                    ldap_sync_paginator(task, source, user_sync),
+                    ldap_sync_paginator(task, source, group_sync),
+                )
+            )
+        ).wait(timeout=timeout)
         # Membership sync needs to run afterwards
-        membership_tasks.run().wait(
-            timeout=60 * 60 * CONFIG.get_int("ldap.task_timeout_hours") * 1000
-        )
-        # Finally, deletions. What we'd really like to do here is something like
-        # ```
-        # user_identifiers = <ldap query>
-        # User.objects.exclude(
-        #     usersourceconnection__identifier__in=user_uniqueness_identifiers,
-        # ).delete()
-        # ```
-        # This runs into performance issues in large installations. So instead we spread the
-        # work out into three steps:
-        # 1. Get every object from the LDAP source.
-        # 2. Mark every object as "safe" in the database. This is quick, but any error could
-        #    mean deleting users which should not be deleted, so we do it immediately, in
-        #    large chunks, and only queue the deletion step afterwards.
-        # 3. Delete every unmarked item. This is slow, so we spread it over many tasks in
-        #    small chunks.
-        deletion_tasks.run().wait(
-            timeout=60 * 60 * CONFIG.get_int("ldap.task_timeout_hours") * 1000,
-        )
+        group(list(ldap_sync_paginator(task, source, membership_sync))).wait(timeout=timeout)
+        if source.sync_incremental:
+            watermarks = dict(source.sync_watermarks)
+            for sync_inst in (user_sync, group_sync):
+                if sync_inst.watermark:
+                    watermarks[sync_inst.watermark_key] = {
+                        "marker": sync_inst.watermark,
+                        "server": sync_inst.server,
+                    }
+            updates = {"sync_watermarks": watermarks}
+            if not incremental:
+                updates["sync_last_full"] = started
+            LDAPSource.objects.filter(pk=source.pk).update(**updates)
+        # Deleted entries can't be detected without reading the entire directory, so they
+        # are only removed during full syncs.
+        if not incremental:
+            # Finally, deletions. What we'd really like to do here is something like
+            # ```
+            # user_identifiers = <ldap query>
+            # User.objects.exclude(
+            #     usersourceconnection__identifier__in=user_uniqueness_identifiers,
+            # ).delete()
+            # ```
+            # This runs into performance issues in large installations. So instead we spread the
+            # work out into three steps:
+            # 1. Get every object from the LDAP source.
+            # 2. Mark every object as "safe" in the database. This is quick, but any error could
+            #    mean deleting users which should not be deleted, so we do it immediately, in
+            #    large chunks, and only queue the deletion step afterwards.
+            # 3. Delete every unmarked item. This is slow, so we spread it over many tasks in
+            #    small chunks.
+            group(
+                list(
+                    chain(
+                        ldap_sync_paginator(task, source, UserLDAPForwardDeletion(source, task)),
+                        ldap_sync_paginator(task, source, GroupLDAPForwardDeletion(source, task)),
+                    )
+                )
+            ).wait(timeout=timeout)
 
     if source.sync_outgoing_trigger_mode == SyncOutgoingTriggerMode.DEFERRED_END:
         for outgoing_sync_provider_cls in all_subclasses(OutgoingSyncProvider):
@@ -112,22 +140,19 @@ def ldap_sync(source_pk: str):
 
 
 def ldap_sync_paginator(
-    task: Task, source: LDAPSource, sync: type[BaseLDAPSynchronizer]
-) -> list[Message]:
-    """Return a list of task signatures with LDAP pagination data"""
-    sync_inst: BaseLDAPSynchronizer = sync(source, task)
-    messages = []
+    task: Task, source: LDAPSource, sync_inst: BaseLDAPSynchronizer
+) -> Generator[Message]:
+    """Queue a page sync task for every page as soon as it is received from LDAP,
+    and yield the sent messages"""
     for page in sync_inst.get_objects():
         page_uid = str(uuid4())
         page_cache_key = CACHE_KEY_PREFIX + page_uid
         cache.set(page_cache_key, page, 60 * 60 * CONFIG.get_int("ldap.task_timeout_hours"))
-        page_sync = ldap_sync_page.message_with_options(
-            args=(source.pk, class_to_path(sync), page_cache_key),
+        yield ldap_sync_page.send_with_options(
+            args=(source.pk, class_to_path(type(sync_inst)), page_cache_key),
             rel_obj=task.rel_obj,
             uid=f"{source.slug}:{sync_inst.name()}:{page_uid}",
         )
-        messages.append(page_sync)
-    return messages
 
 
 @actor(
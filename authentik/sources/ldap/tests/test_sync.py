@@ -3,7 +3,9 @@
 from unittest.mock import MagicMock, patch
 
 from django.db.models import Q
+from django.db.models.signals import m2m_changed
 from django.test import TestCase
+from django.utils.timezone import now
 from ldap3.core.exceptions import LDAPInvalidFilterError
 from ldap3.utils.conv import escape_filter_chars
 
@@ -16,6 +18,7 @@ from authentik.lib.sync.outgoing.exceptions import StopSync
 from authentik.lib.utils.reflection import class_to_path
 from authentik.sources.ldap.models import (
     GroupLDAPSourceConnection,
+    LDAPChangeMarker,
     LDAPSource,
     LDAPSourcePropertyMapping,
     UserLDAPSourceConnection,
@@ -157,6 +160,89 @@ class LDAPSyncTests(TestCase):
             self.assertTrue(User.objects.filter(username="user0_sn").exists())
             self.assertFalse(User.objects.filter(username="user1_sn").exists())
 
+    def test_sync_users_connections(self):
+        """Test users and their connections are written in bulk, and not duplicated"""
+        self.source.object_uniqueness_field = "uid"
+        self.source.user_property_mappings.set(
+            LDAPSourcePropertyMapping.objects.filter(
+                Q(managed__startswith="goauthentik.io/sources/ldap/default")
+                | Q(managed__startswith="goauthentik.io/sources/ldap/openldap")
+            )
+        )
+        connection = MagicMock(return_value=mock_slapd_connection(LDAP_PASSWORD))
+        with patch("authentik.sources.ldap.models.LDAPSource.connection", connection):
+            user_sync = UserLDAPSynchronizer(self.source, Task())
+            user_sync.sync_full()
+            connections = UserLDAPSourceConnection.objects.filter(source=self.source)
+            self.assertTrue(connections.filter(user__username="user0_sn").exists())
+            count = connections.count()
+            user_sync.sync_full()
+            self.assertEqual(connections.count(), count)
+            self.assertEqual(User.objects.filter(username="user0_sn").count(), 1)
+
+    def test_sync_incremental(self):
+        """Test incremental sync only searches for changed entries"""
+        self.source.sync_incremental = True
+        self.source.sync_watermarks = {
+            "users": {"marker": "20260101000000Z", "server": None},
+        }
+        self.assertTrue(self.source.sync_full_due)
+        self.source.sync_last_full = now()
+        self.assertFalse(self.source.sync_full_due)
+        connection = MagicMock(return_value=mock_slapd_connection(LDAP_PASSWORD))
+        with patch("authentik.sources.ldap.models.LDAPSource.connection", connection):
+            user_sync = UserLDAPSynchronizer(self.source, Task())
+            self.assertEqual(
+                user_sync.change_filter("(objectClass=person)"), "(objectClass=person)"
+            )
+            user_sync.incremental = True
+            self.assertEqual(
+                user_sync.change_filter("(objectClass=person)"),
+                "(&(objectClass=person)(modifyTimestamp>=20260101000000Z))",
+            )
+            # The watermark is read before searching, so changes made during the
+            # synchronization are fetched again
+            before = now()
+            user_sync.read_watermark()
+            self.assertIsNotNone(user_sync.watermark)
+            self.assertLessEqual(user_sync.watermark, before.strftime("%Y%m%d%H%M%SZ"))
+            # A different server answered than during the last synchronization
+            user_sync.server = "CN=NTDS Settings,CN=dc2"
+            self.assertEqual(
+                user_sync.change_filter("(objectClass=person)"), "(objectClass=person)"
+            )
+
+    def test_sync_incremental_usn(self):
+        """Test incremental sync with uSNChanged reads the watermark from the root DSE"""
+        self.source.sync_incremental = True
+        self.source.sync_change_marker = LDAPChangeMarker.USN_CHANGED
+        connection = MagicMock()
+        connection.response = [
+            {
+                "type": "searchResEntry",
+                "attributes": {
+                    "highestCommittedUSN": ["1234"],
+                    "dsServiceName": ["CN=NTDS Settings,CN=dc1"],
+                },
+            }
+        ]
+        with patch(
+            "authentik.sources.ldap.models.LDAPSource.connection",
+            MagicMock(return_value=connection),
+        ):
+            user_sync = UserLDAPSynchronizer(self.source, Task())
+            user_sync.incremental = True
+            user_sync.read_watermark()
+        self.assertEqual(user_sync.watermark, "1234")
+        self.assertEqual(user_sync.server, "CN=NTDS Settings,CN=dc1")
+        self.source.sync_watermarks = {
+            "users": {"marker": "1000", "server": "CN=NTDS Settings,CN=dc1"},
+        }
+        self.assertEqual(
+            user_sync.change_filter("(objectClass=person)"),
+            "(&(objectClass=person)(uSNChanged>=1000))",
+        )
+
     def test_sync_users_freeipa_ish(self):
         """Test user sync (FreeIPA-ish), mainly testing vendor quirks"""
         self.source.object_uniqueness_field = "uid"
@@ -263,6 +349,38 @@ class LDAPSyncTests(TestCase):
             group = Group.objects.filter(name="group1")
             self.assertTrue(group.exists())
 
+    def test_sync_membership_unchanged(self):
+        """Test membership sync only writes changed memberships"""
+        self.source.object_uniqueness_field = "uid"
+        self.source.group_object_filter = "(objectClass=groupOfNames)"
+        self.source.user_property_mappings.set(
+            LDAPSourcePropertyMapping.objects.filter(
+                Q(managed__startswith="goauthentik.io/sources/ldap/default")
+                | Q(managed__startswith="goauthentik.io/sources/ldap/openldap")
+            )
+        )
+        self.source.group_property_mappings.set(
+            LDAPSourcePropertyMapping.objects.filter(
+                managed="goauthentik.io/sources/ldap/openldap-cn"
+            )
+        )
+        connection = MagicMock(return_value=mock_slapd_connection(LDAP_PASSWORD))
+        receiver = MagicMock()
+        with patch("authentik.sources.ldap.models.LDAPSource.connection", connection):
+            self.source.save()
+            UserLDAPSynchronizer(self.source, Task()).sync_full()
+            GroupLDAPSynchronizer(self.source, Task()).sync_full()
+            MembershipLDAPSynchronizer(self.source, Task()).sync_full()
+            group = Group.objects.get(name="group1")
+            self.assertTrue(group.users.filter(username="user0_sn").exists())
+            m2m_changed.connect(receiver, sender=User.ak_groups.through)
+            try:
+                MembershipLDAPSynchronizer(self.source, Task()).sync_full()
+            finally:
+                m2m_changed.disconnect(receiver, sender=User.ak_groups.through)
+            receiver.assert_not_called()
+            self.assertTrue(group.users.filter(username="user0_sn").exists())
+
     def test_sync_groups_openldap_posix_group(self):
         """Test posix group sync"""
         self.source.object_uniqueness_field = "cn"
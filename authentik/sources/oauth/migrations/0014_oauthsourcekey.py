@@ -0,0 +1,60 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def index_jwks(apps: Apps, schema_editor: BaseDatabaseSchemaEditor):
+    OAuthSource = apps.get_model("authentik_sources_oauth", "OAuthSource")
+    OAuthSourceKey = apps.get_model("authentik_sources_oauth", "OAuthSourceKey")
+    db_alias = schema_editor.connection.alias
+
+    keys = []
+    for source in OAuthSource.objects.using(db_alias).exclude(oidc_jwks={}):
+        if not isinstance(source.oidc_jwks, dict):
+            continue
+        for key in source.oidc_jwks.get("keys", []):
+            if isinstance(key, dict) and key.get("kid"):
+                keys.append(OAuthSourceKey(source=source, kid=str(key["kid"]), key=key))
+    OAuthSourceKey.objects.using(db_alias).bulk_create(keys)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_sources_oauth", "0013_useroauthsourceconnection_refresh_token"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OAuthSourceKey",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("kid", models.TextField()),
+                ("key", models.JSONField()),
+                (
+                    "source",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="jwks_keys",
+                        to="authentik_sources_oauth.oauthsource",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "OAuth Source Key",
+                "verbose_name_plural": "OAuth Source Keys",
+                "indexes": [
+                    models.Index(fields=["kid", "source"], name="authentik_s_kid_57f106_idx")
+                ],
+            },
+        ),
+        migrations.RunPython(index_jwks, migrations.RunPython.noop),
+    ]
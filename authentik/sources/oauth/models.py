@@ -1,12 +1,17 @@
 """OAuth Client models"""
 
+from hashlib import sha256
+from json import dumps
+from threading import Lock
 from typing import TYPE_CHECKING
 
 from django.db import models
+from django.db.transaction import atomic
 from django.http.request import HttpRequest
 from django.urls import reverse
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
+from jwt import PyJWK
 from rest_framework.serializers import Serializer
 
 from authentik.core.api.object_types import CreatableType, NonCreatableType
@@ -21,6 +26,11 @@ from authentik.core.types import UILoginButton, UserSettingSerializer
 if TYPE_CHECKING:
     from authentik.sources.oauth.types.registry import SourceType
 
+# Parsed JWKs shared by all requests of this process, keyed by a digest of the JWK
+_PARSED_JWKS: dict[str, PyJWK] = {}
+_PARSED_JWKS_LOCK = Lock()
+_PARSED_JWKS_MAX_SIZE = 1024
+
 
 class AuthorizationCodeAuthMethod(models.TextChoices):
     BASIC_AUTH = "basic_auth", _("HTTP Basic Authentication")
@@ -153,6 +163,18 @@ class OAuthSource(NonCreatableType, Source):
             }
         )
 
+    def index_jwks(self):
+        """Rebuild the index of the keys in this source's JWKS by their key ID"""
+        jwks = self.oidc_jwks if isinstance(self.oidc_jwks, dict) else {}
+        keys = [
+            OAuthSourceKey(source=self, kid=str(key["kid"]), key=key)
+            for key in jwks.get("keys", [])
+            if isinstance(key, dict) and key.get("kid")
+        ]
+        with atomic():
+            OAuthSourceKey.objects.filter(source=self).delete()
+            OAuthSourceKey.objects.bulk_create(keys)
+
     def __str__(self) -> str:
         return f"OAuth Source {self.name}"
 
@@ -161,6 +183,36 @@ class OAuthSource(NonCreatableType, Source):
         verbose_name_plural = _("OAuth Sources")
 
 
+class OAuthSourceKey(models.Model):
+    """Key from the JWKS of an OAuth Source, indexed by its key ID"""
+
+    source = models.ForeignKey(OAuthSource, on_delete=models.CASCADE, related_name="jwks_keys")
+    kid = models.TextField()
+    key = models.JSONField()
+
+    class Meta:
+        verbose_name = _("OAuth Source Key")
+        verbose_name_plural = _("OAuth Source Keys")
+        indexes = [models.Index(fields=["kid", "source"])]
+
+    def __str__(self) -> str:
+        return f"OAuth Source Key {self.kid}"
+
+    @property
+    def parsed_key(self) -> PyJWK:
+        """Get the parsed JWK, which is cached for all keys with the same data"""
+        digest = sha256(dumps(self.key, sort_keys=True).encode("utf-8")).hexdigest()
+        with _PARSED_JWKS_LOCK:
+            if digest in _PARSED_JWKS:
+                return _PARSED_JWKS[digest]
+        parsed = PyJWK.from_dict(self.key)
+        with _PARSED_JWKS_LOCK:
+            if len(_PARSED_JWKS) >= _PARSED_JWKS_MAX_SIZE:
+                _PARSED_JWKS.clear()
+            _PARSED_JWKS[digest] = parsed
+        return parsed
+
+
 class GitHubOAuthSource(CreatableType, OAuthSource):
     """Social Login using GitHub.com or a GitHub-Enterprise Instance."""
 
@@ -0,0 +1,14 @@
+"""OAuth Source signals"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from authentik.sources.oauth.models import OAuthSource
+
+
+@receiver(post_save)
+def oauth_source_index_jwks(sender, instance, **_):
+    """Keep the index of the source's JWKS in sync when the source is saved"""
+    if not isinstance(instance, OAuthSource):
+        return
+    instance.index_jwks()
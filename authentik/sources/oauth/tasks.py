@@ -1,18 +1,143 @@
 """OAuth Source tasks"""
 
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from http import HTTPStatus
 from json import dumps
+from threading import local
+from time import time
+from typing import Any
 
+from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 from dramatiq.actor import actor
-from requests import RequestException
+from requests import RequestException, Response
 from structlog.stdlib import get_logger
 
+from authentik.lib.config import CONFIG
 from authentik.lib.utils.http import get_http_session
 from authentik.sources.oauth.models import OAuthSource
 from authentik.tasks.middleware import CurrentTask
 
 LOGGER = get_logger()
 
+CACHE_PREFIX = "goauthentik.io/sources/oauth/documents/"
+# How long caching information of fetched documents is kept, also caps their max-age
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+WELL_KNOWN_ATTRIBUTES = (
+    ("authorization_url", "authorization_endpoint"),
+    ("access_token_url", "token_endpoint"),
+    ("profile_url", "userinfo_endpoint"),
+    ("oidc_jwks_url", "jwks_uri"),
+)
+
+_sessions = local()
+
+
+def document_cache_key(source: OAuthSource, url: str, saved: Any) -> str:
+    """Cache key for the caching information of a document fetched for a source. Includes
+    what is currently saved from the document, so changes made to the source in any other way
+    cause the document to be fetched again"""
+    digest = sha256(dumps([url, saved], sort_keys=True).encode()).hexdigest()
+    return f"{CACHE_PREFIX}{source.pk}/{digest}"
+
+
+def response_max_age(response: Response) -> int:
+    """Get the number of seconds a response may be cached for from its Cache-Control header"""
+    directives = [
+        directive.strip().lower()
+        for directive in response.headers.get("Cache-Control", "").split(",")
+    ]
+    if "no-store" in directives or "no-cache" in directives:
+        return 0
+    for directive in directives:
+        name, _, value = directive.partition("=")
+        if name != "max-age":
+            continue
+        try:
+            return min(max(int(value.strip('"')), 0), CACHE_TIMEOUT)
+        except ValueError:
+            return 0
+    return 0
+
+
+def fetch_document(url: str, cached: dict[str, Any] | None) -> tuple[Any, dict[str, Any]]:
+    """Fetch a JSON document unless the cached copy is still fresh. Returns the document, or
+    None if it hasn't changed, and the caching information for the next fetch"""
+    cached = cached or {}
+    if cached.get("expires", 0) > time():
+        return None, cached
+    if not hasattr(_sessions, "session"):
+        _sessions.session = get_http_session()
+    headers = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    response = _sessions.session.get(url, headers=headers)
+    response.raise_for_status()
+    info = {
+        "etag": response.headers.get("ETag", cached.get("etag")),
+        "last_modified": response.headers.get("Last-Modified", cached.get("last_modified")),
+        "expires": time() + response_max_age(response),
+    }
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        return None, info
+    return response.json(), info
+
+
+def fetch_documents(
+    pool: ThreadPoolExecutor,
+    sources: list[OAuthSource],
+    url_attribute: str,
+    saved: Callable[[OAuthSource], Any],
+    error: str,
+) -> Iterator[tuple[OAuthSource, Any]]:
+    """Fetch the document at the URL in `url_attribute` of all sources concurrently. Yields
+    each source with its document, or None if it hasn't changed. Requests are made in the pool,
+    while all database and cache access stays in the calling thread."""
+    task = CurrentTask.get_task()
+    keys = {
+        source.pk: document_cache_key(source, getattr(source, url_attribute), saved(source))
+        for source in sources
+    }
+    cached = cache.get_many(list(keys.values()))
+    futures = [
+        (
+            source,
+            pool.submit(
+                fetch_document, getattr(source, url_attribute), cached.get(keys[source.pk])
+            ),
+        )
+        for source in sources
+    ]
+    for source, future in futures:
+        try:
+            document, info = future.result()
+        except RequestException as exc:
+            text = exc.response.text if exc.response else str(exc)
+            LOGGER.warning(error, source=source, exc=exc, text=text)
+            task.info(f"{error} for {source.slug}")
+            continue
+        yield source, document
+        # The caller might have updated the source from the document
+        cache.set(
+            document_cache_key(source, getattr(source, url_attribute), saved(source)),
+            info,
+            timeout=CACHE_TIMEOUT,
+        )
+
+
+def saved_well_known(source: OAuthSource) -> list[str]:
+    """Attributes of a source which are updated from its OpenID Configuration"""
+    return [getattr(source, source_attr, "") for source_attr, _ in WELL_KNOWN_ATTRIBUTES]
+
+
+def saved_jwks(source: OAuthSource) -> dict:
+    """JWKS of a source"""
+    return source.oidc_jwks
+
 
 @actor(
     description=_(
@@ -20,57 +145,50 @@ LOGGER = get_logger()
     )
 )
 def update_well_known_jwks():
-    self = CurrentTask.get_task()
-    session = get_http_session()
-    for source in OAuthSource.objects.all().exclude(oidc_well_known_url=""):
-        try:
-            well_known_config = session.get(source.oidc_well_known_url)
-            well_known_config.raise_for_status()
-        except RequestException as exc:
-            text = exc.response.text if exc.response else str(exc)
-            LOGGER.warning("Failed to update well_known", source=source, exc=exc, text=text)
-            self.info(f"Failed to update OIDC configuration for {source.slug}")
-            continue
-        config: dict = well_known_config.json()
-        try:
-            dirty = False
-            source_attr_key = (
-                ("authorization_url", "authorization_endpoint"),
-                ("access_token_url", "token_endpoint"),
-                ("profile_url", "userinfo_endpoint"),
-                ("oidc_jwks_url", "jwks_uri"),
-            )
-            for source_attr, config_key in source_attr_key:
+    sources = list(OAuthSource.objects.all().exclude(oidc_well_known_url="", oidc_jwks_url=""))
+    dirty: set[OAuthSource] = set()
+    pool = ThreadPoolExecutor(
+        max_workers=max(CONFIG.get_int("sources.oauth.refresh_workers", 8), 1),
+        thread_name_prefix="authentik-oauth-refresh",
+    )
+    try:
+        for source, config in fetch_documents(
+            pool,
+            [source for source in sources if source.oidc_well_known_url],
+            "oidc_well_known_url",
+            saved_well_known,
+            "Failed to update OIDC configuration",
+        ):
+            if not isinstance(config, dict):
+                continue
+            changed = False
+            for source_attr, config_key in WELL_KNOWN_ATTRIBUTES:
                 # Check if we're actually changing anything to only
                 # save when something has changed
                 if config_key not in config:
                     continue
                 if getattr(source, source_attr, "") != config.get(config_key, ""):
-                    dirty = True
+                    changed = True
                 setattr(source, source_attr, config[config_key])
-        except (IndexError, KeyError) as exc:
-            LOGGER.warning(
-                "Failed to update well_known",
-                source=source,
-                exc=exc,
-            )
-            self.info(f"Failed to update OIDC configuration for {source.slug}")
-            continue
-        if dirty:
-            LOGGER.info("Updating sources' OpenID Configuration", source=source)
-            source.save()
+            if changed:
+                LOGGER.info("Updating sources' OpenID Configuration", source=source)
+                dirty.add(source)
 
-    for source in OAuthSource.objects.all().exclude(oidc_jwks_url=""):
-        try:
-            jwks_config = session.get(source.oidc_jwks_url)
-            jwks_config.raise_for_status()
-        except RequestException as exc:
-            text = exc.response.text if exc.response else str(exc)
-            LOGGER.warning("Failed to update JWKS", source=source, exc=exc, text=text)
-            self.info(f"Failed to update JWKS for {source.slug}")
-            continue
-        config = jwks_config.json()
-        if dumps(source.oidc_jwks, sort_keys=True) != dumps(config, sort_keys=True):
-            source.oidc_jwks = config
-            LOGGER.info("Updating sources' JWKS", source=source)
-            source.save()
+        for source, config in fetch_documents(
+            pool,
+            [source for source in sources if source.oidc_jwks_url],
+            "oidc_jwks_url",
+            saved_jwks,
+            "Failed to update JWKS",
+        ):
+            if config is None:
+                continue
+            if dumps(source.oidc_jwks, sort_keys=True) != dumps(config, sort_keys=True):
+                source.oidc_jwks = config
+                LOGGER.info("Updating sources' JWKS", source=source)
+                dirty.add(source)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    for source in dirty:
+        source.save()
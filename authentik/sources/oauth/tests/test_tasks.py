@@ -1,9 +1,11 @@
 """Test OAuth Source tasks"""
 
+from unittest.mock import patch
+
 from django.test import TestCase
 from requests_mock import Mocker
 
-from authentik.sources.oauth.models import OAuthSource
+from authentik.sources.oauth.models import OAuthSource, OAuthSourceKey
 from authentik.sources.oauth.tasks import update_well_known_jwks
 
 
@@ -47,3 +49,48 @@ class TestOAuthSourceTasks(TestCase):
                 "foo": "bar",
             },
         )
+
+    @Mocker()
+    def test_jwks_index(self, mock: Mocker):
+        """Test keys of updated JWKS are indexed by their key ID"""
+        self.source.oidc_jwks_url = "http://foo/jwks"
+        self.source.save()
+        key = {"kty": "oct", "kid": "foo", "k": "bar"}
+        mock.get("http://foo/jwks", json={"keys": [key, {"kty": "oct", "k": "baz"}]})
+        update_well_known_jwks.send()
+        self.assertEqual(
+            list(OAuthSourceKey.objects.filter(source=self.source).values_list("kid", "key")),
+            [("foo", key)],
+        )
+
+    @Mocker()
+    def test_jwks_not_modified(self, mock: Mocker):
+        """Test JWKS are requested conditionally and unchanged JWKS aren't saved"""
+        self.source.oidc_jwks_url = "http://foo/jwks"
+        self.source.save()
+        mock.get(
+            "http://foo/jwks",
+            json={"keys": []},
+            headers={"ETag": '"foo"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+        )
+        update_well_known_jwks.send()
+        self.assertNotIn("If-None-Match", mock.last_request.headers)
+
+        mock.get("http://foo/jwks", status_code=304, headers={"ETag": '"foo"'})
+        with patch.object(OAuthSource, "save") as save:
+            update_well_known_jwks.send()
+            save.assert_not_called()
+        self.assertEqual(mock.last_request.headers["If-None-Match"], '"foo"')
+        self.assertEqual(
+            mock.last_request.headers["If-Modified-Since"], "Wed, 21 Oct 2015 07:28:00 GMT"
+        )
+
+    @Mocker()
+    def test_jwks_max_age(self, mock: Mocker):
+        """Test JWKS aren't requested again while they're fresh"""
+        self.source.oidc_jwks_url = "http://foo/jwks"
+        self.source.save()
+        mock.get("http://foo/jwks", json={"keys": []}, headers={"Cache-Control": "max-age=3600"})
+        update_well_known_jwks.send()
+        update_well_known_jwks.send()
+        self.assertEqual(mock.call_count, 1)
@@ -2,3 +2,5 @@ SCIM_URN_SCHEMA = "urn:ietf:params:scim:schemas:core:2.0:Schema"
 SCIM_URN_GROUP = "urn:ietf:params:scim:schemas:core:2.0:Group"
 SCIM_URN_USER = "urn:ietf:params:scim:schemas:core:2.0:User"
 SCIM_URN_USER_ENTERPRISE = "urn:ietf:params:scim:schemas:extension:enterprise:2.0:User"
+SCIM_URN_BULK_REQUEST = "urn:ietf:params:scim:api:messages:2.0:BulkRequest"
+SCIM_URN_BULK_RESPONSE = "urn:ietf:params:scim:api:messages:2.0:BulkResponse"
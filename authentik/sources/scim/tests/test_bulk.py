@@ -0,0 +1,179 @@
+"""Test SCIM Bulk"""
+
+from json import dumps
+from unittest.mock import patch
+
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from authentik.lib.config import CONFIG
+from authentik.lib.generators import generate_id
+from authentik.sources.scim.constants import SCIM_URN_BULK_REQUEST
+from authentik.sources.scim.models import SCIMSource, SCIMSourceGroup, SCIMSourceUser
+from authentik.sources.scim.views.v2.base import SCIM_CONTENT_TYPE
+from authentik.sources.scim.views.v2.bulk import BulkView
+
+
+class TestSCIMBulk(APITestCase):
+    """Test SCIM Bulk view"""
+
+    def setUp(self) -> None:
+        self.source = SCIMSource.objects.create(name=generate_id(), slug=generate_id())
+
+    def bulk(self, operations: list[dict], **kwargs):
+        """Send a bulk request"""
+        return self.client.post(
+            reverse(
+                "authentik_sources_scim:v2-bulk",
+                kwargs={
+                    "source_slug": self.source.slug,
+                },
+            ),
+            data=dumps({"schemas": [SCIM_URN_BULK_REQUEST], "Operations": operations, **kwargs}),
+            content_type=SCIM_CONTENT_TYPE,
+            HTTP_AUTHORIZATION=f"Bearer {self.source.token.key}",
+        )
+
+    def test_bulk(self):
+        """Test creating a user and a group referencing it"""
+        username = generate_id()
+        group_name = generate_id()
+        response = self.bulk(
+            [
+                {
+                    "method": "POST",
+                    "path": "/Groups",
+                    "bulkId": "group",
+                    "data": {
+                        "displayName": group_name,
+                        "members": [{"value": "bulkId:user"}],
+                    },
+                },
+                {
+                    "method": "POST",
+                    "path": "/Users",
+                    "bulkId": "user",
+                    "data": {"userName": username, "externalId": generate_id()},
+                },
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["Operations"]
+        self.assertEqual([result["status"] for result in results], ["201", "201"])
+        self.assertEqual([result["bulkId"] for result in results], ["group", "user"])
+        user = SCIMSourceUser.objects.get(source=self.source, user__username=username).user
+        group = SCIMSourceGroup.objects.get(source=self.source, group__name=group_name).group
+        self.assertTrue(group.users.filter(pk=user.pk).exists())
+
+    def test_bulk_fail_on_errors(self):
+        """Test processing stops after failOnErrors errors"""
+        response = self.bulk(
+            [
+                {"method": "DELETE", "path": f"/Users/{generate_id()}"},
+                {"method": "POST", "path": "/Users", "data": {"userName": generate_id()}},
+            ],
+            failOnErrors=1,
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["Operations"]
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["status"], "404")
+        self.assertFalse(SCIMSourceUser.objects.filter(source=self.source).exists())
+
+    def test_bulk_unknown_bulk_id(self):
+        """Test operations referencing an unknown bulkId"""
+        response = self.bulk(
+            [
+                {
+                    "method": "POST",
+                    "path": "/Groups",
+                    "data": {
+                        "displayName": generate_id(),
+                        "members": [{"value": "bulkId:foo"}],
+                    },
+                },
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["Operations"][0]["status"], "409")
+
+    @CONFIG.patch("sources.scim.bulk.max_operations", 1)
+    def test_bulk_max_operations(self):
+        """Test too many operations"""
+        response = self.bulk(
+            [
+                {"method": "POST", "path": "/Users", "data": {"userName": generate_id()}},
+                {"method": "POST", "path": "/Users", "data": {"userName": generate_id()}},
+            ]
+        )
+        self.assertEqual(response.status_code, 413)
+
+    @CONFIG.patch("sources.scim.bulk.max_payload_size", 100)
+    def test_bulk_max_payload_size(self):
+        """Test too large requests, including ones without a Content-Length header"""
+        operations = [{"method": "POST", "path": "/Users", "data": {"userName": generate_id()}}]
+        response = self.bulk(operations)
+        self.assertEqual(response.status_code, 413)
+        request = APIRequestFactory().post(
+            "/",
+            data=dumps({"schemas": [SCIM_URN_BULK_REQUEST], "Operations": operations}),
+            content_type=SCIM_CONTENT_TYPE,
+            HTTP_AUTHORIZATION=f"Bearer {self.source.token.key}",
+        )
+        del request.META["CONTENT_LENGTH"]
+        response = BulkView.as_view()(request, source_slug=self.source.slug)
+        self.assertEqual(response.status_code, 413)
+
+    def test_bulk_invalid_request(self):
+        """Test requests which aren't an object"""
+        response = self.client.post(
+            reverse(
+                "authentik_sources_scim:v2-bulk",
+                kwargs={
+                    "source_slug": self.source.slug,
+                },
+            ),
+            data=dumps([]),
+            content_type=SCIM_CONTENT_TYPE,
+            HTTP_AUTHORIZATION=f"Bearer {self.source.token.key}",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_invalid_operations(self):
+        """Test malformed operations only fail themselves"""
+        username = generate_id()
+        response = self.bulk(
+            [
+                "foo",
+                {"method": "POST", "path": None, "bulkId": "null-path"},
+                {"method": "POST", "path": "/Users", "data": "foo"},
+                {"method": "POST", "path": "/Users", "data": {"userName": username}},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["Operations"]
+        self.assertEqual([result["status"] for result in results], ["400", "400", "400", "201"])
+        self.assertEqual(results[1]["bulkId"], "null-path")
+        self.assertTrue(
+            SCIMSourceUser.objects.filter(source=self.source, user__username=username).exists()
+        )
+
+    def test_bulk_unexpected_error(self):
+        """Test unexpected errors only fail their operation"""
+        username = generate_id()
+        with patch(
+            "authentik.sources.scim.views.v2.groups.GroupsView.post",
+            side_effect=ValueError,
+        ):
+            response = self.bulk(
+                [
+                    {"method": "POST", "path": "/Groups", "data": {"displayName": generate_id()}},
+                    {"method": "POST", "path": "/Users", "data": {"userName": username}},
+                ]
+            )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["Operations"]
+        self.assertEqual([result["status"] for result in results], ["500", "201"])
+        self.assertTrue(
+            SCIMSourceUser.objects.filter(source=self.source, user__username=username).exists()
+        )
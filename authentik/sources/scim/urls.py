@@ -8,6 +8,7 @@ from authentik.sources.scim.api.sources import SCIMSourceViewSet
 from authentik.sources.scim.api.users import SCIMSourceUserViewSet
 from authentik.sources.scim.views.v2 import (
     base,
+    bulk,
     groups,
     resource_types,
     schemas,
@@ -41,6 +42,11 @@ urlpatterns = [
         groups.GroupsView.as_view(),
         name="v2-groups",
     ),
+    path(
+        "<slug:source_slug>/v2/Bulk",
+        bulk.BulkView.as_view(),
+        name="v2-bulk",
+    ),
     path(
         "<slug:source_slug>/v2/Schemas",
         schemas.SchemaView.as_view(),
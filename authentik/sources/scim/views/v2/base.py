@@ -108,8 +108,16 @@ class SCIMObjectView(SCIMView):
         super().initial(request, *args, **kwargs)
         # This needs to happen after authentication has happened, because we don't have
         # a source attribute before
+        self.init_mapper()
+        self.validate_ids(kwargs)
+
+    def init_mapper(self):
+        """Load the property mappings of the source"""
         self.mapper = SourceMapper(self.source)
         self.manager = self.mapper.get_manager(self.model, ["data"])
+
+    def validate_ids(self, kwargs: dict[str, Any]):
+        """Ensure object IDs in the URL are valid"""
         for key, value in kwargs.items():
             if key.endswith("_id"):
                 try:
@@ -0,0 +1,233 @@
+"""SCIM Bulk View"""
+
+from typing import Any
+
+from django.db.transaction import atomic
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from authentik.lib.config import CONFIG
+from authentik.sources.scim.constants import SCIM_URN_BULK_RESPONSE
+from authentik.sources.scim.views.v2.base import SCIMObjectView, SCIMView
+from authentik.sources.scim.views.v2.exceptions import (
+    SCIMConflictError,
+    SCIMError,
+    SCIMErrorTypes,
+    SCIMPayloadTooLargeError,
+    SCIMValidationError,
+)
+from authentik.sources.scim.views.v2.groups import GroupsView
+from authentik.sources.scim.views.v2.users import UsersView
+
+BULK_ID_PREFIX = "bulkId:"
+# Resources which can be modified with bulk operations, and the name of their ID argument
+BULK_RESOURCES: dict[str, tuple[type[SCIMObjectView], str]] = {
+    "Users": (UsersView, "user_id"),
+    "Groups": (GroupsView, "group_id"),
+}
+BULK_METHODS = ["POST", "PUT", "PATCH", "DELETE"]
+
+
+def bulk_max_operations() -> int:
+    """Maximum number of operations in a single bulk request"""
+    return CONFIG.get_int("sources.scim.bulk.max_operations", 1000)
+
+
+def bulk_max_payload_size() -> int:
+    """Maximum size of a bulk request in bytes"""
+    return CONFIG.get_int("sources.scim.bulk.max_payload_size", 1048576)
+
+
+class BulkView(SCIMView):
+    """SCIM Bulk view, https://datatracker.ietf.org/doc/html/rfc7644#section-3.7"""
+
+    bulk_ids: dict[str, str]
+    views: dict[str, SCIMObjectView]
+
+    def post(self, request: Request, **kwargs) -> Response:
+        """Apply multiple operations with a single request. All operations are applied
+        in a single transaction, and any failed operation only rolls back its own changes"""
+        max_payload_size = bulk_max_payload_size()
+        # Check the declared size first to avoid reading large bodies, requests without
+        # a Content-Length header are checked once read
+        if (
+            int(request.META.get("CONTENT_LENGTH") or 0) > max_payload_size
+            or len(request.body) > max_payload_size
+        ):
+            raise SCIMPayloadTooLargeError(
+                f"The size of the bulk operation exceeds the maxPayloadSize ({max_payload_size})."
+            )
+        if not isinstance(request.data, dict):
+            raise SCIMValidationError(None)
+        operations = request.data.get("Operations", [])
+        fail_on_errors = request.data.get("failOnErrors")
+        if not isinstance(operations, list) or not isinstance(fail_on_errors, int | None):
+            raise SCIMValidationError(None)
+        max_operations = bulk_max_operations()
+        if len(operations) > max_operations:
+            raise SCIMPayloadTooLargeError(
+                f"The number of operations exceeds the maxOperations ({max_operations})."
+            )
+        self.bulk_ids = {}
+        self.views = {}
+        with atomic():
+            results = self.apply_operations(request, operations, fail_on_errors)
+        return Response(
+            {
+                "schemas": [SCIM_URN_BULK_RESPONSE],
+                "Operations": results,
+            }
+        )
+
+    def apply_operations(
+        self, request: Request, operations: list[dict[str, Any]], fail_on_errors: int | None
+    ) -> list[dict[str, Any]]:
+        """Apply operations in order. Operations which reference the bulkId of a later
+        operation are deferred until that operation has been applied."""
+        results: dict[int, dict[str, Any]] = {}
+        errors = 0
+        pending = list(enumerate(operations))
+        while pending:
+            deferred = []
+            for index, operation in pending:
+                if fail_on_errors and errors >= fail_on_errors:
+                    return [results[index] for index in sorted(results)]
+                if self.get_references(operation) - self.bulk_ids.keys():
+                    deferred.append((index, operation))
+                    continue
+                results[index] = self.apply_operation(request, operation)
+                # Only failed operations include a response
+                if "response" in results[index]:
+                    errors += 1
+            if len(deferred) == len(pending):
+                for index, operation in deferred:
+                    results[index] = self.operation_error(
+                        operation, SCIMConflictError("Operation references an unknown bulkId.")
+                    )
+                break
+            pending = deferred
+        return [results[index] for index in sorted(results)]
+
+    def validate_operation(self, operation: Any):
+        """Check the shape of an operation before it is applied"""
+        if (
+            not isinstance(operation, dict)
+            or not isinstance(operation.get("path"), str)
+            or not isinstance(operation.get("bulkId"), str | None)
+            or not isinstance(operation.get("data"), dict | None)
+        ):
+            raise SCIMValidationError(
+                SCIMError(
+                    scimType=SCIMErrorTypes.invalid_syntax,
+                    detail="Operation must be an object with a path.",
+                )
+            )
+
+    def apply_operation(self, request: Request, operation: dict[str, Any]) -> dict[str, Any]:
+        """Apply a single operation and return its result"""
+        try:
+            self.validate_operation(operation)
+        except SCIMValidationError as exc:
+            return self.operation_error(operation, exc)
+        method = str(operation.get("method", "")).upper()
+        bulk_id = operation.get("bulkId")
+        try:
+            with atomic():
+                response = self.dispatch_operation(request, method, operation)
+        except APIException as exc:
+            return self.operation_error(operation, exc)
+        except Exception as exc:  # noqa
+            # Only fail this operation, the others are still applied
+            self.logger.warning("Failed to apply bulk operation", exc=exc)
+            return self.operation_error(operation, APIException())
+        result = {"method": method, "status": str(response.status_code)}
+        if bulk_id:
+            result["bulkId"] = bulk_id
+        if isinstance(response.data, dict):
+            if location := response.data.get("meta", {}).get("location"):
+                result["location"] = location
+            if method == "POST" and bulk_id and (object_id := response.data.get("id")):
+                self.bulk_ids[bulk_id] = object_id
+        return result
+
+    def dispatch_operation(
+        self, request: Request, method: str, operation: dict[str, Any]
+    ) -> Response:
+        """Run the handler of the resource view for an operation"""
+        resource, _, object_id = self.resolve(operation.get("path", "")).strip("/").partition("/")
+        if (
+            resource not in BULK_RESOURCES
+            or method not in BULK_METHODS
+            or (method == "POST") == bool(object_id)
+        ):
+            raise SCIMValidationError(
+                SCIMError(
+                    scimType=SCIMErrorTypes.invalid_path,
+                    detail=f"Unsupported operation {method} {operation.get('path')}.",
+                )
+            )
+        view_class, id_kwarg = BULK_RESOURCES[resource]
+        kwargs = {"source_slug": self.kwargs["source_slug"]}
+        if object_id:
+            kwargs[id_kwarg] = object_id
+        view = self.views.get(resource)
+        if not view:
+            # Views are reused for all operations of their resource,
+            # so property mappings are only loaded once
+            view = view_class()
+            view.setup(request._request, **kwargs)
+            view.format_kwarg = None
+            view.source = self.source
+            view.init_mapper()
+            self.views[resource] = view
+        operation_request = Request(request._request)
+        operation_request.user = request.user
+        operation_request.auth = request.auth
+        operation_request._full_data = self.resolve(operation.get("data") or {})
+        view.request = operation_request
+        view.kwargs = kwargs
+        view.validate_ids(kwargs)
+        return getattr(view, method.lower())(operation_request, **kwargs)
+
+    def operation_error(self, operation: Any, exc: APIException) -> dict[str, Any]:
+        """Build the result of a failed operation"""
+        if not isinstance(operation, dict):
+            operation = {}
+        if isinstance(exc, SCIMValidationError):
+            response = exc.detail
+        else:
+            response = SCIMError(detail=str(exc.detail), status=exc.status_code).model_dump(
+                mode="json", exclude_none=True
+            )
+        result = {
+            "method": str(operation.get("method", "")).upper(),
+            "status": str(exc.status_code),
+            "response": response,
+        }
+        if isinstance(bulk_id := operation.get("bulkId"), str) and bulk_id:
+            result["bulkId"] = bulk_id
+        return result
+
+    def get_references(self, value: Any) -> set[str]:
+        """Get all bulkIds referenced by an operation"""
+        if isinstance(value, str):
+            return {value.partition(BULK_ID_PREFIX)[2]} if BULK_ID_PREFIX in value else set()
+        if isinstance(value, dict):
+            return set().union(*(self.get_references(item) for item in value.values()))
+        if isinstance(value, list):
+            return set().union(*(self.get_references(item) for item in value))
+        return set()
+
+    def resolve(self, value: Any) -> Any:
+        """Replace bulkId references with the IDs of the created resources"""
+        if isinstance(value, str):
+            if BULK_ID_PREFIX not in value:
+                return value
+            prefix, _, bulk_id = value.partition(BULK_ID_PREFIX)
+            return prefix + self.bulk_ids[bulk_id]
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
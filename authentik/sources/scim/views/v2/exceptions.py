@@ -56,3 +56,15 @@ class SCIMNotFoundError(SCIMValidationError):
                 status=self.status_code,
             )
         )
+
+
+class SCIMPayloadTooLargeError(SCIMValidationError):
+    status_code = 413
+
+    def __init__(self, detail: str):
+        super().__init__(
+            SCIMError(
+                detail=detail,
+                status=self.status_code,
+            )
+        )
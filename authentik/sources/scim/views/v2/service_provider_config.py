@@ -5,6 +5,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from authentik.sources.scim.views.v2.base import SCIMView
+from authentik.sources.scim.views.v2.bulk import bulk_max_operations, bulk_max_payload_size
 
 
 class ServiceProviderConfigView(SCIMView):
@@ -34,7 +35,11 @@ class ServiceProviderConfigView(SCIMView):
                 "schemas": ["urn:ietf:params:scim:schemas:core:2.0:ServiceProviderConfig"],
                 "authenticationSchemes": auth_schemas,
                 "patch": {"supported": True},
-                "bulk": {"supported": False, "maxOperations": 0, "maxPayloadSize": 0},
+                "bulk": {
+                    "supported": True,
+                    "maxOperations": bulk_max_operations(),
+                    "maxPayloadSize": bulk_max_payload_size(),
+                },
                 "filter": {
                     "supported": True,
                     "maxResults": request.tenant.pagination_default_page_size,
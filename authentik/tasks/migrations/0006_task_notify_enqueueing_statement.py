@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:00
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_tasks", "0005_tasklog"),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="task",
+            name="notify_enqueueing",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="task",
+            trigger=pgtrigger.compiler.Trigger(
+                name="notify_enqueueing",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    condition='WHEN (NEW."eta" IS NULL AND NEW."state" = \'queued\')',
+                    constraint="CONSTRAINT",
+                    func="\n                    PERFORM pg_notify(\n                        'authentik.tasks.' || NEW.queue_name || '.enqueue',\n                        NEW.message_id::text\n                    );\n                    RETURN NEW;\n                ",
+                    hash="d0f56e71889537c933f8c390d574eaf01034d1bc",
+                    operation="UPDATE",
+                    pgid="pgtrigger_notify_enqueueing_0bc94",
+                    table="authentik_tasks_task",
+                    timing="DEFERRABLE INITIALLY DEFERRED",
+                    when="AFTER",
+                ),
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="task",
+            trigger=pgtrigger.compiler.Trigger(
+                name="notify_enqueueing_inserted",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE _queue_name text; _message_ids text;",
+                    func="\n                    FOR _queue_name, _message_ids IN\n                        SELECT enqueued.queue_name, string_agg(enqueued.message_id::text, ',')\n                        FROM (\n                            SELECT\n                                inserted.queue_name,\n                                inserted.message_id,\n                                (row_number() OVER (PARTITION BY inserted.queue_name) - 1) / 200\n                                    AS chunk\n                            FROM inserted\n                            WHERE inserted.state = 'queued' AND inserted.eta IS NULL\n                        ) AS enqueued\n                        GROUP BY enqueued.queue_name, enqueued.chunk\n                    LOOP\n                        PERFORM pg_notify(\n                            'authentik.tasks.' || _queue_name || '.enqueue',\n                            _message_ids\n                        );\n                    END LOOP;\n                    RETURN NULL;\n                ",
+                    hash="3b96e09c91cab784f06c5a7b302fd2b74b54b1ad",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_notify_enqueueing_inserted_5b299",
+                    referencing="REFERENCING NEW TABLE AS inserted ",
+                    table="authentik_tasks_task",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_tasks", "0006_task_notify_enqueueing_statement"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="lease_expiry",
+            field=models.DateTimeField(
+                help_text="Time after which a claimed task can be claimed again", null=True
+            ),
+        ),
+    ]
@@ -1,7 +1,25 @@
+from prometheus_client import Counter, Histogram
+
 from authentik.blueprints.apps import ManagedAppConfig
 from authentik.lib.utils.reflection import get_apps
 from authentik.tasks.schedules.common import ScheduleSpec
 
+COUNTER_SCHEDULER_RUNS = Counter(
+    "authentik_tasks_scheduler_runs",
+    "Number of times the scheduler ran",
+    ["tenant"],
+)
+HIST_SCHEDULER_DURATION = Histogram(
+    "authentik_tasks_scheduler_duration_seconds",
+    "Duration of scheduler runs",
+    ["tenant"],
+)
+COUNTER_SCHEDULER_DISPATCHED = Counter(
+    "authentik_tasks_scheduler_dispatched",
+    "Number of schedules dispatched by the scheduler",
+    ["tenant"],
+)
+
 
 class AuthentikTasksSchedulesConfig(ManagedAppConfig):
     name = "authentik.tasks.schedules"
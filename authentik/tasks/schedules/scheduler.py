@@ -1,7 +1,14 @@
+from time import perf_counter
+
 import pglock
 from django_dramatiq_postgres.scheduler import Scheduler as SchedulerBase
 from structlog.stdlib import get_logger
 
+from authentik.tasks.schedules.apps import (
+    COUNTER_SCHEDULER_DISPATCHED,
+    COUNTER_SCHEDULER_RUNS,
+    HIST_SCHEDULER_DURATION,
+)
 from authentik.tenants.models import Tenant
 
 LOGGER = get_logger()
@@ -16,11 +23,20 @@ class Scheduler(SchedulerBase):
         )
 
     def run(self):
+        if not self.is_leader():
+            self.logger.debug("Not the scheduler leader, skipping scheduling")
+            return
         for tenant in Tenant.objects.filter(ready=True):
             with tenant:
                 with self._lock(tenant) as lock_acquired:
                     if not lock_acquired:
                         self.logger.debug("Could not acquire lock, skipping scheduling")
-                        return
+                        continue
+                    start = perf_counter()
                     count = self._run()
+                    HIST_SCHEDULER_DURATION.labels(tenant=tenant.schema_name).observe(
+                        perf_counter() - start
+                    )
+                    COUNTER_SCHEDULER_RUNS.labels(tenant=tenant.schema_name).inc()
+                    COUNTER_SCHEDULER_DISPATCHED.labels(tenant=tenant.schema_name).inc(count)
                     self.logger.info(f"Sent {count} scheduled tasks")
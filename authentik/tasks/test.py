@@ -4,6 +4,7 @@ import dramatiq
 from django.utils.module_loading import import_string
 from django_dramatiq_postgres.conf import Conf
 from dramatiq.broker import Broker, MessageProxy, get_broker
+from dramatiq.message import Message
 from dramatiq.middleware.retries import Retries
 from dramatiq.results.middleware import Results
 from dramatiq.worker import Worker, _ConsumerThread, _WorkerThread
@@ -47,12 +48,23 @@ class TestWorker(Worker):
 
 
 class TestBroker(PostgresBroker):
-    def enqueue(self, *args, **kwargs):
-        message = super().enqueue(*args, **kwargs)
+    def _process(self, message: Message):
         worker = TestWorker(message.queue_name, broker=self)
         worker.process_message(MessageProxy(message))
+
+    def enqueue(self, *args, **kwargs):
+        message = super().enqueue(*args, **kwargs)
+        # Buffered messages are processed when the batch is flushed
+        if not self.in_batch:
+            self._process(message)
         return message
 
+    def enqueue_many(self, *args, **kwargs):
+        messages = super().enqueue_many(*args, **kwargs)
+        for message in messages:
+            self._process(message)
+        return messages
+
 
 def use_test_broker():
     old_broker = get_broker()
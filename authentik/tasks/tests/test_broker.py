@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.db import connections
+from django.test import TestCase
+from django.utils.timezone import now
+from dramatiq.broker import get_broker
+
+from authentik.core.tasks import clean_temporary_users
+from authentik.tasks.models import Task, TaskState
+from authentik.tenants.utils import get_current_tenant
+
+
+class TestBroker(TestCase):
+    def test_enqueue_many(self):
+        """Test enqueuing multiple messages at once"""
+        messages = get_broker().enqueue_many([clean_temporary_users.message() for _ in range(3)])
+        tasks = Task.objects.filter(message_id__in=[message.message_id for message in messages])
+        self.assertEqual(tasks.count(), 3)
+        for task in tasks:
+            self.assertEqual(task.state, TaskState.DONE)
+
+    def test_batch(self):
+        """Test messages sent in a batch are only enqueued when leaving it"""
+        broker = get_broker()
+        with broker.batch():
+            first = clean_temporary_users.send()
+            with broker.batch():
+                second = clean_temporary_users.send()
+            self.assertFalse(
+                Task.objects.filter(message_id__in=[first.message_id, second.message_id]).exists()
+            )
+        self.assertEqual(
+            Task.objects.filter(message_id__in=[first.message_id, second.message_id]).count(), 2
+        )
+
+    def test_batch_error(self):
+        """Test messages sent in a batch are discarded when it raises"""
+        with self.assertRaises(ValueError), get_broker().batch():
+            message = clean_temporary_users.send()
+            raise ValueError()
+        self.assertFalse(Task.objects.filter(message_id=message.message_id).exists())
+        self.assertFalse(get_broker().in_batch)
+
+
+class TestConsumer(TestCase):
+    def setUp(self):
+        self.consumer = get_broker().consume("default", prefetch=2)
+        self.consumer.claim_batch_size = 2
+
+    def tearDown(self):
+        self.consumer.close()
+
+    def create_task(self, **kwargs) -> Task:
+        message = clean_temporary_users.message()
+        return Task.objects.create(
+            message_id=message.message_id,
+            queue_name=message.queue_name,
+            actor_name=message.actor_name,
+            message=message.encode(),
+            tenant=get_current_tenant(),
+            **kwargs,
+        )
+
+    def test_claim(self):
+        """Test claiming multiple messages at once"""
+        tasks = [self.create_task() for _ in range(3)]
+        messages = self.consumer._claim(2)
+        self.assertEqual(len(messages), 2)
+        for message in messages:
+            task = Task.objects.get(message_id=message.message_id)
+            self.assertEqual(task.state, TaskState.CONSUMED)
+            self.assertIsNotNone(task.lease_expiry)
+            self.assertEqual(message.options["task"].message_id, task.message_id)
+        messages += self.consumer._claim(2)
+        self.assertEqual(
+            {str(message.message_id) for message in messages},
+            {str(task.message_id) for task in tasks},
+        )
+        self.assertEqual(self.consumer._claim(2), [])
+
+    def test_claim_lease_expired(self):
+        """Test messages of a consumer that went away are claimed again"""
+        expired = self.create_task(
+            state=TaskState.RUNNING, lease_expiry=now() - timedelta(seconds=1)
+        )
+        self.create_task(state=TaskState.RUNNING, lease_expiry=now() + timedelta(minutes=5))
+        self.create_task(state=TaskState.DONE, lease_expiry=now() - timedelta(seconds=1))
+        messages = self.consumer._claim(5)
+        self.assertEqual(
+            [str(message.message_id) for message in messages], [str(expired.message_id)]
+        )
+
+    def test_claim_without_lease(self):
+        """Test consumed messages which were never leased are claimed again, unless a
+        consumer using advisory locks holds them"""
+        stale = self.create_task(
+            state=TaskState.CONSUMED, mtime=now() - self.consumer.lease_duration * 2
+        )
+        locked = self.create_task(
+            state=TaskState.CONSUMED, mtime=now() - self.consumer.lease_duration * 2
+        )
+        self.create_task(state=TaskState.CONSUMED, mtime=now())
+        other = connections.create_connection("default")
+        try:
+            with other.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_lock(%s)",
+                    (self.consumer._get_message_lock_id(str(locked.message_id)),),
+                )
+            messages = self.consumer._claim(5)
+        finally:
+            other.close()
+        self.assertEqual([str(message.message_id) for message in messages], [str(stale.message_id)])
+
+    def test_claim_task_state(self):
+        """Test the tasks of claimed messages match the database"""
+        self.create_task()
+        messages = self.consumer._claim(1)
+        task = messages[0].options["task"]
+        self.assertEqual(task.state, TaskState.CONSUMED)
+        self.assertIsNotNone(task.lease_expiry)
+        task.save()
+        task.refresh_from_db()
+        self.assertEqual(task.state, TaskState.CONSUMED)
+        self.assertIsNotNone(task.lease_expiry)
+
+    def test_next_claimed(self):
+        """Test claimed messages are handed out one by one"""
+        self.create_task()
+        self.create_task()
+        first = self.consumer._next_claimed()
+        self.assertIsNotNone(first)
+        self.assertEqual(len(self.consumer.claimed), 1)
+        self.assertIn(str(first.message_id), self.consumer.in_processing)
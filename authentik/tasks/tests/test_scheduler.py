@@ -0,0 +1,30 @@
+from unittest.mock import MagicMock
+
+from django.test import TestCase
+from dramatiq.broker import get_broker
+
+from authentik.tasks.schedules.scheduler import Scheduler
+
+
+class TestScheduler(TestCase):
+    def test_leader_election(self):
+        """Test only one scheduler is leader at a time"""
+        first = Scheduler()
+        second = Scheduler()
+        try:
+            self.assertTrue(first.is_leader())
+            self.assertFalse(second.is_leader())
+            self.assertTrue(first.is_leader())
+            first.release_leadership()
+            self.assertTrue(second.is_leader())
+        finally:
+            first.release_leadership()
+            second.release_leadership()
+
+    def test_run_interval(self):
+        """Test the consumer only runs the scheduler once per interval"""
+        consumer = get_broker().consume("default")
+        consumer.scheduler = MagicMock()
+        consumer._scheduler()
+        consumer._scheduler()
+        consumer.scheduler.run.assert_called_once()
@@ -358,41 +358,31 @@ class PostgresChannelLoopLayer(BaseChannelLayer):
 
         async with await self.connection() as conn:
             async with conn.cursor() as cursor:
+                # Single statement, so that recipients are notified at once
                 await cursor.execute(
                     sql.SQL(
                         """
-                        SELECT DISTINCT {table}.{channel}
-                        FROM {table}
-                        WHERE {table}.{group_key} = %s
-                        """
-                    ).format(
-                        table=sql.Identifier(GROUP_CHANNEL_TABLE),
-                        channel=sql.Identifier("channel"),
-                        group_key=sql.Identifier("group_key"),
-                    ),
-                    (group_key,),
-                )
-                channels = [row[0] for row in await cursor.fetchall()]
-            messages = [
-                (uuid4(), channel, serialized_message, now() + timedelta(seconds=self.expiry))
-                for channel in channels
-            ]
-            async with conn.cursor() as cursor:
-                await cursor.executemany(
-                    sql.SQL(
-                        """
-                        INSERT INTO {table}
+                        INSERT INTO {message_table}
                         ({id}, {channel}, {message}, {expires})
-                        VALUES (%s, %s, %s, %s)
+                        SELECT gen_random_uuid(), {group_table}.{channel}, %s, %s
+                        FROM {group_table}
+                        WHERE {group_table}.{group_key} = %s
+                        GROUP BY {group_table}.{channel}
                         """
                     ).format(
-                        table=sql.Identifier(MESSAGE_TABLE),
+                        message_table=sql.Identifier(MESSAGE_TABLE),
+                        group_table=sql.Identifier(GROUP_CHANNEL_TABLE),
                         id=sql.Identifier("id"),
                         channel=sql.Identifier("channel"),
                         message=sql.Identifier("message"),
                         expires=sql.Identifier("expires"),
+                        group_key=sql.Identifier("group_key"),
+                    ),
+                    (
+                        serialized_message,
+                        now() + timedelta(seconds=self.expiry),
+                        group_key,
                     ),
-                    messages,
                 )
 
     def _group_key(self, group: str) -> str:
@@ -496,24 +486,27 @@ class PostgresChannelLayerReceiver:
         message: bytes | None = None
         match len(split_payload):
             case 4:
-                message_id, channel, timestamp, base64_message = split_payload
-                if channel not in self._subscribed_to:
-                    return
-                expires = datetime.fromtimestamp(float(timestamp), tz=UTC)
-                if expires < now():
-                    return
-                message = b64decode(base64_message)
+                message_ids, channels, timestamp, base64_message = split_payload
             case 3:
-                message_id, channel, timestamp = split_payload
-                if channel not in self._subscribed_to:
-                    return
-                expires = datetime.fromtimestamp(float(timestamp), tz=UTC)
-                if expires < now():
-                    return
-                message = None
+                message_ids, channels, timestamp = split_payload
+                base64_message = None
             case _:
                 return
-        self._receive_message(channel, message_id, message)
+        # Messages sent to multiple channels at once are notified together
+        recipients = [
+            (message_id, channel)
+            for message_id, channel in zip(message_ids.split(","), channels.split(","), strict=True)
+            if channel in self._subscribed_to
+        ]
+        if not recipients:
+            return
+        expires = datetime.fromtimestamp(float(timestamp), tz=UTC)
+        if expires < now():
+            return
+        if base64_message is not None:
+            message = b64decode(base64_message)
+        for message_id, channel in recipients:
+            self._receive_message(channel, message_id, message)
 
     def _receive_message(self, channel: str, message_id: str, message: bytes | None) -> None:
         if (q := self.channel_layer.channels.get(channel)) is not None:
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-17 12:00
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_channels_postgres", "0002_remove_message_notify_new_channels_message_and_more"),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name="message",
+            name="notify_new_channels_message",
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name="message",
+            trigger=pgtrigger.compiler.Trigger(
+                name="notify_new_channels_message",
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare="DECLARE payload text; message_ids text; channels text; encoded_message text; epoch text;",
+                    func="\n                    FOR message_ids, channels, encoded_message, epoch IN\n                        SELECT\n                            string_agg(chunked.id::text, ',' ORDER BY chunked.channel),\n                            string_agg(chunked.channel, ',' ORDER BY chunked.channel),\n                            encode(chunked.message, 'base64'),\n                            extract(epoch from chunked.expires)::text\n                        FROM (\n                            SELECT\n                                new_messages.*,\n                                sum(octet_length(new_messages.channel) + 38) OVER (\n                                    PARTITION BY new_messages.message, new_messages.expires\n                                    ORDER BY new_messages.channel, new_messages.id\n                                ) / 7000 AS chunk\n                            FROM new_messages\n                        ) AS chunked\n                        GROUP BY chunked.message, chunked.expires, chunked.chunk\n                    LOOP\n                        payload := message_ids || ':' || channels || ':' || epoch;\n                        IF octet_length(payload) + octet_length(encoded_message) + 1 < 8000 THEN\n                            payload := payload || ':' || encoded_message;\n                        END IF;\n\n                        PERFORM pg_notify('channels_messages', payload);\n                    END LOOP;\n                    RETURN NULL;\n                ",
+                    hash="feef374f60f97aff7bcb6b58645e72df80c99966",
+                    level="STATEMENT",
+                    operation="INSERT",
+                    pgid="pgtrigger_notify_new_channels_message_d21ae",
+                    referencing="REFERENCING NEW TABLE AS new_messages ",
+                    table="django_channels_postgres_message",
+                    when="AFTER",
+                ),
+            ),
+        ),
+    ]
@@ -64,28 +64,50 @@ class Message(models.Model):
         verbose_name_plural = _("Messages")
         indexes = (models.Index(fields=("channel", "expires")),)
         triggers = (
+            # Messages inserted by the same statement with the same body, such as group sends,
+            # are notified together. Payloads are `<ids>:<channels>:<expiry epoch>[:<message>]`,
+            # with comma-separated message IDs and channels. The message is only included
+            # if it fits in the 8000 bytes limit of notifications.
             pgtrigger.Trigger(
                 name="notify_new_channels_message",
                 operation=pgtrigger.Insert,
                 when=pgtrigger.After,
-                timing=pgtrigger.Deferred,
+                level=pgtrigger.Statement,
+                referencing=pgtrigger.Referencing(new="new_messages"),
                 declare=[
                     ("payload", "text"),
+                    ("message_ids", "text"),
+                    ("channels", "text"),
                     ("encoded_message", "text"),
                     ("epoch", "text"),
                 ],
                 func=f"""
-                    encoded_message := encode(NEW.message, 'base64');
-                    epoch := extract(epoch from NEW.expires)::text;
-                    IF octet_length(NEW.id::text) + octet_length(NEW.channel) + octet_length(epoch) + octet_length(encoded_message) + 3 < 8000 THEN
-                        payload := NEW.id::text || ':' || NEW.channel || ':' || epoch || ':' || encoded_message;
-                    ELSE
-                        payload := NEW.id::text || ':' || NEW.channel || ':' || epoch;
-                    END IF;
-
-                    PERFORM pg_notify('{NOTIFY_CHANNEL}', payload);
-                    RETURN NEW;
-                """,  # noqa: E501
+                    FOR message_ids, channels, encoded_message, epoch IN
+                        SELECT
+                            string_agg(chunked.id::text, ',' ORDER BY chunked.channel),
+                            string_agg(chunked.channel, ',' ORDER BY chunked.channel),
+                            encode(chunked.message, 'base64'),
+                            extract(epoch from chunked.expires)::text
+                        FROM (
+                            SELECT
+                                new_messages.*,
+                                sum(octet_length(new_messages.channel) + 38) OVER (
+                                    PARTITION BY new_messages.message, new_messages.expires
+                                    ORDER BY new_messages.channel, new_messages.id
+                                ) / 7000 AS chunk
+                            FROM new_messages
+                        ) AS chunked
+                        GROUP BY chunked.message, chunked.expires, chunked.chunk
+                    LOOP
+                        payload := message_ids || ':' || channels || ':' || epoch;
+                        IF octet_length(payload) + octet_length(encoded_message) + 1 < 8000 THEN
+                            payload := payload || ':' || encoded_message;
+                        END IF;
+
+                        PERFORM pg_notify('{NOTIFY_CHANNEL}', payload);
+                    END LOOP;
+                    RETURN NULL;
+                """,
             ),
         )
 
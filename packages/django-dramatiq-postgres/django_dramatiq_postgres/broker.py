@@ -1,8 +1,11 @@
 import functools
 import logging
 import time
-from collections.abc import Callable, Iterable
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
+from threading import local
 from typing import Any, ParamSpec, TypeVar, cast
 
 import tenacity
@@ -16,7 +19,7 @@ from django.db import (
     transaction,
 )
 from django.db.backends.postgresql.base import DatabaseWrapper
-from django.db.models import QuerySet
+from django.db.models import Q, QuerySet
 from django.db.models.expressions import F
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -55,6 +58,17 @@ def channel_name(queue_name: str, identifier: ChannelIdentifier) -> str:
     return f"{CHANNEL_PREFIX}.{queue_name}.{identifier.value}"
 
 
+retry_on_connection_error = tenacity.retry(
+    retry=tenacity.retry_if_exception_type(ConnectionError),
+    reraise=True,
+    wait=tenacity.wait_random_exponential(multiplier=1, max=5),
+    stop=tenacity.stop_after_attempt(3),
+    before_sleep=tenacity.before_sleep_log(
+        cast(logging.Logger, logger), logging.INFO, exc_info=True
+    ),
+)
+
+
 def raise_connection_error(func: Callable[P, R]) -> Callable[P, R]:
     @functools.wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
@@ -81,6 +95,7 @@ class PostgresBroker(Broker):
         self.logger = get_logger(__name__, type(self))
 
         self.queues = set()
+        self._batch = local()
 
         self.db_alias = db_alias
         self.middleware = []
@@ -136,17 +151,7 @@ class PostgresBroker(Broker):
             "eta": eta,
         }
 
-    @tenacity.retry(
-        retry=tenacity.retry_if_exception_type(ConnectionError),
-        reraise=True,
-        wait=tenacity.wait_random_exponential(multiplier=1, max=5),
-        stop=tenacity.stop_after_attempt(3),
-        before_sleep=tenacity.before_sleep_log(
-            cast(logging.Logger, logger), logging.INFO, exc_info=True
-        ),
-    )
-    @raise_connection_error
-    def enqueue(self, message: Message[Any], *, delay: int | None = None) -> Message[Any]:
+    def _before_enqueue(self, message: Message[Any], delay: int | None) -> None:
         queue_name = q_name(message.queue_name)  # type: ignore[no-untyped-call]
         if delay:
             message_eta = current_millis() + delay  # type: ignore[no-untyped-call]
@@ -161,20 +166,57 @@ class PostgresBroker(Broker):
         message.options["model_create_defaults"] = {}
         self.emit_before("enqueue", message, delay)  # type: ignore[no-untyped-call]
 
-        with transaction.atomic(using=self.db_alias):
-            query = {
-                "message_id": message.message_id,
-            }
-            defaults = message.options.pop("model_defaults")
-            defaults["message"] = message.encode()
-            create_defaults = {
-                **query,
-                **defaults,
-                **message.options.pop("model_create_defaults"),
-            }
+    def _model_fields(self, message: Message[Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Pop the model fields set by middlewares from the message, and return
+        the fields to update and the fields to create the task with"""
+        defaults = message.options.pop("model_defaults")
+        defaults["message"] = message.encode()
+        create_defaults = {
+            "message_id": message.message_id,
+            **defaults,
+            **message.options.pop("model_create_defaults"),
+        }
+        return defaults, create_defaults
+
+    @property
+    def in_batch(self) -> bool:
+        return getattr(self._batch, "messages", None) is not None
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Buffer all messages enqueued in this block and enqueue them when leaving it,
+        with a single insert and a single notification per queue.
+
+        Buffered messages are discarded if the block raises. Nested blocks are flushed
+        with the outermost one."""
+        if self.in_batch:
+            yield
+            return
+        self._batch.messages = []
+        try:
+            yield
+            messages: list[tuple[Message[Any], int | None]] = self._batch.messages
+        finally:
+            self._batch.messages = None
+        by_delay: dict[int | None, list[Message[Any]]] = {}
+        for message, delay in messages:
+            by_delay.setdefault(delay, []).append(message)
+        for delay, delayed_messages in by_delay.items():
+            self.enqueue_many(delayed_messages, delay=delay)
+
+    @retry_on_connection_error
+    @raise_connection_error
+    def enqueue(self, message: Message[Any], *, delay: int | None = None) -> Message[Any]:
+        if self.in_batch:
+            self._batch.messages.append((message, delay))
+            return message
+
+        self._before_enqueue(message, delay)
 
+        with transaction.atomic(using=self.db_alias):
+            defaults, create_defaults = self._model_fields(message)
             task, created = self.query_set.update_or_create(
-                **query,
+                message_id=message.message_id,
                 defaults=defaults,
                 create_defaults=create_defaults,
             )
@@ -184,6 +226,47 @@ class PostgresBroker(Broker):
             self.emit_after("enqueue", message, delay)  # type: ignore[no-untyped-call]
         return message
 
+    @retry_on_connection_error
+    @raise_connection_error
+    def enqueue_many(
+        self, messages: Iterable[Message[Any]], *, delay: int | None = None
+    ) -> list[Message[Any]]:
+        """Enqueue multiple messages at once. New messages are created with a single insert,
+        which sends a single notification per queue. Messages that already exist are updated
+        like with `enqueue`."""
+        messages = list(messages)
+        if not messages:
+            return messages
+        for message in messages:
+            self._before_enqueue(message, delay)
+
+        with transaction.atomic(using=self.db_alias):
+            existing = {
+                str(message_id)
+                for message_id in self.model._default_manager.using(self.db_alias)
+                .filter(message_id__in=[message.message_id for message in messages])
+                .values_list("message_id", flat=True)
+            }
+            tasks = []
+            for message in messages:
+                defaults, create_defaults = self._model_fields(message)
+                if message.message_id in existing:
+                    task, created = self.query_set.update_or_create(
+                        message_id=message.message_id,
+                        defaults=defaults,
+                        create_defaults=create_defaults,
+                    )
+                else:
+                    task, created = self.model(**create_defaults), True
+                    tasks.append(task)
+                message.options["task"] = task
+                message.options["task_created"] = created
+            self.model._default_manager.using(self.db_alias).bulk_create(tasks)
+
+            for message in messages:
+                self.emit_after("enqueue", message, delay)  # type: ignore[no-untyped-call]
+        return messages
+
     def get_declared_queues(self) -> set[str]:
         return self.queues.copy()
 
@@ -252,6 +335,11 @@ class _PostgresConsumer(Consumer):
         # Override because dramatiq doesn't allow us setting this manually
         self.timeout = Conf().worker["consumer_listen_timeout"]
 
+        self.claim_batch_size: int = Conf().worker["consumer_claim_batch_size"]
+        self.claimed: deque[Message[Any]] = deque()
+        self.lease_duration = timedelta(seconds=Conf().worker["consumer_lease_duration"])
+        self.lease_renew_last_run = timezone.now()
+
         self.task_purge_interval = timedelta(seconds=Conf().task_purge_interval)
         self.task_purge_last_run = timezone.now() - self.task_purge_interval
 
@@ -320,7 +408,10 @@ class _PostgresConsumer(Consumer):
                 notifies=len(notifies),
                 channel=self.postgres_channel,
             )
-            return {str(notify.payload) for notify in notifies}
+            # Inserts notify comma-separated message IDs
+            return {
+                message_id for notify in notifies for message_id in str(notify.payload).split(",")
+            }
 
     def _consume_one(self, message_id: str) -> Message[Any] | None:
         if message_id in self.in_processing:
@@ -372,6 +463,99 @@ class _PostgresConsumer(Consumer):
         self.in_processing.add(str(message_id))
         return message
 
+    def _claim(self, limit: int) -> list[Message[Any]]:
+        """Claim up to `limit` messages at once, skipping messages claimed by other consumers.
+        Claimed messages are leased, and can be claimed again once their lease expires, for
+        example if the consumer holding them crashed."""
+        now = timezone.now()
+        with transaction.atomic(using=self.db_alias):
+            tasks: list[TaskBase] = list(
+                self.query_set.defer(None)
+                .defer("result")
+                .filter(
+                    Q(state=TaskState.QUEUED)
+                    | (~Q(state__in=(TaskState.DONE, TaskState.REJECTED)) & Q(lease_expiry__lt=now))
+                    # Consumed without a lease, by a consumer using advisory locks. Those still
+                    # holding the lock are skipped below
+                    | Q(
+                        state=TaskState.CONSUMED,
+                        lease_expiry__isnull=True,
+                        mtime__lt=now - self.lease_duration,
+                    ),
+                    Q(eta__lt=now + timedelta(seconds=self.timeout)) | Q(eta__isnull=True),
+                    queue_name=self.queue_name,
+                )
+                .exclude(message_id__in=self.in_processing)
+                .order_by(F("eta").asc(nulls_first=True))
+                .select_for_update(skip_locked=True, of=("self",))[:limit]
+            )
+            unleased = [
+                str(task.message_id)
+                for task in tasks
+                if task.state == TaskState.CONSUMED and task.lease_expiry is None
+            ]
+            if unleased:
+                locked = self._locked_messages(unleased)
+                tasks = [task for task in tasks if str(task.message_id) not in locked]
+            if not tasks:
+                return []
+            self.query_set.filter(message_id__in=[task.message_id for task in tasks]).update(
+                state=TaskState.CONSUMED,
+                mtime=now,
+                lease_expiry=now + self.lease_duration,
+            )
+        # Tasks are saved again while they're processed, so they need to match the database
+        for task in tasks:
+            task.state = TaskState.CONSUMED
+            task.mtime = now
+            task.lease_expiry = now + self.lease_duration
+        self.logger.debug("Claimed messages", count=len(tasks), queue=self.queue_name)
+        messages = []
+        for task in tasks:
+            message = Message.decode(cast(bytes, task.message))
+            message.options["task"] = task
+            messages.append(message)
+        return messages
+
+    def _locked_messages(self, message_ids: list[str]) -> set[str]:
+        """Get the messages whose advisory lock is held by a consumer"""
+        lock_ids = {}
+        for message_id in message_ids:
+            lock_id = self._get_message_lock_id(message_id)
+            # Advisory locks on a bigint key are listed split into two 32-bit halves
+            lock_ids[((lock_id >> 32) & 0xFFFFFFFF, lock_id & 0xFFFFFFFF)] = message_id
+        with connections[self.db_alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT classid::bigint, objid::bigint FROM pg_locks "
+                "WHERE locktype = 'advisory' AND objsubid = 1"
+            )
+            return {lock_ids[row] for row in cursor.fetchall() if row in lock_ids}
+
+    def _next_claimed(self) -> Message[Any] | None:
+        if not self.claimed:
+            limit = min(self.claim_batch_size, self.prefetch - len(self.in_processing))
+            self.claimed.extend(self._claim(limit))
+            # Nothing available right now, wait for new messages
+            if not self.claimed and self._poll_for_notify():
+                self.claimed.extend(self._claim(limit))
+        if not self.claimed:
+            return None
+        message = self.claimed.popleft()
+        self.in_processing.add(str(message.message_id))
+        return message
+
+    def _renew_leases(self) -> None:
+        if not self.claim_batch_size:
+            return
+        if timezone.now() - self.lease_renew_last_run < self.lease_duration / 3:
+            return
+        message_ids = self.in_processing | {str(message.message_id) for message in self.claimed}
+        if message_ids:
+            self.query_set.filter(message_id__in=message_ids).exclude(
+                state__in=(TaskState.DONE, TaskState.REJECTED)
+            ).update(lease_expiry=timezone.now() + self.lease_duration)
+        self.lease_renew_last_run = timezone.now()
+
     @raise_connection_error
     def __next__(self) -> MessageProxy | None:
         # This method is called every second
@@ -379,9 +563,13 @@ class _PostgresConsumer(Consumer):
         # Run required processes first
         self._scheduler()
         self._purge_locks()
+        self._renew_leases()
 
+        if self.claim_batch_size:
+            # Force creation of listen connection, claiming picks up missed messages
+            _ = self.listen_connection
         # If we don't have a connection yet, fetch missed notifications from the table directly
-        if self._listen_connection is None and not self.pending:
+        elif self._listen_connection is None and not self.pending:
             # We might miss a notification between the initial query and the first time we wait for
             # notifications, it doesn't matter because we re-fetch for missed messages later on.
             self.pending = self._fetch_pending_messages()
@@ -403,6 +591,13 @@ class _PostgresConsumer(Consumer):
         else:
             self.misses = 0
 
+        if self.claim_batch_size:
+            claimed = self._next_claimed()
+            if claimed is not None:
+                return MessageProxy(claimed)  # type: ignore[no-untyped-call]
+            self._auto_purge()
+            return None
+
         if not self.pending:
             self.pending = self._poll_for_notify()
 
@@ -447,7 +642,8 @@ class _PostgresConsumer(Consumer):
             self.in_processing.remove(str(message.message_id))
         except KeyError:
             pass
-        self.to_unlock.add(str(message.message_id))
+        if not self.claim_batch_size:
+            self.to_unlock.add(str(message.message_id))
         task = message.options.pop("task", None)
         self.query_set.filter(
             message_id=message.message_id,
@@ -478,7 +674,8 @@ class _PostgresConsumer(Consumer):
             state=TaskState.QUEUED,
         )
         for message in messages:
-            self.to_unlock.add(str(message.message_id))
+            if not self.claim_batch_size:
+                self.to_unlock.add(str(message.message_id))
             self.in_processing.remove(str(message.message_id))
 
     def _scheduler(self) -> None:
@@ -487,7 +684,7 @@ class _PostgresConsumer(Consumer):
         if timezone.now() - self.scheduler_last_run < self.scheduler_interval:
             return
         self.scheduler.run()
-        self.schedule_last_run = timezone.now()
+        self.scheduler_last_run = timezone.now()
 
     def _purge_locks(self) -> None:
         while True:
@@ -513,6 +710,15 @@ class _PostgresConsumer(Consumer):
     @raise_connection_error
     def close(self) -> None:
         try:
+            if self.claimed:
+                # Release messages that were claimed but never handed to a worker
+                self.query_set.filter(
+                    message_id__in=[message.message_id for message in self.claimed],
+                    state=TaskState.CONSUMED,
+                ).update(state=TaskState.QUEUED, lease_expiry=None)
+                self.claimed.clear()
+            if self.scheduler:
+                self.scheduler.release_leadership()
             self._purge_locks()
         finally:
             if self._locks_connection is not None:
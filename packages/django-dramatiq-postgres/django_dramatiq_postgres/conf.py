@@ -113,6 +113,10 @@ class Conf:
             "processes": None,
             "threads": None,
             "consumer_listen_timeout": 30,
+            # When set, messages are claimed in batches of up to this size using
+            # `FOR UPDATE SKIP LOCKED` and leases instead of one advisory lock per message
+            "consumer_claim_batch_size": 0,
+            "consumer_lease_duration": 5 * 60,
             **self.conf.get("worker", {}),
         }
 
@@ -170,6 +170,7 @@ class CurrentTask(Middleware):
             "eta",
             "result",
             "result_expiry",
+            "lease_expiry",
         }
         fields_to_update = [
             f.name
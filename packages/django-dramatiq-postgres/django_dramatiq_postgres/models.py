@@ -52,6 +52,9 @@ class TaskBase(models.Model):
     mtime = models.DateTimeField(default=now, help_text=_("Task last modified time"))
     retries = models.PositiveBigIntegerField(default=0, help_text=_("Number of retries"))
     eta = models.DateTimeField(null=True, help_text=_("Planned execution time"))
+    lease_expiry = models.DateTimeField(
+        null=True, help_text=_("Time after which a claimed task can be claimed again")
+    )
 
     result = models.BinaryField(null=True, help_text=_("Task result"))
     result_expiry = models.DateTimeField(null=True, help_text=_("Result expiry time"))
@@ -71,7 +74,7 @@ class TaskBase(models.Model):
         triggers = (
             pgtrigger.Trigger(
                 name="notify_enqueueing",
-                operation=pgtrigger.Insert | pgtrigger.Update,
+                operation=pgtrigger.Update,
                 when=pgtrigger.After,
                 condition=pgtrigger.Q(new__state=TaskState.QUEUED, new__eta=None),
                 timing=pgtrigger.Deferred,
@@ -83,6 +86,38 @@ class TaskBase(models.Model):
                     RETURN NEW;
                 """,  # noqa: E501
             ),
+            # Inserts are notified once per statement so that bulk enqueues only send one
+            # notification per queue. Payloads are comma-separated message IDs, chunked to
+            # stay below the 8000 bytes limit.
+            pgtrigger.Trigger(
+                name="notify_enqueueing_inserted",
+                operation=pgtrigger.Insert,
+                when=pgtrigger.After,
+                level=pgtrigger.Statement,
+                referencing=pgtrigger.Referencing(new="inserted"),
+                declare=[("_queue_name", "text"), ("_message_ids", "text")],
+                func=f"""
+                    FOR _queue_name, _message_ids IN
+                        SELECT enqueued.queue_name, string_agg(enqueued.message_id::text, ',')
+                        FROM (
+                            SELECT
+                                inserted.queue_name,
+                                inserted.message_id,
+                                (row_number() OVER (PARTITION BY inserted.queue_name) - 1) / 200
+                                    AS chunk
+                            FROM inserted
+                            WHERE inserted.state = '{TaskState.QUEUED.value}' AND inserted.eta IS NULL
+                        ) AS enqueued
+                        GROUP BY enqueued.queue_name, enqueued.chunk
+                    LOOP
+                        PERFORM pg_notify(
+                            '{CHANNEL_PREFIX}.' || _queue_name || '.{ChannelIdentifier.ENQUEUE.value}',
+                            _message_ids
+                        );
+                    END LOOP;
+                    RETURN NULL;
+                """,  # noqa: E501
+            ),
         )
 
     def __str__(self) -> str:
@@ -1,12 +1,13 @@
 from typing import Any, cast
 
-import pglock
-from django.db import router, transaction
+from django.db import DatabaseError, connections, router, transaction
+from django.db.backends.postgresql.base import DatabaseWrapper
 from django.db.models import QuerySet
 from django.utils.functional import cached_property
 from django.utils.module_loading import import_string
 from django.utils.timezone import now
 from dramatiq.broker import Broker
+from pglock.core import _cast_lock_id
 from structlog.stdlib import get_logger
 
 from django_dramatiq_postgres.conf import Conf
@@ -19,6 +20,8 @@ class Scheduler:
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.logger = get_logger(__name__, type(self))
+        # Dedicated connection holding the leader lock for as long as it is open
+        self._leader_connection: DatabaseWrapper | None = None
 
     @cached_property
     def model(self) -> type[ScheduleBase]:
@@ -35,12 +38,45 @@ class Scheduler:
         schedule.send(self.broker)
         schedule.save()
 
-    def _lock(self) -> pglock.advisory:
-        return pglock.advisory(
-            lock_id=f"{Conf().channel_prefix}.scheduler",
-            side_effect=pglock.Return,
-            timeout=0,
+    @property
+    def leader_lock_id(self) -> int:
+        lock_id = _cast_lock_id(f"{Conf().channel_prefix}.scheduler")  # type: ignore[no-untyped-call]
+        return cast(int, lock_id)
+
+    def is_leader(self) -> bool:
+        """Only one scheduler runs at a time across all workers. The leader holds a session
+        advisory lock, which is released when its connection closes, for example when
+        the worker stops."""
+        if self._leader_connection is not None:
+            if self._leader_connection.is_usable():
+                return True
+            self.release_leadership()
+        connection = cast(
+            DatabaseWrapper,
+            connections.create_connection(router.db_for_write(self.model)),
         )
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (self.leader_lock_id,))
+                acquired = bool(cursor.fetchone()[0])
+        except DatabaseError:
+            acquired = False
+        if not acquired:
+            connection.close()
+            return False
+        self.logger.info("Acquired scheduler leadership")
+        self._leader_connection = connection
+        return True
+
+    def release_leadership(self) -> None:
+        if self._leader_connection is None:
+            return
+        connection = self._leader_connection
+        self._leader_connection = None
+        try:
+            connection.close()
+        except DatabaseError:
+            pass
 
     def _run(self) -> int:
         count = 0
@@ -53,10 +89,9 @@ class Scheduler:
         return count
 
     def run(self) -> int:
-        with self._lock() as lock_acquired:
-            if not lock_acquired:
-                self.logger.debug("Could not acquire lock, skipping scheduling")
-                return -1
-            count = self._run()
-            self.logger.info("Sent scheduled tasks", count=count)
+        if not self.is_leader():
+            self.logger.debug("Not the scheduler leader, skipping scheduling")
+            return -1
+        count = self._run()
+        self.logger.info("Sent scheduled tasks", count=count)
         return count
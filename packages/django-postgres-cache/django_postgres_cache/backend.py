@@ -1,19 +1,27 @@
 import base64
+import os
 import pickle  # nosec
+import zlib
 from datetime import UTC, datetime
+from threading import Lock
 from typing import Any
 
 from django.conf import settings
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.core.cache.backends.db import DatabaseCache as BaseDatabaseCache
-from django.db import DatabaseError
+from django.db import DatabaseError, connections, router
 from django.db.utils import ProgrammingError
 from django.utils.module_loading import import_string
 from django.utils.timezone import now
 from psqlextra.types import ConflictAction
 
+from django_postgres_cache.l1 import InvalidationListener, L1Cache, notify_invalidate
 from django_postgres_cache.models import CacheEntry
 
+# Header byte of values stored in the binary column
+FORMAT_PICKLE = b"\x00"
+FORMAT_PICKLE_ZLIB = b"\x01"
+
 
 class DatabaseCache(BaseDatabaseCache):
     def __init__(self, table: str, params: dict[str, Any]) -> None:
@@ -21,32 +29,173 @@ class DatabaseCache(BaseDatabaseCache):
         self.reverse_key_func = import_string(params["REVERSE_KEY_FUNCTION"])
         self._table = CacheEntry._meta.db_table
         self.cache_model_class = CacheEntry
+        # Optional per-process tier, invalidated across processes with LISTEN/NOTIFY
+        self.l1: L1Cache | None = None
+        if int(params.get("L1_MAX_ENTRIES", 0)) > 0:
+            self.l1 = L1Cache(
+                max_entries=int(params["L1_MAX_ENTRIES"]),
+                timeout=float(params.get("L1_TIMEOUT", 60)),
+            )
+        # Compress pickled values larger than this many bytes, 0 to disable
+        self.compress_min_size = int(params.get("COMPRESS_MIN_SIZE", 0))
+        # Also write the base64-encoded text column so that processes which only
+        # read that column can still read new values while a rollout is in progress
+        self.write_legacy_value = bool(params.get("WRITE_LEGACY_VALUE", True))
+        self._l1_listener: InvalidationListener | None = None
+        self._l1_listener_pid: int | None = None
+        self._l1_listener_lock = Lock()
 
     def _cull(self, *args: Any, **kwargs: Any) -> None:
         """Stubbed out cull method as we cull in a background task"""
         pass
 
+    def _ensure_l1_listener(self) -> None:
+        """Start the invalidation listener lazily, and again in forked children"""
+        if self._l1_listener_pid == os.getpid():
+            return
+        with self._l1_listener_lock:
+            if self._l1_listener_pid == os.getpid() or self.l1 is None:
+                return
+            # A listener inherited from the parent doesn't exist in this process
+            self.l1.listening = False
+            self.l1.clear()
+            self._l1_listener = InvalidationListener(self, self.l1)
+            self._l1_listener.start()
+            self._l1_listener_pid = os.getpid()
+
+    def _l1_invalidate(self, keys: list[str] | None) -> None:
+        if self.l1 is None:
+            return
+        if keys is None:
+            self.l1.clear()
+        else:
+            self.l1.invalidate(keys)
+        notify_invalidate(self, keys)
+
     def get(self, key: str, default: Any | None = None, version: int | None = None) -> Any:
         try:
-            return super().get(key, default=default, version=version)
+            if self.l1 is None:
+                return super().get(key, default=default, version=version)
+            return self._l1_get(key, default=default, version=version)
         except ProgrammingError:
             return default
 
+    def _l1_get(self, key: str, default: Any | None = None, version: int | None = None) -> Any:
+        assert self.l1 is not None  # nosec
+        self._ensure_l1_listener()
+        key = self.make_and_validate_key(key, version=version)
+        pickled = self.l1.get(key)
+        if pickled is not None:
+            return pickle.loads(pickled)  # nosec
+        generation = self.l1.generation
+        entry = (
+            CacheEntry.objects.filter(cache_key=key).values_list("data", "value", "expires").first()
+        )
+        if not entry:
+            return default
+        data, value, expires = entry
+        if expires < now():
+            self._base_delete_many([key])
+            return default
+        pickled = self._load_pickled(data, value)
+        if pickled is None:
+            return default
+        self.l1.set(key, pickled, expires, generation)
+        return pickle.loads(pickled)  # nosec
+
+    def get_many(self, keys: Any, version: int | None = None) -> dict[Any, Any]:
+        if not keys:
+            return {}
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        result = {}
+        expired_keys = []
+        for key, data, value, expires in CacheEntry.objects.filter(
+            cache_key__in=list(key_map)
+        ).values_list("cache_key", "data", "value", "expires"):
+            if expires < now():
+                expired_keys.append(key)
+                continue
+            pickled = self._load_pickled(data, value)
+            if pickled is None:
+                continue
+            result[key_map[key]] = pickle.loads(pickled)  # nosec
+        self._base_delete_many(expired_keys)
+        return result
+
+    def _dump_pickled(self, pickled: bytes) -> bytes:
+        if self.compress_min_size and len(pickled) >= self.compress_min_size:
+            return FORMAT_PICKLE_ZLIB + zlib.compress(pickled)
+        return FORMAT_PICKLE + pickled
+
+    def _load_pickled(self, data: bytes | memoryview | None, value: str | None) -> bytes | None:
+        """Get pickled value from the binary column, or from the legacy text column
+        for entries written before it existed. Entries without either are treated as missing"""
+        if data is None:
+            if value is None:
+                return None
+            return base64.b64decode(value.encode())
+        data = bytes(data)
+        header, payload = data[:1], data[1:]
+        if header == FORMAT_PICKLE_ZLIB:
+            return zlib.decompress(payload)
+        if header == FORMAT_PICKLE:
+            return payload
+        raise ValueError(f"Unknown cache value format {header!r}")
+
+    def _base_delete_many(self, keys: list[str]) -> bool:
+        deleted = super()._base_delete_many(keys)
+        if keys:
+            self._l1_invalidate(list(keys))
+        return deleted
+
     def keys(self, keys_pattern: str, version: int | None = None) -> list[str]:
         try:
             return self._keys(keys_pattern, version=version)
         except ProgrammingError:
             return []
 
+    def _make_prefix(self, keys_pattern: str, version: int | None = None) -> str | None:
+        """Get the full key prefix if `keys_pattern` is a prefix glob (`foo*`).
+        This relies on the key function appending the key at the end, like Django's does."""
+        if not keys_pattern.endswith("*") or "*" in keys_pattern[:-1]:
+            return None
+        return self.make_key(keys_pattern[:-1], version=version)
+
     def _keys(self, keys_pattern: str, version: int | None = None) -> list[str]:
-        keys_pattern = self.make_key(keys_pattern.replace("*", ".*"), version=version)
+        prefix = self._make_prefix(keys_pattern, version=version)
+        if prefix is not None:
+            # Served by the text_pattern_ops index on cache_key
+            query = CacheEntry.objects.filter(cache_key__startswith=prefix)
+        else:
+            keys_pattern = self.make_key(keys_pattern.replace("*", ".*"), version=version)
+            query = CacheEntry.objects.filter(cache_key__regex=keys_pattern)
 
-        return [
-            self.reverse_key_func(key)
-            for key in CacheEntry.objects.filter(cache_key__regex=keys_pattern).values_list(
-                "cache_key", flat=True
-            )
-        ]
+        return [self.reverse_key_func(key) for key in query.values_list("cache_key", flat=True)]
+
+    def delete_pattern(self, keys_pattern: str, version: int | None = None) -> int:
+        """Delete all keys matching `keys_pattern` and return how many were deleted.
+        Prefix globs (`foo*`) are deleted with a single statement."""
+        try:
+            prefix = self._make_prefix(keys_pattern, version=version)
+            if prefix is None:
+                keys = self._keys(keys_pattern, version=version)
+                self.delete_many(keys, version=version)
+                return len(keys)
+            db = router.db_for_write(self.cache_model_class)
+            connection = connections[db]
+            table = connection.ops.quote_name(self._table)
+            cache_key = connection.ops.quote_name("cache_key")
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE {cache_key} LIKE %s RETURNING {cache_key}",  # nosec
+                    [connection.ops.prep_for_like_query(prefix) + "%"],
+                )
+                deleted = [row[0] for row in cursor.fetchall()]
+        except ProgrammingError:
+            return 0
+        if deleted:
+            self._l1_invalidate(deleted)
+        return len(deleted)
 
     def ttl(self, key: str, version: int | None = None) -> int | None:
         """Get TTL left for a given key and version"""
@@ -72,14 +221,19 @@ class DatabaseCache(BaseDatabaseCache):
         value: Any,
         timeout: float | None,
         version: int | None = None,
-    ) -> tuple[str, str, datetime]:
+    ) -> tuple[str, dict[str, Any], datetime]:
         key = self.make_and_validate_key(key, version=version)
         pickled = pickle.dumps(value, self.pickle_protocol)
-        # The DB column is expecting a string, so make sure the value is a
-        # string, not bytes. Refs #19274.
-        b64encoded = base64.b64encode(pickled).decode("latin1")
+        values: dict[str, Any] = {
+            "data": self._dump_pickled(pickled),
+            "value": None,
+        }
+        if self.write_legacy_value:
+            # The DB column is expecting a string, so make sure the value is a
+            # string, not bytes. Refs #19274.
+            values["value"] = base64.b64encode(pickled).decode("latin1")
 
-        return (key, b64encoded, self._base_set_expiry(timeout))
+        return (key, values, self._base_set_expiry(timeout))
 
     def touch(
         self,
@@ -91,6 +245,7 @@ class DatabaseCache(BaseDatabaseCache):
         expiry = self._base_set_expiry(timeout)
         try:
             count = CacheEntry.objects.filter(cache_key=key).update(expires=expiry)
+            self._l1_invalidate([key])
             return bool(count != 0)
         except DatabaseError:
             return False
@@ -102,7 +257,7 @@ class DatabaseCache(BaseDatabaseCache):
         timeout: float | None = DEFAULT_TIMEOUT,
         version: int | None = None,
     ) -> bool:
-        key, value, expiry = self._base_set_data(key, value, timeout, version)
+        key, values, expiry = self._base_set_data(key, value, timeout, version)
         try:
             CacheEntry.objects.on_conflict(
                 ["cache_key"],
@@ -112,9 +267,10 @@ class DatabaseCache(BaseDatabaseCache):
                 ),
             ).insert(
                 cache_key=key,
-                value=value,
                 expires=expiry,
+                **values,
             )
+            self._l1_invalidate([key])
             # We don't know if the row already existed, we just return True for success
             return True
         except DatabaseError:
@@ -127,15 +283,17 @@ class DatabaseCache(BaseDatabaseCache):
         timeout: float | None = DEFAULT_TIMEOUT,
         version: int | None = None,
     ) -> None:
-        key, value, expiry = self._base_set_data(key, value, timeout, version)
+        key, values, expiry = self._base_set_data(key, value, timeout, version)
         CacheEntry.objects.on_conflict(
             ["cache_key"],
             ConflictAction.UPDATE,
         ).insert(
             cache_key=key,
-            value=value,
             expires=expiry,
+            **values,
         )
+        self._l1_invalidate([key])
 
     def clear(self) -> None:
         CacheEntry.objects.truncate()
+        self._l1_invalidate(None)
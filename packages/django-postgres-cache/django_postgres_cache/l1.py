@@ -0,0 +1,165 @@
+"""Per-process in-memory cache tier in front of the database cache"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from logging import getLogger
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING, cast
+
+from django.db import DatabaseError, connections, router
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.utils.timezone import now
+from psycopg import sql
+from psycopg.errors import Error as PsycopgError
+
+if TYPE_CHECKING:
+    from django_postgres_cache.backend import DatabaseCache
+
+LOGGER = getLogger(__name__)
+
+NOTIFY_CHANNEL = "django_postgres_cache.invalidate"
+# Payload used to invalidate all keys, cache keys can't contain spaces
+INVALIDATE_ALL = "*all*"
+# NOTIFY payloads are limited to 8000 bytes, keep some headroom
+MAX_NOTIFY_PAYLOAD = 7900
+
+
+class L1Cache:
+    """Size-bounded LRU cache holding pickled values. Entries expire after `timeout` seconds or
+    when the underlying database entry expires, whichever comes first.
+
+    Entries are only served while the invalidation listener is connected, as otherwise
+    changes made by other processes could be missed."""
+
+    def __init__(self, max_entries: int, timeout: float) -> None:
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._lock = Lock()
+        # Incremented on every invalidation, used to avoid caching values
+        # which were read from the database while they were being changed
+        self.generation = 0
+        self.listening = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> bytes | None:
+        if not self.listening:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, deadline = entry
+            if deadline <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, expires: datetime, generation: int) -> None:
+        if not self.listening:
+            return
+        ttl = min(self.timeout, (expires - now()).total_seconds())
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, keys: list[str]) -> None:
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+class InvalidationListener(Thread):
+    """LISTEN for keys changed by any process and remove them from the local tier"""
+
+    def __init__(self, cache: "DatabaseCache", l1: L1Cache, timeout: float = 30) -> None:
+        super().__init__(name="django-postgres-cache-invalidation", daemon=True)
+        self.cache = cache
+        self.l1 = l1
+        self.timeout = timeout
+        self.stopped = Event()
+        self._connection: DatabaseWrapper | None = None
+
+    def _connect(self) -> DatabaseWrapper:
+        alias = router.db_for_write(self.cache.cache_model_class)
+        conn = cast(DatabaseWrapper, connections.create_connection(alias))
+        # Required for notifications
+        conn.set_autocommit(True)
+        with conn.cursor() as cursor:
+            cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(NOTIFY_CHANNEL)))
+        return conn
+
+    def _handle(self, payload: str) -> None:
+        if payload == INVALIDATE_ALL:
+            self.l1.clear()
+            return
+        self.l1.invalidate(payload.split(" "))
+
+    def run(self) -> None:
+        backoff = 1.0
+        while not self.stopped.is_set():
+            try:
+                self._connection = self._connect()
+                # Anything cached before we were listening might be stale
+                self.l1.clear()
+                self.l1.listening = True
+                backoff = 1.0
+                while not self.stopped.is_set():
+                    for notify in self._connection.connection.notifies(timeout=self.timeout):
+                        self._handle(notify.payload)
+            except (DatabaseError, PsycopgError) as exc:
+                LOGGER.warning("Cache invalidation listener disconnected: %s", exc)
+            finally:
+                self.l1.listening = False
+                self.l1.clear()
+                if self._connection is not None:
+                    try:
+                        self._connection.close()
+                    except (DatabaseError, PsycopgError):
+                        pass
+                    self._connection = None
+            self.stopped.wait(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+def notify_invalidate(cache: "DatabaseCache", keys: list[str] | None) -> None:
+    """Tell all processes to drop `keys` (or everything if None) from their local tier.
+    Notifications are sent on commit when called inside a transaction."""
+    alias = router.db_for_write(cache.cache_model_class)
+    payloads = [INVALIDATE_ALL]
+    if keys is not None:
+        payloads = []
+        current: list[str] = []
+        size = 0
+        for key in keys:
+            if current and size + len(key) + 1 > MAX_NOTIFY_PAYLOAD:
+                payloads.append(" ".join(current))
+                current, size = [], 0
+            current.append(key)
+            size += len(key) + 1
+        if current:
+            payloads.append(" ".join(current))
+    with connections[alias].cursor() as cursor:
+        for payload in payloads:
+            cursor.execute("SELECT pg_notify(%s, %s)", (NOTIFY_CHANNEL, payload))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-17 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_postgres_cache", "0002_alter_cacheentry_managers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cacheentry",
+            name="data",
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="cacheentry",
+            name="value",
+            field=models.TextField(null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-17 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_postgres_cache", "0003_cacheentry_data_alter_cacheentry_value"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cacheentry",
+            index=models.Index(
+                fields=["cache_key"],
+                name="cacheentry_key_prefix_idx",
+                opclasses=["text_pattern_ops"],
+            ),
+        ),
+    ]
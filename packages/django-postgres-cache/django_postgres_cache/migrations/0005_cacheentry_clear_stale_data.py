@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+from django.db import migrations
+
+# Processes running an earlier version only update `value`, which would leave `data` with the
+# previous value behind. As `data` is read first, clear it whenever only `value` changes.
+# Current processes may write `value` as NULL, which must not clear `data`.
+CLEAR_STALE_DATA = """
+CREATE OR REPLACE FUNCTION django_postgres_cache_clear_stale_data() RETURNS trigger AS $$
+BEGIN
+    IF NEW.value IS NOT NULL
+        AND NEW.value IS DISTINCT FROM OLD.value
+        AND NEW.data IS NOT DISTINCT FROM OLD.data THEN
+        NEW.data := NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER django_postgres_cache_clear_stale_data
+    BEFORE UPDATE ON django_postgres_cache_cacheentry
+    FOR EACH ROW EXECUTE FUNCTION django_postgres_cache_clear_stale_data();
+"""
+DROP_CLEAR_STALE_DATA = """
+DROP TRIGGER IF EXISTS django_postgres_cache_clear_stale_data ON django_postgres_cache_cacheentry;
+DROP FUNCTION IF EXISTS django_postgres_cache_clear_stale_data();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_postgres_cache", "0004_cacheentry_cacheentry_key_prefix_idx"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CLEAR_STALE_DATA, DROP_CLEAR_STALE_DATA),
+    ]
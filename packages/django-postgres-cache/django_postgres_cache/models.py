@@ -4,13 +4,23 @@ from psqlextra.manager import PostgresManager
 
 class CacheEntry(models.Model):
     cache_key = models.TextField(primary_key=True)
-    value = models.TextField()
+    # Legacy base64-encoded pickle, only read for entries without `data`
+    value = models.TextField(null=True)
+    data = models.BinaryField(null=True)
     expires = models.DateTimeField(db_index=True)
 
     objects = PostgresManager()  # type: ignore[no-untyped-call]
 
     class Meta:
         default_permissions = []
+        indexes = [
+            # Allows prefix lookups (`LIKE 'prefix%'`) regardless of the database collation
+            models.Index(
+                fields=["cache_key"],
+                opclasses=["text_pattern_ops"],
+                name="cacheentry_key_prefix_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Cache entry '{self.cache_key}'"